@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Time strongly connected component detection on a random synthetic graph."""
+
+import argparse
+import random
+import time
+
+from pymoduleanalyzer.analyzer.cycles import shortest_cycle, strongly_connected_components
+
+
+def main():
+    """Build a random graph and report SCC and representative-cycle timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    adjacency = [[] for _ in range(args.nodes)]
+    for _ in range(args.edges):
+        adjacency[rng.randrange(args.nodes)].append(rng.randrange(args.nodes))
+
+    start = time.perf_counter()
+    components = strongly_connected_components(adjacency)
+    scc_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cyclic = [component for component in components if len(component) > 1]
+    for component in cyclic:
+        shortest_cycle(adjacency, component, min(component))
+    cycle_time = time.perf_counter() - start
+
+    largest = max((len(component) for component in components), default=0)
+    print(f"{args.nodes} nodes, {args.edges} edges")
+    print(f"SCC:    {scc_time:.2f}s ({len(cyclic)} cyclic component(s), largest {largest})")
+    print(f"cycles: {cycle_time:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Compare memory of the imports mapping, its import tables and the CSR DependencyGraph."""
+
+import argparse
+import random
+import time
+import tracemalloc
+from pathlib import Path
+
+from pymoduleanalyzer.analyzer.dependency_graph import DependencyGraph
+from pymoduleanalyzer.analyzer.import_records import ImportTable
+from pymoduleanalyzer.analyzer.module_index import ModuleIndex
+
+
+def synthetic_imports(modules, per_module, package_size, seed):
+    """Return an ``analyze_imports``-style mapping for a synthetic repository."""
+    rng = random.Random(seed)
+    paths = []
+    for package in range(max(1, modules // package_size)):
+        paths.append(Path(f"pkg{package}/__init__.py"))
+        paths.extend(Path(f"pkg{package}/mod{i}.py") for i in range(package_size - 1))
+    imports = {}
+    for path in paths:
+        deps = []
+        for _ in range(per_module):
+            target = rng.choice(paths)
+            if rng.random() < 0.2:
+                deps.append(f"stdlib{rng.randrange(50)}.thing")
+            else:
+                deps.append(f"{target.parent.name}.{target.stem}.name{rng.randrange(5)}")
+        imports[path] = deps
+    return imports
+
+
+def main():
+    """Report bytes per import and per edge for each representation."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", type=int, default=20_000)
+    parser.add_argument("--imports", type=int, default=10, help="imports per module")
+    parser.add_argument("--package-size", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    imports = synthetic_imports(args.modules, args.imports, args.package_size, args.seed)
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.start()
+    tables = {path: ImportTable.from_texts(deps) for path, deps in imports.items()}
+    table_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    index = ModuleIndex(imports)
+
+    start = time.perf_counter()
+    graph = DependencyGraph.from_imports(imports, index)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    DependencyGraph.from_imports(tables, index)
+    table_build_time = time.perf_counter() - start
+
+    raw_edges = sum(len(deps) for deps in imports.values())
+    print(f"{len(imports)} modules, {raw_edges} import strings, {graph.edge_count} distinct edges")
+    print(f"imports mapping: {dict_bytes / raw_edges:.1f} bytes per import string")
+    # Includes the interned names, so it drops as names repeat across modules.
+    names = len({name for deps in imports.values() for name in deps})
+    print(f"import tables:   {table_bytes / raw_edges:.1f} bytes per import ({names} distinct)")
+    print(f"CSR arrays:      {graph.memory_usage() / graph.edge_count:.1f} bytes per edge "
+          f"({graph.memory_usage() / 1e6:.1f} MB total)")
+    print(f"graph build:     {build_time:.2f}s from strings, {table_build_time:.2f}s from tables")
+
+
+if __name__ == "__main__":
+    main()
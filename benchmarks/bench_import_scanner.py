@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Differential check and speed comparison of the import scanner vs. full parse."""
+
+import argparse
+import ast
+import sys
+import time
+from pathlib import Path
+
+from pymoduleanalyzer.analyzer.import_scanner import scan_imports
+from pymoduleanalyzer.analyzer.module_discovery import discover_modules
+
+
+def describe(node):
+    """Return the comparable facts of an import node."""
+    names = tuple((alias.name, alias.asname) for alias in node.names)
+    if isinstance(node, ast.ImportFrom):
+        return ("from", node.module, node.level, names, node.lineno, node.col_offset)
+    return ("import", None, 0, names, node.lineno, node.col_offset)
+
+
+def full_parse(source):
+    """Return import nodes from a full parse, in source order."""
+    nodes = [
+        node for node in ast.walk(ast.parse(source))
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    ]
+    return sorted(nodes, key=lambda node: (node.lineno, node.col_offset))
+
+
+def main():
+    """Compare both extractors over every module under ``path``."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", nargs="?", default=".", help="corpus to scan")
+    args = parser.parse_args()
+
+    sources = []
+    for module in discover_modules(args.path):
+        try:
+            source = Path(module).read_text()
+            ast.parse(source)
+        except (SyntaxError, ValueError):
+            continue
+        sources.append((module, source))
+
+    mismatches = fallbacks = 0
+    for module, source in sources:
+        scanned = scan_imports(source)
+        if scanned is None:
+            fallbacks += 1
+            continue
+        expected = [describe(node) for node in full_parse(source)]
+        if [describe(node) for node in scanned] != expected:
+            mismatches += 1
+            print(f"MISMATCH {module}")
+
+    start = time.perf_counter()
+    for _, source in sources:
+        full_parse(source)
+    ast_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _, source in sources:
+        scan_imports(source)
+    scan_time = time.perf_counter() - start
+
+    print(f"{len(sources)} file(s), {mismatches} mismatch(es), {fallbacks} fallback(s)")
+    print(f"ast.parse + walk: {ast_time:.3f}s")
+    print(f"scanner:          {scan_time:.3f}s ({ast_time / scan_time:.1f}x faster)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
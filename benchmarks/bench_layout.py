@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Time the viewer layouts on synthetic graphs of growing size."""
+
+import argparse
+import random
+import time
+
+from pymoduleanalyzer.visualization.layout import force_layout, layered_layout
+
+
+def build_adjacency(nodes: int, degree: int, seed: int):
+    """Return mostly-acyclic adjacency lists with a few short back edges."""
+    rng = random.Random(seed)
+    adjacency = []
+    for source in range(nodes):
+        targets = {
+            max(0, source - 1 - int(rng.expovariate(1 / 50))) for _ in range(degree)
+        } if source else set()
+        if source < nodes - 10 and rng.random() < 0.01:
+            targets.add(source + rng.randrange(1, 10))
+        targets.discard(source)
+        adjacency.append(sorted(targets))
+    return adjacency
+
+
+def main():
+    """Report layered and force-directed layout times per node count."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1_000, 2_000, 5_000, 20_000])
+    parser.add_argument("--degree", type=int, default=4)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument(
+        "--force-limit", type=int, default=5_000, help="skip the force layout above this size"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'nodes':>8} {'edges':>8} {'layered':>9} {'force':>9}")
+    for size in args.sizes:
+        adjacency = build_adjacency(size, args.degree, args.seed)
+        edges = sum(len(targets) for targets in adjacency)
+
+        start = time.perf_counter()
+        layered_layout(adjacency)
+        layered = f"{time.perf_counter() - start:.2f}s"
+
+        force = "skipped"
+        if size <= args.force_limit:
+            start = time.perf_counter()
+            force_layout(adjacency, iterations=args.iterations)
+            force = f"{time.perf_counter() - start:.2f}s"
+        print(f"{size:>8} {edges:>8} {layered:>9} {force:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Time the pre-commit lint engine against the one-rule-per-parse helpers."""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pymoduleanalyzer.analyzer.module_discovery import discover_modules
+from pymoduleanalyzer.analyzer.parsed_module import ModuleStore
+from pymoduleanalyzer.linter.engine import lint_paths, lint_settings
+from pymoduleanalyzer.linter.rules import RULES
+from pymoduleanalyzer.linter.suggestions import suggest_private
+from pymoduleanalyzer.utils.cache import LintCache
+
+sys.path.insert(0, str(Path(__file__).parent))
+from synthetic_repo import generate_repo  # noqa: E402
+
+
+def _timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"  {label:<34}{time.perf_counter() - start:>8.3f}s")
+    return result
+
+
+def _legacy(paths):
+    for path in paths:
+        try:
+            suggest_private(Path(path), ModuleStore(maxsize=0))
+        except (SyntaxError, UnicodeDecodeError, ValueError):
+            pass
+
+
+def main():
+    """Lint a repository with the legacy helper, the engine, and the engine's cache."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--path", help="repository to lint (default: a synthetic one)")
+    parser.add_argument("--modules", type=int, default=2_000)
+    parser.add_argument("--jobs", type=int, default=0, help="workers for the parallel run")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="pma-lint-"))
+    try:
+        root = Path(args.path) if args.path else workdir / "repo"
+        if not args.path:
+            generate_repo(root, args.modules)
+        paths = [str(path) for path in discover_modules(str(root))]
+        print(f"{len(paths)} file(s)")
+
+        _timed("legacy suggest_private", lambda: _legacy(paths))
+        default = lint_settings({}).rules
+        every = lint_settings({"linting": {"rules": {name: True for name in RULES}}}).rules
+        _timed("engine, default rules", lambda: lint_paths(paths, default, executor="serial"))
+        _timed(
+            f"engine, all {len(every)} rules", lambda: lint_paths(paths, every, executor="serial")
+        )
+        _timed(
+            f"engine, all rules, --jobs {args.jobs}",
+            lambda: lint_paths(paths, every, jobs=args.jobs),
+        )
+        with LintCache(workdir / "cache") as cache:
+            _timed("engine, cold cache", lambda: lint_paths(paths, every, cache=cache))
+            _timed("engine, warm cache", lambda: lint_paths(paths, every, cache=cache))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Time whole-graph metrics on a synthetic layered module graph."""
+
+import argparse
+import random
+import time
+from array import array
+from pathlib import Path
+
+from pymoduleanalyzer.analyzer.dependency_graph import DependencyGraph
+from pymoduleanalyzer.metrics import graph_metrics
+
+
+def build_graph(modules: int, edges: int, externals: int, cycles: int, seed: int):
+    """Return a random graph whose edges mostly point at lower-numbered modules."""
+    rng = random.Random(seed)
+    adjacency = [set() for _ in range(modules)]
+    for _ in range(edges):
+        source = rng.randrange(1, modules)
+        if rng.random() < 0.2:
+            adjacency[source].add(modules + rng.randrange(externals))
+        else:
+            # Mostly local imports, like modules importing package siblings.
+            adjacency[source].add(max(0, source - 1 - int(rng.expovariate(1 / 50))))
+    for _ in range(cycles):
+        source = rng.randrange(modules - 10)
+        adjacency[source].add(source + rng.randrange(1, 10))
+
+    names = [f"pkg{node // 100}.mod{node}" for node in range(modules)]
+    names += [f"ext{node}" for node in range(externals)]
+    paths = [Path(f"pkg{node // 100}/mod{node}.py") for node in range(modules)]
+    paths += [None] * externals
+    offsets, targets = array("i", [0]), array("i")
+    for deps in adjacency:
+        targets.extend(sorted(deps))
+        offsets.append(len(targets))
+    offsets.extend([len(targets)] * externals)
+    return DependencyGraph(names, paths, offsets, targets, array("i", [1]) * len(targets))
+
+
+def main():
+    """Build a synthetic graph and report metric timings with and without NumPy."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", type=int, default=100_000)
+    parser.add_argument("--edges", type=int, default=500_000)
+    parser.add_argument("--externals", type=int, default=200)
+    parser.add_argument("--cycles", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    graph = build_graph(args.modules, args.edges, args.externals, args.cycles, args.seed)
+    print(f"{args.modules} modules, {graph.edge_count} distinct edges")
+
+    backends = [("numpy", graph_metrics.np), ("python", None)]
+    results = {}
+    for label, module in backends:
+        if label == "numpy" and module is None:
+            print("numpy:      not installed")
+            continue
+        graph_metrics.np = module
+        start = time.perf_counter()
+        results[label] = graph_metrics.compute_metrics(graph, transitive=False)
+        direct = time.perf_counter() - start
+        print(f"{label + ':':11} {direct:.2f}s Ca/Ce/I/A/D and packages")
+    graph_metrics.np = backends[0][1]
+
+    start = time.perf_counter()
+    condensation = graph_metrics.Condensation(graph)
+    scc_time = time.perf_counter() - start
+    graph_metrics.transitive_counts(graph, False, condensation)
+    graph_metrics.transitive_counts(graph, True, condensation)
+    total = time.perf_counter() - start
+    print(f"transitive: {total:.2f}s fan-in and fan-out ({scc_time:.2f}s condensation)")
+
+    if len(results) == 2:
+        same = all(
+            getattr(results["numpy"], name) == getattr(results["python"], name)
+            for name in ("afferent", "efferent", "instability", "packages")
+        )
+        print(f"backends agree: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Benchmark analyze_imports speedup versus worker count for each executor."""
+
+import argparse
+import os
+import time
+
+from pymoduleanalyzer.analyzer.import_analyzer import analyze_imports
+from pymoduleanalyzer.analyzer.module_discovery import discover_modules
+
+
+def time_run(modules, jobs, executor, repeat):
+    """Return the best wall time of ``repeat`` uncached analyze_imports runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        analyze_imports(modules, jobs=jobs, executor=executor, errors=[])
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Print a speedup table for the serial, thread and process backends."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", nargs="?", default=".", help="repository to analyze")
+    parser.add_argument(
+        "--jobs",
+        default=",".join(str(n) for n in (1, 2, 4, 8, 16) if n <= (os.cpu_count() or 1)),
+        help="comma separated worker counts",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    modules = discover_modules(args.path)
+    print(f"{len(modules)} module(s), {os.cpu_count()} core(s)")
+
+    baseline = time_run(modules, 1, "serial", args.repeat)
+    print(f"{'executor':<10}{'jobs':>6}{'seconds':>10}{'speedup':>9}")
+    print(f"{'serial':<10}{1:>6}{baseline:>10.3f}{1.0:>9.2f}")
+    for executor in ("thread", "process"):
+        for jobs in (int(n) for n in args.jobs.split(",")):
+            elapsed = time_run(modules, jobs, executor, args.repeat)
+            print(f"{executor:<10}{jobs:>6}{elapsed:>10.3f}{baseline / elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Check CLI and pre-commit startup against an import-time budget.
+
+Each entry point runs under ``python -X importtime``. Startup paths must not
+import any of the heavy modules listed in ``HEAVY``. With ``--budget-ms``,
+the cumulative import time of this package's own modules is also checked;
+it includes everything they pull in but not the interpreter start-up or the
+CLI framework (typer, click and rich). Timings vary from run to run and
+machine to machine, so the budget is opt-in. Exits with status 1 when a
+path loads a heavy module or is over budget.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+PACKAGE = "pymoduleanalyzer"
+
+CASES = {
+    "help": ["-m", f"{PACKAGE}.cli.main", "--help"],
+    "analyze-help": ["-m", f"{PACKAGE}.cli.main", "analyze", "--help"],
+    "precommit": ["-m", f"{PACKAGE}.linter.precommit"],
+}
+
+# Modules that only specific commands need; loading one at startup is a regression.
+HEAVY = (
+    "numpy",
+    "jinja2",
+    "yaml",
+    "graphviz",
+    "sqlite3",
+    "concurrent.futures",
+    "multiprocessing",
+)
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def parse_importtime(text: str) -> List[Tuple[int, str, int, int]]:
+    """Return ``(depth, module, self_us, cumulative_us)`` for each imported module."""
+    entries = []
+    for line in text.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative, indent, name = match.groups()
+            entries.append((len(indent) // 2, name, int(self_us), int(cumulative)))
+    return entries
+
+
+def measure(args: List[str]) -> Dict[str, object]:
+    """Run ``python -X importtime <args>`` once and summarize its imports."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"),
+    )
+    entries = parse_importtime(result.stderr)
+    top = [(name, cumulative) for depth, name, _, cumulative in entries if depth == 0]
+    own = sum(us for name, us in top if name == PACKAGE or name.startswith(PACKAGE + "."))
+    names = {name for _, name, _, _ in entries}
+    return {
+        "total_ms": sum(us for _, us in top) / 1000,
+        "own_ms": own / 1000,
+        "heavy": sorted(module for module in HEAVY if module in names),
+        "slowest": sorted(top, key=lambda item: -item[1])[:5],
+    }
+
+
+def main():
+    """Measure every startup path and check its imports."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--budget-ms", type=float, help="also limit the import time of own modules"
+    )
+    parser.add_argument(
+        "--total-budget-ms", type=float, help="also limit the import time of all modules"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="runs per path (best kept)")
+    parser.add_argument("--cases", nargs="*", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--verbose", action="store_true", help="list the slowest imports")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'path':<14}{'own ms':>9}{'total ms':>10}  heavy imports")
+    for case in args.cases:
+        runs = [measure(CASES[case]) for _ in range(args.repeat)]
+        best = min(runs, key=lambda run: run["own_ms"])
+        total = min(run["total_ms"] for run in runs)
+        heavy = ", ".join(best["heavy"]) or "-"
+        print(f"{case:<14}{best['own_ms']:>9.1f}{total:>10.1f}  {heavy}")
+        if args.verbose:
+            for name, us in best["slowest"]:
+                print(f"{'':<14}{us / 1000:>9.1f}  {name}")
+        if args.budget_ms is not None and best["own_ms"] > args.budget_ms:
+            failures.append(f"{case}: own imports {best['own_ms']:.1f} ms > {args.budget_ms} ms")
+        if args.total_budget_ms is not None and total > args.total_budget_ms:
+            failures.append(f"{case}: all imports {total:.1f} ms > {args.total_budget_ms} ms")
+        if best["heavy"]:
+            failures.append(f"{case}: imports {heavy} at startup")
+
+    if failures:
+        print(f"{len(failures)} startup regression(s):")
+        for line in failures:
+            print(f"  {line}")
+        sys.exit(1)
+    print("Startup imports OK.")
+
+
+if __name__ == "__main__":
+    main()
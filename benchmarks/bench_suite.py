@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Time and measure memory for each analysis stage on synthetic repositories.
+
+Results are written as JSON. ``--baseline`` compares them with an earlier
+result file and exits with status 1 when a stage got slower or bigger by
+more than ``--threshold``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from pymoduleanalyzer.analyzer.cycles import find_cycles
+from pymoduleanalyzer.analyzer.dependency_graph import DependencyGraph
+from pymoduleanalyzer.analyzer.import_analyzer import analyze_imports
+from pymoduleanalyzer.analyzer.module_discovery import discover_modules
+from pymoduleanalyzer.analyzer.module_index import ModuleIndex
+from pymoduleanalyzer.metrics.graph_metrics import compute_metrics
+from pymoduleanalyzer.visualization.graph_generator import write_dot, write_mermaid
+from pymoduleanalyzer.visualization.report_builder import write_report
+from pymoduleanalyzer.visualization.summary import summarize, write_summary_mermaid
+from pymoduleanalyzer.visualization.viewer import write_viewer
+
+sys.path.insert(0, str(Path(__file__).parent))
+from synthetic_repo import generate_repo  # noqa: E402
+
+RESULTS_VERSION = 1
+
+
+def _analyze(state):
+    state["file_metrics"] = {}
+    state["imports"] = analyze_imports(
+        state["modules"], errors=[], file_metrics=state["file_metrics"]
+    )
+
+
+def _graph(state):
+    state["index"] = ModuleIndex(state["modules"])
+    state["graph"] = DependencyGraph.from_imports(state["imports"], state["index"])
+
+
+def _metrics(state):
+    counts = [state["file_metrics"].get(module) or {} for module in state["modules"]]
+    compute_metrics(
+        state["graph"],
+        class_counts=[entry.get("class_count", 0) for entry in counts],
+        abstract_counts=[entry.get("abstract_class_count", 0) for entry in counts],
+        packages=[state["index"].package(module) for module in state["modules"]],
+    )
+
+
+def _write(writer):
+    def stage(state):
+        with open(os.devnull, "w") as handle:
+            writer(handle, state)
+    return stage
+
+
+# Stages run in order; each reads what the earlier ones stored in ``state``.
+STAGES = [
+    ("discover_modules", lambda state: state.update(modules=discover_modules(state["root"]))),
+    ("analyze_imports", _analyze),
+    ("dependency_graph", _graph),
+    ("coupling_metrics", _metrics),
+    ("cycle_detection", lambda state: find_cycles(state["graph"])),
+    ("dot", _write(lambda handle, state: write_dot(handle, state["graph"]))),
+    ("mermaid", _write(lambda handle, state: write_mermaid(handle, state["graph"]))),
+    ("summary_mermaid", _write(
+        lambda handle, state: write_summary_mermaid(handle, summarize(state["graph"], 2, 100))
+    )),
+    ("html_viewer", _write(lambda handle, state: write_viewer(handle, state["graph"]))),
+    ("html_report", _write(lambda handle, state: write_report(handle, state["imports"]))),
+]
+
+
+def run_stages(root, repeat, memory, skip):
+    """Return ``{stage: {"seconds": ..., "peak_mb": ...}}`` for one repository."""
+    state = {"root": str(root)}
+    results = {}
+    for name, stage in STAGES:
+        if name in skip:
+            continue
+        entry = {}
+        if memory:
+            # Measured on a separate run: tracing slows allocation-heavy code down.
+            tracemalloc.start()
+            stage(state)
+            entry["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 2)
+            tracemalloc.stop()
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            stage(state)
+            best = min(best, time.perf_counter() - start)
+        entry["seconds"] = round(best, 4)
+        results[name] = entry
+        print(f"  {name:<18}{best:>9.3f}s" + (f"{entry['peak_mb']:>10.1f} MB" if memory else ""))
+    return results, state
+
+
+def compare(results, baseline, threshold, min_seconds):
+    """Return human-readable regressions of ``results`` against ``baseline``."""
+    previous = {run["label"]: run for run in baseline.get("runs", [])}
+    regressions = []
+    for run in results["runs"]:
+        old_run = previous.get(run["label"])
+        if old_run is None:
+            continue
+        for stage, entry in run["stages"].items():
+            old = old_run["stages"].get(stage)
+            if old is None:
+                continue
+            for key, floor in (("seconds", min_seconds), ("peak_mb", 1.0)):
+                if key not in entry or key not in old:
+                    continue
+                if entry[key] > max(old[key], floor) * (1 + threshold):
+                    regressions.append(
+                        f"{run['label']} {stage} {key}: {old[key]} -> {entry[key]}"
+                        f" (+{(entry[key] / max(old[key], 1e-9) - 1) * 100:.0f}%)"
+                    )
+    return regressions
+
+
+def main():
+    """Run every stage per repository size and write or compare the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--path", action="append", default=[], help="also benchmark a real repo")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--imports", type=int, default=8)
+    parser.add_argument("--relative-ratio", type=float, default=0.3)
+    parser.add_argument("--cycle-density", type=float, default=0.01)
+    parser.add_argument("--lines", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per stage (best kept)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc runs")
+    parser.add_argument(
+        "--skip", nargs="*", default=[], choices=[name for name, _ in STAGES], metavar="STAGE"
+    )
+    parser.add_argument("--workdir", help="keep generated repositories here instead of a temp dir")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument(
+        "--min-seconds", type=float, default=0.05, help="ignore slowdowns of faster stages"
+    )
+    args = parser.parse_args()
+
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="pma-bench-"))
+    targets = [(f"synthetic-{size}", size) for size in args.sizes]
+    targets += [(f"path:{path}", path) for path in args.path]
+    results = {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "parameters": {
+            key: getattr(args, key)
+            for key in ("depth", "imports", "relative_ratio", "cycle_density", "lines", "seed")
+        },
+        "runs": [],
+    }
+    try:
+        for label, target in targets:
+            if isinstance(target, int):
+                root = workdir / f"synthetic-{target}"
+                if not root.exists():
+                    generate_repo(
+                        root,
+                        target,
+                        args.depth,
+                        args.imports,
+                        args.relative_ratio,
+                        args.cycle_density,
+                        args.lines,
+                        seed=args.seed,
+                    )
+            else:
+                root = Path(target)
+            print(label)
+            stages, state = run_stages(root, args.repeat, not args.no_memory, set(args.skip))
+            graph = state.get("graph")
+            results["runs"].append({
+                "label": label,
+                "modules": len(state.get("modules", [])),
+                "edges": graph.edge_count if graph is not None else None,
+                "stages": stages,
+            })
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    Path(args.output).write_text(json.dumps(results, indent=2))
+    print(f"Wrote {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline, args.threshold, args.min_seconds)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Generate a synthetic Python repository for benchmarks."""
+
+import argparse
+import random
+from pathlib import Path
+from typing import List
+
+STDLIB = ["os", "sys", "json", "re", "typing", "pathlib", "collections", "functools", "abc"]
+
+
+def _package_dirs(packages: int, depth: int, fanout: int) -> List[List[str]]:
+    """Return ``packages`` leaf package paths ``depth`` levels below the root package."""
+    dirs = []
+    for package in range(packages):
+        parts = []
+        remainder = package
+        for _ in range(depth - 1):
+            parts.append(f"p{remainder % fanout}")
+            remainder //= fanout
+        parts.append(f"leaf{package}")
+        dirs.append(parts)
+    return dirs
+
+
+def _body(rng: random.Random, lines: int, names: List[str]) -> List[str]:
+    """Return roughly ``lines`` lines of functions and classes using the imported names."""
+    body: List[str] = []
+    index = 0
+    while len(body) < lines:
+        used = rng.choice(names) if names else "None"
+        if index % 4 == 3:
+            base = "ABC" if index % 8 == 7 else "object"
+            body += [
+                f"class Item{index}({base}):",
+                f'    """Synthetic class {index}."""',
+                "",
+                "    def run(self, value):",
+                f"        return value if value else {used}",
+                "",
+                "",
+            ]
+        else:
+            body += [
+                f"def function{index}(value):",
+                f'    """Synthetic function {index}."""',
+                "    total = 0",
+                "    for item in range(value):",
+                "        if item % 3:",
+                "            total += item",
+                f"    return total or {used}",
+                "",
+                "",
+            ]
+        index += 1
+    return body
+
+
+def generate_repo(
+    root: Path,
+    modules: int = 1_000,
+    depth: int = 3,
+    imports: int = 8,
+    relative_ratio: float = 0.3,
+    cycle_density: float = 0.01,
+    lines: int = 60,
+    package_size: int = 20,
+    seed: int = 0,
+) -> List[Path]:
+    """Write a package tree of about ``modules`` files under ``root``; return their paths.
+
+    Leaf packages sit ``depth`` levels below the ``synth`` root package and
+    hold ``package_size`` files each (``__init__.py`` included). Imports
+    mostly point at earlier modules, so the graph is a DAG apart from the
+    back edges added with probability ``cycle_density`` per module. A
+    ``relative_ratio`` share of same-package imports is written in relative
+    form, and one import in five goes to the standard library.
+    """
+    rng = random.Random(seed)
+    root = Path(root)
+    packages = max(1, -(-modules // package_size))
+    fanout = max(2, round(packages ** (1 / max(1, depth - 1)))) if depth > 1 else 1
+    dirs = _package_dirs(packages, max(1, depth), fanout)
+
+    # (dotted module name, package index, path); __init__ modules are named after the package.
+    entries = []
+    for package, parts in enumerate(dirs):
+        directory = root.joinpath("synth", *parts)
+        entries.append((".".join(["synth", *parts]), package, directory / "__init__.py"))
+        for position in range(package_size - 1):
+            if len(entries) >= modules:
+                break
+            name = ".".join(["synth", *parts, f"mod{position}"])
+            entries.append((name, package, directory / f"mod{position}.py"))
+        if len(entries) >= modules:
+            break
+
+    # Intermediate packages need an __init__.py to be importable.
+    package_dirs = {root / "synth"}
+    for _, _, path in entries:
+        package_dirs.update(parent for parent in path.parents if root / "synth" in parent.parents)
+    for directory in package_dirs:
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / "__init__.py").touch()
+
+    for node, (name, package, path) in enumerate(entries):
+        statements = []
+        names = []
+        for count in range(imports):
+            if rng.random() < 0.2:
+                module = rng.choice(STDLIB)
+                statements.append(f"import {module}")
+                names.append(module)
+                continue
+            if node == 0:
+                continue
+            if rng.random() < cycle_density and node + 1 < len(entries):
+                target = rng.randrange(node + 1, min(len(entries), node + package_size))
+            else:
+                target = max(0, node - 1 - int(rng.expovariate(1 / package_size)))
+            target_name, target_package, target_path = entries[target]
+            if target_path.name == "__init__.py":
+                statements.append(f"import {target_name}")
+                names.append(target_name)
+                continue
+            alias = f"dep{count}"
+            if target_package == package and rng.random() < relative_ratio:
+                statements.append(f"from . import {target_path.stem} as {alias}")
+            else:
+                statements.append(f"import {target_name} as {alias}")
+            names.append(alias)
+        text = [f'"""Synthetic module {name}."""', ""]
+        text += sorted(set(statements)) + ["from abc import ABC", "", ""]
+        text += _body(rng, lines, names)
+        path.write_text("\n".join(text))
+    return [path for _, _, path in entries]
+
+
+def main():
+    """Write a synthetic repository to a directory."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("root", help="directory to write the repository into")
+    parser.add_argument("--modules", type=int, default=1_000)
+    parser.add_argument("--depth", type=int, default=3, help="package nesting depth")
+    parser.add_argument("--imports", type=int, default=8, help="imports per module")
+    parser.add_argument("--relative-ratio", type=float, default=0.3)
+    parser.add_argument("--cycle-density", type=float, default=0.01)
+    parser.add_argument("--lines", type=int, default=60, help="approximate lines per file")
+    parser.add_argument("--package-size", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = generate_repo(
+        Path(args.root),
+        args.modules,
+        args.depth,
+        args.imports,
+        args.relative_ratio,
+        args.cycle_density,
+        args.lines,
+        args.package_size,
+        args.seed,
+    )
+    print(f"Wrote {len(paths)} module(s) to {args.root}")
+
+
+if __name__ == "__main__":
+    main()
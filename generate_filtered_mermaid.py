@@ -4,10 +4,14 @@
 from pathlib import Path
 from pymoduleanalyzer.analyzer.module_discovery import discover_modules
 from pymoduleanalyzer.analyzer.import_analyzer import analyze_imports
+from pymoduleanalyzer.analyzer.import_records import import_records
+from pymoduleanalyzer.analyzer.module_index import ModuleIndex
 
 def generate_filtered_mermaid(imports):
     """Generate mermaid diagram with only project modules."""
     
+    index = ModuleIndex(Path(module) for module in imports)
+
     # Filter to only project modules
     project_modules = set()
     project_imports = {}
@@ -19,12 +23,11 @@ def generate_filtered_mermaid(imports):
             project_modules.add(module_str)
             # Filter dependencies to only include project modules or relative imports
             filtered_deps = []
-            for dep in deps:
-                if ('pymoduleanalyzer' in dep or 
-                    dep.startswith('.') or 
-                    dep == 'typer' or  # Keep some key external deps for context
-                    dep == 'pathlib' or
-                    dep == 'json'):
+            for dep in import_records(deps):
+                if (any('pymoduleanalyzer' in part for part in dep.parts) or
+                    dep.level or
+                    # Keep some key external deps for context
+                    (dep.name is None and dep.module in ('typer', 'pathlib', 'json'))):
                     filtered_deps.append(dep)
             if filtered_deps:
                 project_imports[module_str] = filtered_deps
@@ -47,19 +50,14 @@ def generate_filtered_mermaid(imports):
         if module in node_mapping:
             source = node_mapping[module]
             for dep in deps:
-                # Handle relative imports
-                if dep.startswith('.'):
-                    continue  # Skip relative imports for now
-                
                 # Find target module
                 target = None
-                if dep in ['typer', 'pathlib', 'json']:
-                    target = dep
+                if dep.name is None and dep.module in ['typer', 'pathlib', 'json']:
+                    target = dep.module
                 else:
-                    for target_module in project_modules:
-                        if dep in target_module:
-                            target = node_mapping[target_module]
-                            break
+                    resolved = index.resolve(Path(module), dep)
+                    if resolved is not None and str(resolved) in node_mapping:
+                        target = node_mapping[str(resolved)]
                 
                 if target and target != source:
                     edge = f"    {source} --> {target}"
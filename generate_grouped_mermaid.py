@@ -1,10 +1,16 @@
 #!/usr/bin/env python3
 """Generate a mermaid diagram with better grouping and layout."""
 
+import argparse
 from pathlib import Path
 from collections import defaultdict
+from pymoduleanalyzer.analyzer.dependency_graph import DependencyGraph
 from pymoduleanalyzer.analyzer.module_discovery import discover_modules
 from pymoduleanalyzer.analyzer.import_analyzer import analyze_imports
+from pymoduleanalyzer.analyzer.import_records import import_records
+from pymoduleanalyzer.analyzer.module_index import ModuleIndex
+from pymoduleanalyzer.visualization.graph_generator import mermaid_node, node_ids
+from pymoduleanalyzer.visualization.summary import summarize
 
 def is_stdlib_module(module_name):
     """Check if a module is part of Python's standard library."""
@@ -31,6 +37,8 @@ def is_stdlib_module(module_name):
 def generate_grouped_mermaid(imports):
     """Generate mermaid diagram with subgraphs for better organization."""
     
+    index = ModuleIndex(Path(module) for module in imports)
+
     # Detect project modules by finding the most common package prefix
     project_prefixes = set()
     for module in imports.keys():
@@ -96,13 +104,13 @@ def generate_grouped_mermaid(imports):
     stdlib_deps = set()
     thirdparty_deps = set()
     
-    for deps in imports.values():
-        for dep in deps:
-            if not any(dep in mod for mod in imports.keys()) and not dep.startswith('.'):
-                if is_stdlib_module(dep):
-                    stdlib_deps.add(dep)
+    for module, deps in imports.items():
+        for dep in import_records(deps):
+            if not dep.level and index.resolve(Path(module), dep) is None:
+                if is_stdlib_module(dep.parts[0]):
+                    stdlib_deps.add(dep.text)
                 else:
-                    thirdparty_deps.add(dep)
+                    thirdparty_deps.add(dep.text)
     
     # Add stdlib dependencies
     if stdlib_deps:
@@ -133,16 +141,12 @@ def generate_grouped_mermaid(imports):
     for module, deps in imports.items():
         if str(module) in node_mapping:
             source = node_mapping[str(module)]
-            for dep in deps:
-                if dep in node_mapping:
-                    target = node_mapping[dep]
-                    lines.append(f"    {source} --> {target}")
-                elif not dep.startswith('.'):  # Skip relative imports
-                    # Check if it matches any module partially
-                    for mod_key, mod_node in node_mapping.items():
-                        if dep in mod_key:
-                            lines.append(f"    {source} --> {mod_node}")
-                            break
+            for dep in import_records(deps):
+                target = index.resolve(Path(module), dep)
+                if target is not None and str(target) in node_mapping:
+                    lines.append(f"    {source} --> {node_mapping[str(target)]}")
+                elif not dep.level and dep.text in node_mapping:
+                    lines.append(f"    {source} --> {node_mapping[dep.text]}")
     
     lines.append("")
     
@@ -196,15 +200,50 @@ def generate_grouped_mermaid(imports):
     
     return "\n".join(lines)
 
+def generate_summary_mermaid(summary):
+    """Generate a grouped mermaid diagram from a package-level GraphSummary."""
+    ids = node_ids(summary.names)
+    groups = defaultdict(list)
+    for group, name in enumerate(summary.names):
+        if summary.external[group]:
+            groups["external"].append(group)
+        else:
+            groups[name.split('.')[0] if '.' in name else 'scripts'].append(group)
+
+    lines = ["flowchart TB", ""]
+    for index, (package, members) in enumerate(sorted(groups.items())):
+        lines.append(f"    subgraph sg{index}[{package}]")
+        for group in members:
+            lines.append("    " + mermaid_node(ids[group], summary.label(group)))
+        lines.append("    end")
+        lines.append("")
+
+    lines.append("    %% Dependencies (weight = number of imports)")
+    for source, target, weight in summary.edges:
+        lines.append(f"    {ids[source]} -->|{weight}| {ids[target]}")
+    if summary.omitted_edges:
+        lines.append(f"    %% {summary.omitted_edges} lighter edge(s) omitted")
+    return "\n".join(lines)
+
 def main():
     """Generate grouped mermaid diagram."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depth", type=int, help="summarize to packages this many levels deep")
+    parser.add_argument("--top", type=int, help="keep only the N heaviest package edges")
+    parser.add_argument("--focus", help="drill down into one package")
+    args = parser.parse_args()
+
     modules = discover_modules(".")
     imports = analyze_imports(modules)
     
-    # Convert Path keys to strings
-    string_imports = {str(module): deps for module, deps in imports.items()}
-    
-    mermaid_content = generate_grouped_mermaid(string_imports)
+    if args.depth is None and args.top is None and args.focus is None:
+        # Convert Path keys to strings
+        string_imports = {str(module): deps for module, deps in imports.items()}
+        mermaid_content = generate_grouped_mermaid(string_imports)
+    else:
+        depth = args.depth or (1 if args.focus else 2)
+        graph = DependencyGraph.from_imports(imports, ModuleIndex(modules))
+        mermaid_content = generate_summary_mermaid(summarize(graph, depth, args.top, args.focus))
     
     output_file = Path("grouped_diagram.mmd")
     output_file.write_text(mermaid_content)
@@ -4,7 +4,7 @@
 from pathlib import Path
 from pymoduleanalyzer.analyzer.module_discovery import discover_modules
 from pymoduleanalyzer.analyzer.import_analyzer import analyze_imports
-from pymoduleanalyzer.visualization.report_builder import build_report
+from pymoduleanalyzer.visualization.report_builder import write_report
 
 def main():
     """Generate HTML report."""
@@ -14,10 +14,9 @@ def main():
     # Convert Path keys to strings for better HTML display
     string_imports = {str(module): deps for module, deps in imports.items()}
     
-    html_content = build_report(string_imports)
-    
     output_file = Path("repo_analysis.html")
-    output_file.write_text(html_content)
+    with output_file.open("w", encoding="utf-8") as handle:
+        write_report(handle, string_imports)
     print(f"Generated HTML report: {output_file}")
 
 if __name__ == "__main__":
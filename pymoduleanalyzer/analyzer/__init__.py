@@ -1,3 +1,3 @@
 """Static analysis utilities."""
 
-__all__ = ["module_discovery", "import_analyzer", "ast_parser", "method_analyzer"]
+__all__ = ["module_discovery", "import_analyzer", "ast_parser", "method_analyzer", "parsed_module", "parallel", "import_scanner", "import_records", "module_index", "cycles", "dependency_graph", "reachability", "impact", "incremental", "revision_diff", "history", "shards"]
@@ -4,8 +4,9 @@ import ast
 from pathlib import Path
 from typing import List
 
+from .parsed_module import ModuleStore, get_parsed_module
 
-def parse_imports(path: Path) -> List[ast.AST]:
+
+def parse_imports(path: Path, store: ModuleStore | None = None) -> List[ast.AST]:
     """Return import nodes from the given Python file."""
-    tree = ast.parse(path.read_text())
-    return [node for node in ast.walk(tree) if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return get_parsed_module(path, store).imports
@@ -0,0 +1,137 @@
+"""Strongly connected components and circular dependency reporting."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence
+
+from ..utils import profiling
+from .dependency_graph import DependencyGraph
+
+
+@dataclass
+class Cycle:
+    """A group of modules that (transitively) import each other."""
+
+    modules: List[str]
+    cycle: List[str]
+
+    @property
+    def size(self) -> int:
+        """Number of modules in the strongly connected component."""
+        return len(self.modules)
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation."""
+        return {"size": self.size, "modules": self.modules, "cycle": self.cycle}
+
+
+def strongly_connected_components(adjacency: Sequence[Sequence[int]]) -> List[List[int]]:
+    """Return the SCCs of a graph given as integer adjacency lists.
+
+    Iterative Tarjan, so deep import chains cannot hit the recursion limit.
+    Runs in O(V + E); components come out in reverse topological order.
+    """
+    count = len(adjacency)
+    order = [-1] * count
+    low = [0] * count
+    on_stack = [False] * count
+    stack: List[int] = []
+    components: List[List[int]] = []
+    counter = 0
+
+    for root in range(count):
+        if order[root] != -1:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, iter(adjacency[root]))]
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if order[child] == -1:
+                    order[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack[child] = True
+                    work.append((child, iter(adjacency[child])))
+                    break
+                if on_stack[child] and order[child] < low[node]:
+                    low[node] = order[child]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+                if low[node] == order[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+
+def shortest_cycle(
+    adjacency: Sequence[Sequence[int]], component: Sequence[int], start: int
+) -> List[int]:
+    """Return the shortest cycle through ``start`` that stays inside ``component``.
+
+    The cycle is listed without repeating ``start`` at the end.
+    """
+    members = set(component)
+    parent: Dict[int, int] = {start: -1}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for child in adjacency[node]:
+            if child == start:
+                path = [node]
+                while parent[path[-1]] != -1:
+                    path.append(parent[path[-1]])
+                return path[::-1]
+            if child in members and child not in parent:
+                parent[child] = node
+                queue.append(child)
+    return [start]
+
+
+def describe_cycles(
+    adjacency: Sequence[Sequence[int]],
+    components: Iterable[Sequence[int]],
+    names: Sequence[str],
+) -> List[Cycle]:
+    """Return a :class:`Cycle` for every component with more than one module.
+
+    The representative is the shortest cycle through the group's
+    alphabetically first module. Groups are ordered largest first.
+    """
+    cycles: List[Cycle] = []
+    for component in components:
+        if len(component) < 2:
+            continue
+        start = min(component, key=names.__getitem__)
+        path = shortest_cycle(adjacency, component, start)
+        cycles.append(
+            Cycle(
+                modules=sorted(names[node] for node in component),
+                cycle=[names[node] for node in path],
+            )
+        )
+    cycles.sort(key=lambda cycle: (-cycle.size, cycle.modules))
+    return cycles
+
+
+def find_cycles(graph: DependencyGraph) -> List[Cycle]:
+    """Return every circular dependency group with a representative cycle."""
+    with profiling.phase("find_cycles"):
+        cycles = describe_cycles(graph, strongly_connected_components(graph), graph.names)
+        profiling.count(cycles=len(cycles))
+    return cycles
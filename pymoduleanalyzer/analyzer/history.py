@@ -0,0 +1,285 @@
+"""Coupling, cycle and size trends over a range of git commits."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, fields
+from functools import partial
+from importlib.util import decode_source
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Set, Tuple
+
+from ..utils import profiling
+from ..utils.cache import BlobCache
+from ..utils.config import load_project_config
+from ..utils.file_utils import DEFAULT_EXCLUDE_DIRS, is_excluded
+from ..utils.git import cat_file, log_commits, tree_blobs, tree_diffs
+from .import_analyzer import analyze_source
+from .import_records import ImportTable
+from .incremental import IncrementalGraph
+from .module_index import ModuleIndex
+from .parallel import default_executor, map_chunks
+
+# Blobs are read and parsed in batches of this many, bounding memory use.
+BLOB_BATCH = 4096
+
+_Parsed = Tuple[ImportTable, "str | None"]
+
+
+@dataclass
+class HistoryPoint:
+    """Repository-wide metrics at one commit."""
+
+    commit: str
+    date: str
+    modules: int
+    dependencies: int
+    internal_dependencies: int
+    cycles: int
+    modules_in_cycles: int
+    average_instability: float
+    changed_files: int
+    parse_errors: int
+
+    @classmethod
+    def columns(cls) -> List[str]:
+        """Return the field names, in CSV column order."""
+        return [field.name for field in fields(cls)]
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation."""
+        record = asdict(self)
+        record["average_instability"] = round(self.average_instability, 4)
+        return record
+
+
+def select_commits(commits: Sequence[Tuple[str, str]], step: int) -> List[Tuple[str, str]]:
+    """Return every ``step``-th commit, counted back from the newest so it is always kept."""
+    return list(commits[::-1][::max(step, 1)])[::-1]
+
+
+def _parse_blobs(extractor: str, items: List[Tuple[str, bytes]]) -> List[_Parsed]:
+    """Parse a chunk of ``(path, contents)``; module-level so process pools can pickle it."""
+    results: List[_Parsed] = []
+    for path, data in items:
+        try:
+            results.append((analyze_source(Path(path), decode_source(data), extractor), None))
+        except (SyntaxError, ValueError) as exc:
+            results.append((ImportTable(), f"{type(exc).__name__}: {exc}"))
+    return results
+
+
+def parse_blobs(
+    root: str,
+    blobs: Dict[str, str],
+    extractor: str = "ast",
+    jobs: int = 1,
+    executor: str | None = None,
+    cache: BlobCache | None = None,
+) -> Dict[str, _Parsed]:
+    """Return ``{blob: (imports, error)}`` for ``{blob: path}``.
+
+    Blobs in ``cache`` are not read. The rest are read through one
+    ``git cat-file --batch`` process and parsed ``BLOB_BATCH`` at a time.
+    """
+    config = BlobCache.config_key(extractor)
+    results: Dict[str, _Parsed] = {}
+    missing: List[str] = []
+    for blob in blobs:
+        entry = cache.lookup(blob, config) if cache is not None else None
+        if entry is None:
+            missing.append(blob)
+        else:
+            results[blob] = entry
+    profiling.count(blobs=len(blobs), parsed=len(missing))
+
+    executor = executor or default_executor(jobs)
+    batch: List[Tuple[str, str, bytes]] = []
+
+    def flush() -> None:
+        parsed = map_chunks(
+            partial(_parse_blobs, extractor),
+            [(path, data) for _, path, data in batch],
+            jobs=jobs,
+            executor=executor,
+        )
+        for (blob, _, _), result in zip(batch, parsed):
+            results[blob] = result
+            if cache is not None:
+                cache.store(blob, config, *result)
+        batch.clear()
+
+    for blob, data in cat_file(root, missing):
+        batch.append((blob, blobs[blob], data or b""))
+        if len(batch) >= BLOB_BATCH:
+            flush()
+    flush()
+    return results
+
+
+class _Trend:
+    """Keeps repository-wide totals current while modules change one at a time.
+
+    Modules of the graph that are absent at the current commit have no
+    edges, are left out of its index and do not count. Totals are adjusted
+    only for the nodes each :meth:`IncrementalGraph.update` or
+    :meth:`IncrementalGraph.reindex` touches.
+    """
+
+    def __init__(self, graph: IncrementalGraph, present: Set[int]) -> None:
+        self.graph = graph
+        self.present = present
+        self.dependencies = 0
+        self.internal = 0
+        self.instability = [0.0] * graph.module_count
+        self.total_instability = 0.0
+        for node in present:
+            self._count_edges(graph.successors[node], 1)
+        for node in range(graph.module_count):
+            self._refresh(node)
+
+    def _count_edges(self, targets: Dict[int, int], sign: int) -> None:
+        paths = self.graph.paths
+        self.dependencies += sign * len(targets)
+        self.internal += sign * sum(1 for target in targets if paths[target] is not None)
+
+    def _refresh(self, node: int) -> None:
+        graph = self.graph
+        value = 0.0
+        if node in self.present:
+            ca, ce = graph.afferent(node), graph.efferent(node)
+            value = ce / (ca + ce) if ca + ce else 0.0
+        self.total_instability += value - self.instability[node]
+        self.instability[node] = value
+
+    def set_imports(self, module: Path, deps: ImportTable, present: bool) -> None:
+        """Replace the imports of ``module`` and mark it present or absent."""
+        node = self.graph.node_id(module)
+        self._count_edges(self.graph.successors[node], -1)
+        touched = self.graph.update(module, deps)
+        if present:
+            self.present.add(node)
+        else:
+            self.present.discard(node)
+        self._count_edges(self.graph.successors[node], 1)
+        for changed in touched | {node}:
+            if changed < self.graph.module_count:
+                self._refresh(changed)
+
+    def set_modules(self, modules: List[Path]) -> None:
+        """Resolve imports against ``modules``, the modules present from now on."""
+        graph = self.graph
+        # update() replaces a node's successor mapping, so a shallow copy keeps the old edges.
+        before = list(graph.successors)
+        touched = graph.reindex(ModuleIndex(modules))
+        for node in touched:
+            if node < len(before):
+                self._count_edges(before[node], -1)
+                self._count_edges(graph.successors[node], 1)
+            if node < graph.module_count:
+                self._refresh(node)
+
+    @property
+    def average_instability(self) -> float:
+        """Mean instability of the present modules."""
+        return self.total_instability / len(self.present) if self.present else 0.0
+
+
+def iter_history(
+    root: str,
+    rev_range: str = "HEAD",
+    step: int = 1,
+    extractor: str = "ast",
+    jobs: int = 1,
+    executor: str | None = None,
+    cache: BlobCache | None = None,
+) -> Iterator[HistoryPoint]:
+    """Yield metrics for every ``step``-th first-parent commit of ``rev_range``, oldest first.
+
+    The file list of the first commit comes from ``git ls-tree`` and the
+    changes between consecutive selected commits from a single ``git
+    diff-tree --stdin``. Imports are parsed once per distinct blob SHA
+    (see :func:`parse_blobs`), so the cost follows the number of distinct
+    file versions rather than commits times files. One
+    :class:`IncrementalGraph` over every module seen in the range is then
+    walked forward, updating only the modules each step changed. Imports
+    resolve against the modules present at each commit, so every point
+    matches a full analysis of that commit.
+    """
+    commits = select_commits(log_commits(root, rev_range), step)
+    if not commits:
+        return
+    root_path = Path(root)
+    exclude = load_project_config(root_path).get("exclude", [])
+
+    with profiling.phase("git_trees", commits=len(commits)):
+        initial = tree_blobs(root, commits[0][0])
+        pairs = list(zip([sha for sha, _ in commits], [sha for sha, _ in commits[1:]]))
+        diffs = tree_diffs(root, pairs)
+
+    def included(changes: Dict[str, str | None]) -> Dict[Path, str | None]:
+        return {
+            root_path / path: blob
+            for path, blob in changes.items()
+            if not is_excluded(path, DEFAULT_EXCLUDE_DIRS, exclude)
+        }
+
+    initial_blobs = included(initial)
+    steps = [included(diffs.get(sha, {})) for sha, _ in commits[1:]]
+    paths: Dict[str, str] = {}
+    for changes in (initial_blobs, *steps):
+        for module, blob in changes.items():
+            if blob is not None:
+                paths.setdefault(blob, str(module.relative_to(root_path)))
+
+    with profiling.phase("parse_blobs"):
+        parsed = parse_blobs(root, paths, extractor, jobs, executor, cache)
+
+    with profiling.phase("history_graph"):
+        modules = sorted(
+            {module for changes in (initial_blobs, *steps) for module in changes},
+            key=lambda module: module.parts,
+        )
+        empty = ImportTable()
+        graph = IncrementalGraph(
+            {
+                module: parsed[initial_blobs[module]][0] if initial_blobs.get(module) else empty
+                for module in modules
+            },
+            ModuleIndex(modules),
+        )
+        graph.reindex(ModuleIndex(module for module in modules if module in initial_blobs))
+        trend = _Trend(graph, {graph.node_id(module) for module in initial_blobs})
+
+    current = dict(initial_blobs)
+    errors = sum(1 for blob in current.values() if parsed[blob][1] is not None)
+    for (sha, date), changes in zip(commits, [initial_blobs, *steps]):
+        if changes is not initial_blobs:
+            deleted = {module for module, blob in changes.items() if blob is None}
+            if deleted & current.keys() or changes.keys() - deleted - current.keys():
+                trend.set_modules(
+                    [
+                        module for module in modules
+                        if module not in deleted and (module in changes or module in current)
+                    ]
+                )
+            for module, blob in changes.items():
+                old = current.pop(module, None)
+                errors -= old is not None and parsed[old][1] is not None
+                if blob is not None:
+                    current[module] = blob
+                    errors += parsed[blob][1] is not None
+                trend.set_imports(module, parsed[blob][0] if blob else empty, blob is not None)
+        # Only group sizes are reported, so skip finding a representative cycle per group.
+        cycles = [len(members) for members in graph.members.values() if len(members) > 1]
+        yield HistoryPoint(
+            commit=sha,
+            date=date,
+            modules=len(current),
+            dependencies=trend.dependencies,
+            internal_dependencies=trend.internal,
+            cycles=len(cycles),
+            modules_in_cycles=sum(cycles),
+            average_instability=trend.average_instability,
+            changed_files=len(changes),
+            parse_errors=errors,
+        )
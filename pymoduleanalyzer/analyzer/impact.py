@@ -0,0 +1,180 @@
+"""Change-impact queries over a precomputed transitive closure."""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from ..utils.cache import file_digest
+from .dependency_graph import DependencyGraph
+from .reachability import Condensation
+
+# Bump whenever the on-disk layout changes.
+INDEX_VERSION = 1
+
+
+def is_test_module(path: Path) -> bool:
+    """Return True for files pytest would collect as tests."""
+    name = Path(path).name
+    return name.startswith("test_") or name.endswith("_test.py")
+
+
+def _signature(path: Path) -> List[object]:
+    """Return ``[size, mtime_ns, digest]`` for a module file."""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns, file_digest(path)]
+
+
+def _encode(bits: int) -> str:
+    return base64.b64encode(bits.to_bytes((bits.bit_length() + 7) // 8, "little")).decode()
+
+
+def _decode(text: str) -> int:
+    return int.from_bytes(base64.b64decode(text), "little")
+
+
+class ImpactIndex:
+    """Upstream and downstream closures of every analyzed module.
+
+    Modules are numbered in the reverse topological order of their strongly
+    connected components, and each component stores two bitsets over those
+    numbers (see :class:`~pymoduleanalyzer.analyzer.reachability.Condensation`
+    for the layout): the modules it depends on and the modules depending on
+    it, both including the component itself. A query for many modules is
+    then one OR per module plus a decode of the result.
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        paths: List[str],
+        component_of: List[int],
+        downstream: List[int],
+        upstream: List[int],
+        signatures: Dict[str, List[object]] | None = None,
+    ) -> None:
+        self.names = names
+        self.paths = paths
+        self.component_of = component_of
+        self.downstream = downstream
+        self.upstream = upstream
+        self.signatures = signatures or {}
+        self._ids = {name: node for node, name in enumerate(names)}
+        self._ids.update((path, node) for node, path in enumerate(paths))
+        self.tests = frozenset(
+            node for node, path in enumerate(paths) if is_test_module(Path(path))
+        )
+
+    @classmethod
+    def from_graph(cls, graph: DependencyGraph) -> "ImpactIndex":
+        """Build the index from the analyzed modules of ``graph``."""
+        count = graph.module_count
+        adjacency = [
+            [target for target in graph[node] if target < count] for node in range(count)
+        ]
+        condensation = Condensation(adjacency)
+        order = condensation.order
+        return cls(
+            names=[graph.names[node] for node in order],
+            paths=[os.fspath(graph.paths[node]) for node in order],
+            component_of=[condensation.component_of[node] for node in order],
+            downstream=condensation.closure(downstream=True),
+            upstream=condensation.closure(downstream=False),
+        )
+
+    def node(self, key: str) -> int | None:
+        """Return the module number for a dotted name or file path."""
+        node = self._ids.get(key)
+        if node is None:
+            node = self._ids.get(os.fspath(Path(key)))
+        return node
+
+    def _nodes(self, bits: int, mirrored: bool) -> List[int]:
+        text = format(bits, "b")[::-1]
+        last = len(self.names) - 1
+        result = []
+        position = text.find("1")
+        while position != -1:
+            result.append(last - position if mirrored else position)
+            position = text.find("1", position + 1)
+        return sorted(result)
+
+    def upstream_of(self, nodes: Iterable[int]) -> List[int]:
+        """Return every module that (transitively) imports any of ``nodes``, them included."""
+        bits = 0
+        for node in nodes:
+            bits |= self.upstream[self.component_of[node]]
+        return self._nodes(bits, mirrored=True)
+
+    def downstream_of(self, nodes: Iterable[int]) -> List[int]:
+        """Return every module any of ``nodes`` (transitively) imports, them included."""
+        bits = 0
+        for node in nodes:
+            bits |= self.downstream[self.component_of[node]]
+        return self._nodes(bits, mirrored=False)
+
+    def affected_tests(self, nodes: Iterable[int]) -> List[int]:
+        """Return the test modules that have to run when any of ``nodes`` changes."""
+        return [node for node in self.upstream_of(nodes) if node in self.tests]
+
+    def record_signatures(self) -> None:
+        """Remember size, mtime and content digest of every module file."""
+        self.signatures = {path: _signature(Path(path)) for path in self.paths}
+
+    def is_stale(self, modules: Iterable[Path]) -> bool:
+        """Return True if files were added, removed or changed since indexing.
+
+        Mirrors the analysis cache: equal size and mtime means unchanged, and
+        the content digest decides when only the mtime differs.
+        """
+        paths = {os.fspath(module) for module in modules}
+        if paths != set(self.signatures):
+            return True
+        for path, (size, mtime_ns, digest) in self.signatures.items():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return True
+            if stat.st_size != size:
+                return True
+            if stat.st_mtime_ns != mtime_ns and file_digest(Path(path)) != digest:
+                return True
+        return False
+
+    def save(self, path: Path) -> None:
+        """Write the index as gzip-compressed JSON."""
+        data = {
+            "version": INDEX_VERSION,
+            "names": self.names,
+            "paths": self.paths,
+            "component_of": self.component_of,
+            "downstream": [_encode(bits) for bits in self.downstream],
+            "upstream": [_encode(bits) for bits in self.upstream],
+            "signatures": self.signatures,
+        }
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8", compresslevel=1) as handle:
+            json.dump(data, handle, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: Path) -> "ImpactIndex | None":
+        """Read an index written by :meth:`save`; None if missing or outdated."""
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != INDEX_VERSION:
+            return None
+        return cls(
+            names=data["names"],
+            paths=data["paths"],
+            component_of=data["component_of"],
+            downstream=[_decode(text) for text in data["downstream"]],
+            upstream=[_decode(text) for text in data["upstream"]],
+            signatures=data["signatures"],
+        )
@@ -3,61 +3,295 @@
 from __future__ import annotations
 
 import ast
+import os
+import time
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
-from .ast_parser import parse_imports
+from ..metrics.complexity import module_complexity
+from ..utils import profiling
+from ..utils.cache import AnalysisCache, FileStamp, stamp_bytes
+from .dependency_graph import DependencyGraph
+from .import_records import SCOPE_MODULE, SCOPE_NESTED, ImportTable
+from .import_scanner import scan_imports
+from .module_index import ModuleIndex
+from .parallel import map_chunks
+from .parsed_module import ModuleStore, ParsedModule, decode_text, get_parsed_module
 
 
-def analyze_imports(modules: List[Path]) -> Dict[Path, List[str]]:
-    """Return mapping of modules to list of full import names including what's imported."""
-    result: Dict[Path, List[str]] = {}
-    for module in modules:
-        found: List[str] = []
-        for node in parse_imports(module):
-            if isinstance(node, ast.ImportFrom):
-                base = node.module or ""
-                if node.level:
-                    # Relative imports
-                    base = "." * node.level + base
-                
-                # Add specific imports from the module
-                if node.names:
-                    for alias in node.names:
-                        if alias.name == "*":
-                            # Handle wildcard imports
-                            found.append(f"{base}.*")
+def format_imports(nodes: List[ast.AST]) -> List[str]:
+    """Return full import names including what's imported for the given nodes."""
+    found: List[str] = []
+    for node in nodes:
+        if isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                # Relative imports
+                base = "." * node.level + base
+            
+            # Add specific imports from the module
+            if node.names:
+                for alias in node.names:
+                    if alias.name == "*":
+                        # Handle wildcard imports
+                        found.append(f"{base}.*")
+                    else:
+                        # Full qualified name
+                        if base:
+                            found.append(f"{base}.{alias.name}")
                         else:
-                            # Full qualified name
-                            if base:
-                                found.append(f"{base}.{alias.name}")
-                            else:
-                                found.append(alias.name)
-                else:
-                    # Just the module itself
-                    found.append(base)
-                    
-            elif isinstance(node, ast.Import):
-                # Direct imports like "import os" or "import os.path"
-                found.extend(alias.name for alias in node.names)
+                            found.append(alias.name)
+            else:
+                # Just the module itself
+                found.append(base)
+                
+        elif isinstance(node, ast.Import):
+            # Direct imports like "import os" or "import os.path"
+            found.extend(alias.name for alias in node.names)
+    return found
+
+
+def import_table(nodes: List[ast.AST], scopes: List[int] | None = None) -> ImportTable:
+    """Return the imports of ``nodes`` as an :class:`ImportTable`.
+
+    ``scopes`` holds the scope of each node, as found by
+    :meth:`ParsedModule.from_source`. Without it, indented statements are
+    reported as nested.
+    """
+    rows: List[tuple] = []
+    for position, node in enumerate(nodes):
+        if scopes is not None:
+            scope = scopes[position]
+        else:
+            scope = SCOPE_NESTED if node.col_offset else SCOPE_MODULE
+        if isinstance(node, ast.ImportFrom):
+            module = node.module or ""
+            rows.extend(
+                (module, alias.name, node.level, node.lineno, scope) for alias in node.names
+            )
+        elif isinstance(node, ast.Import):
+            rows.extend((alias.name, None, 0, node.lineno, scope) for alias in node.names)
+    return ImportTable.from_rows(rows)
+
+
+EXTRACTORS = ("ast", "scan")
+
+# Imports, metrics and the stamp of the bytes they came from, or the failure.
+_Outcome = Tuple[
+    Optional[ImportTable], Optional[Dict[str, object]], Optional[FileStamp], Optional[Exception]
+]
+
+# Bulk analysis only needs the extracted facts, so it keeps no parse trees around.
+_WORKER_STORE = ModuleStore(maxsize=0)
+
+
+@dataclass
+class ParseError:
+    """A module that could not be read or parsed."""
+
+    path: Path
+    message: str
+
+
+def analyze_imports(
+    modules: List[Path],
+    store: ModuleStore | None = None,
+    cache: AnalysisCache | None = None,
+    jobs: int = 1,
+    executor: str = "serial",
+    errors: List[ParseError] | None = None,
+    extractor: str = "ast",
+    file_metrics: Dict[Path, Dict[str, object]] | None = None,
+) -> Dict[Path, ImportTable]:
+    """Return mapping of modules to the imports of each, as an :class:`ImportTable`.
+
+    Iterating a table yields the full import names including what's imported
+    (``"..utils.config.load_config"``); :meth:`ImportTable.records` gives
+    the module, name, relative level, line and scope of each.
+
+    When ``cache`` is given, files whose size/mtime (or content hash) match the
+    cached entry are served from it and only changed files are parsed. Parsing
+    runs on ``executor`` ("serial", "thread" or "process") with ``jobs``
+    workers; the result order always matches ``modules``. Files that fail to
+    parse map to an empty list and are appended to ``errors`` when given;
+    without ``errors`` the first failure is raised (``SyntaxError``,
+    ``ValueError`` or ``OSError``).
+    ``extractor="scan"`` uses the fast import scanner instead of a full parse.
+    Per-file metrics (line, function and class counts, and with the ``ast``
+    extractor the complexity of the module and each function) are collected
+    into ``file_metrics`` when given.
+    """
+    if extractor not in EXTRACTORS:
+        raise ValueError(f"Unknown extractor {extractor!r}; expected one of {EXTRACTORS}")
+    with profiling.phase("analyze_imports", files=len(modules), executor=executor):
+        return _analyze_imports(
+            modules, store, cache, jobs, executor, errors, extractor, file_metrics
+        )
+
+
+def _analyze_imports(
+    modules: List[Path],
+    store: ModuleStore | None,
+    cache: AnalysisCache | None,
+    jobs: int,
+    executor: str,
+    errors: List[ParseError] | None,
+    extractor: str,
+    file_metrics: Dict[Path, Dict[str, object]] | None,
+) -> Dict[Path, ImportTable]:
+    result: Dict[Path, ImportTable] = {}
+    pending: List[Path] = []
+    for module in modules:
+        entry = cache.lookup(module, extractor) if cache is not None else None
+        if entry is not None:
+            result[module] = entry.imports
+            if file_metrics is not None:
+                file_metrics[module] = entry.metrics
+        else:
+            result[module] = ImportTable()
+            pending.append(module)
+
+    profiling.count(cached=len(modules) - len(pending), parsed=len(pending))
+    if profiling.enabled():
+        # Time every file where it is parsed; workers send the timings back.
+        if executor == "serial":
+            timed = [_timed_module(module, store, extractor) for module in pending]
+        else:
+            timed = map_chunks(partial(_timed_chunk, extractor), pending, jobs, executor)
+        outcomes = [outcome for outcome, _ in timed]
+        for module, (_, seconds) in zip(pending, timed):
+            profiling.record_file(module, seconds)
+    elif executor == "serial":
+        # Retaining every tree only pays off when the caller shares the store
+        # with other consumers; otherwise it just inflates GC work.
+        store = store if store is not None else _WORKER_STORE
+        outcomes = [_analyze_module(module, store, extractor) for module in pending]
+    else:
+        worker = _scan_chunk if extractor == "scan" else _analyze_chunk
+        outcomes = map_chunks(worker, pending, jobs=jobs, executor=executor)
+
+    for module, (found, metrics, stamp, error) in zip(pending, outcomes):
+        if error is not None:
+            if errors is None:
+                raise error
+            errors.append(ParseError(module, f"{type(error).__name__}: {error}"))
+            continue
+        if cache is not None:
+            cache.store(module, stamp, found, metrics, extractor)
+        if file_metrics is not None:
+            file_metrics[module] = metrics
         result[module] = found
     return result
 
 
-def detect_circular_dependencies(imports: Dict[Path, List[str]]) -> List[tuple[str, str]]:
-    """Return a list of simple circular import pairs."""
-    name_map = {m.stem: m for m in imports}
+def analyze_source(module: Path, source: str, extractor: str = "ast") -> ImportTable:
+    """Return the imports of ``source``, the contents of ``module`` at some revision.
+
+    Raises ``SyntaxError`` or ``ValueError`` when the source cannot be parsed.
+    """
+    if extractor == "scan":
+        nodes = scan_imports(source)
+        if nodes is not None:
+            return import_table(nodes)
+    parsed = ParsedModule.from_source(module, source)
+    return import_table(parsed.imports, parsed.import_scopes)
+
+
+def _analyze_module(
+    module: Path, store: ModuleStore | None, extractor: str = "ast"
+) -> _Outcome:
+    """Return imports, metrics and the parse failure for a single module."""
+    try:
+        if extractor == "scan":
+            stat = os.stat(module)
+            data = module.read_bytes()
+            source = decode_text(data)
+            nodes = scan_imports(source)
+            if nodes is not None:
+                metrics = {"line_count": len(source.splitlines())}
+                return import_table(nodes), metrics, stamp_bytes(data, stat), None
+        parsed = get_parsed_module(module, store)
+    except (SyntaxError, ValueError, OSError) as exc:
+        return None, None, None, exc
+    found = import_table(parsed.imports, parsed.import_scopes)
+    return found, _file_metrics(parsed), parsed.stamp, None
+
+
+def _analyze_chunk(modules: List[Path]) -> List[_Outcome]:
+    """Worker entry point: analyze a chunk of modules."""
+    return [_analyze_module(module, _WORKER_STORE) for module in modules]
+
+
+def _scan_chunk(modules: List[Path]) -> List[_Outcome]:
+    """Worker entry point: analyze a chunk of modules with the import scanner."""
+    return [_analyze_module(module, _WORKER_STORE, "scan") for module in modules]
+
+
+def _timed_module(
+    module: Path, store: ModuleStore | None, extractor: str
+) -> Tuple[_Outcome, float]:
+    """Return the outcome of :func:`_analyze_module` and the seconds it took."""
+    start = time.perf_counter()
+    outcome = _analyze_module(module, store if store is not None else _WORKER_STORE, extractor)
+    return outcome, time.perf_counter() - start
+
+
+def _timed_chunk(extractor: str, modules: List[Path]) -> List[Tuple[_Outcome, float]]:
+    """Worker entry point used while profiling: analyze and time a chunk of modules."""
+    return [_timed_module(module, _WORKER_STORE, extractor) for module in modules]
+
+
+def _file_metrics(parsed: ParsedModule) -> Dict[str, object]:
+    """Return per-file metrics worth persisting alongside the imports."""
+    private = sum(1 for name in parsed.functions if name.startswith("_"))
+    complexity = module_complexity(parsed.tree, parsed.source)
+    return {
+        "line_count": parsed.line_count,
+        "function_count": len(parsed.functions),
+        "private_function_count": private,
+        "class_count": parsed.class_count,
+        "abstract_class_count": parsed.abstract_class_count,
+        "complexity": {
+            **complexity.to_dict(),
+            "functions": [
+                {"name": function.name, **function.to_dict()}
+                for function in complexity.functions
+            ],
+        },
+    }
+
+
+def resolve_dependencies(
+    imports: Dict[Path, List[str]], index: ModuleIndex | None = None
+) -> Dict[Path, List[Path]]:
+    """Return the distinct analyzed modules each module imports, in first-import order."""
+    return DependencyGraph.from_imports(imports, index).to_dependencies()
+
+
+def detect_circular_dependencies(
+    imports: Dict[Path, List[str]], index: ModuleIndex | None = None
+) -> List[tuple[str, str]]:
+    """Return a list of simple circular import pairs.
+
+    See :func:`~pymoduleanalyzer.analyzer.cycles.find_cycles` for cycles of
+    any length.
+    """
+    if index is None:
+        index = ModuleIndex(imports)
+    edges = {
+        module: set(targets)
+        for module, targets in resolve_dependencies(imports, index).items()
+    }
+
     cycles: List[tuple[str, str]] = []
-    for module, deps in imports.items():
-        module_name = module.stem
-        for dep in deps:
-            dep_name = dep.split(".")[0]
-            target = name_map.get(dep_name)
-            if target is None:
-                continue
-            target_deps = [d.split(".")[0] for d in imports.get(target, [])]
-            if module_name in target_deps:
-                pair = tuple(sorted((module_name, dep_name)))
-                if pair not in cycles:
+    seen: set[tuple[str, str]] = set()
+    for module, targets in edges.items():
+        for target in targets:
+            if module in edges.get(target, ()):
+                pair = tuple(sorted((index.name(module), index.name(target))))
+                if pair not in seen:
+                    seen.add(pair)
                     cycles.append(pair)
     return cycles
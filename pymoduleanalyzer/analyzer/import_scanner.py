@@ -0,0 +1,94 @@
+"""Fast import extraction without building a full syntax tree.
+
+The scanner runs a single regular expression over the source that skips
+strings and comments and stops at ``import``/``from ... import`` keywords.
+``import`` is a hard keyword, so every occurrence outside a string or comment
+starts an import statement, wherever it is nested (functions, ``try`` blocks,
+``if TYPE_CHECKING:``). The statement text is cut out and all statements of a
+file are parsed together as one tiny module, which yields the same
+``ast.Import``/``ast.ImportFrom`` nodes as a full parse, with statement
+``lineno``/``col_offset`` set to their position in the original file.
+
+Whenever a statement cannot be isolated cleanly the scanner reports that it is
+unsure and :func:`fast_parse_imports` falls back to the full parse. Syntax
+errors outside import statements are not detected by the fast path.
+"""
+
+from __future__ import annotations
+
+import ast
+import re
+from pathlib import Path
+from typing import List
+
+from .parsed_module import ModuleStore, get_parsed_module
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<skip>
+        '''(?:\\[\s\S]|[^\\])*?'''
+      | \"\"\"(?:\\[\s\S]|[^\\])*?\"\"\"
+      | '(?:\\[\s\S]|[^'\\\n])*'
+      | "(?:\\[\s\S]|[^"\\\n])*"
+      | \#[^\n]*
+    )
+  | (?P<from>\bfrom\b(?:[ \t.\w]|\\\r?\n)*?\bimport\b)
+  | (?P<import>\bimport\b)
+    """,
+    re.VERBOSE,
+)
+
+# Remainder of an import statement: a parenthesized name list, or everything
+# up to the end of the logical line, a ``;`` or a comment.
+_REST_RE = re.compile(r"[ \t]*(?:\([^)]*\)|(?:[^\n;#\\]|\\\r?\n)*)")
+
+
+def scan_imports(source: str) -> List[ast.stmt] | None:
+    """Return import statements of ``source`` in source order.
+
+    Returns ``None`` when the scanner is unsure and a full parse is needed.
+    """
+    if "import" not in source:
+        return []
+
+    snippets: List[str] = []
+    positions: List[tuple[int, int]] = []
+    line = 1
+    line_start = 0
+    counted = 0
+    for match in _TOKEN_RE.finditer(source):
+        if match.lastgroup == "skip":
+            continue
+        start = match.start()
+        newlines = source.count("\n", counted, start)
+        if newlines:
+            line += newlines
+            line_start = source.rindex("\n", counted, start) + 1
+        counted = start
+        rest = _REST_RE.match(source, match.end())
+        snippets.append(source[start:rest.end()])
+        positions.append((line, len(source[line_start:start].encode("utf-8"))))
+
+    if not snippets:
+        return []
+    try:
+        body = ast.parse("\n".join(snippets)).body
+    except SyntaxError:
+        return None
+    if len(body) != len(snippets):
+        return None
+
+    for node, (lineno, col_offset) in zip(body, positions):
+        if not isinstance(node, (ast.Import, ast.ImportFrom)):
+            return None
+        ast.increment_lineno(node, lineno - node.lineno)
+        node.col_offset = col_offset
+    return body
+
+
+def fast_parse_imports(path: Path, store: ModuleStore | None = None) -> List[ast.AST]:
+    """Return import nodes of ``path``, falling back to a full parse when unsure."""
+    found = scan_imports(Path(path).read_text())
+    if found is None:
+        return get_parsed_module(path, store).imports
+    return list(found)
@@ -0,0 +1,267 @@
+"""Dependency graph that follows edits to individual modules."""
+
+from __future__ import annotations
+
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from .cycles import Cycle, describe_cycles, strongly_connected_components
+from .import_records import import_records
+from .module_index import ModuleIndex
+
+
+class IncrementalGraph:
+    """Mutable counterpart of :class:`DependencyGraph` for long-running processes.
+
+    Node IDs, edge order and weights follow the same rules as
+    ``DependencyGraph.from_imports``, so metrics and representative cycles
+    match a fresh run. :meth:`update` replaces one module's imports and only
+    touches the edges that changed: coupling counts are plain set sizes, a
+    removed edge re-splits just the strongly connected component it was in,
+    and an added edge merges components only if it closes a cycle.
+    Representative cycles are cached per component. The set of module nodes
+    is fixed, but modules may be absent from the index imports resolve
+    against; :meth:`reindex` switches to the index of another module set.
+    """
+
+    def __init__(self, imports: Dict[Path, List[str]], index: ModuleIndex | None = None) -> None:
+        if index is None:
+            index = ModuleIndex(imports)
+        self.index = index
+        self.imports: Dict[Path, List[str]] = {}
+        self.names: List[str] = [index.name(module) for module in imports]
+        self.paths: List[Optional[Path]] = list(imports)
+        self.module_count = len(self.paths)
+        self._ids: Dict[Path | str, int] = {module: node for node, module in enumerate(imports)}
+        self.successors: List[Dict[int, int]] = [{} for _ in self.paths]
+        self.predecessors: List[Set[int]] = [set() for _ in self.paths]
+        self.component_of: List[int] = [0] * len(self.paths)
+        self.members: Dict[int, List[int]] = {}
+        self._next_component = 0
+        self._cycles: Dict[int, Cycle] = {}
+        # Every dotted-name prefix of what each module imports, and the reverse.
+        self._imported: List[Set[str]] = [set() for _ in self.paths]
+        self._importers: Dict[str, Set[int]] = {}
+        for module, deps in imports.items():
+            self._set_edges(self._ids[module], self._targets(module, deps))
+            self.imports[module] = deps
+
+        self.members.clear()
+        for component in strongly_connected_components(self):
+            self._add_component(component)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, node: int) -> Dict[int, int]:
+        """Return successors of ``node`` (mapping to edge weights)."""
+        return self.successors[node]
+
+    def is_external(self, node: int) -> bool:
+        """Return True for standard library and third-party nodes."""
+        return self.paths[node] is None
+
+    def node_id(self, module: Path) -> int | None:
+        """Return the ID of an analyzed module file."""
+        return self._ids.get(module)
+
+    def edges(self):
+        """Yield ``(source, target, weight)`` for every distinct edge."""
+        for source, targets in enumerate(self.successors):
+            for target, weight in targets.items():
+                yield source, target, weight
+
+    def _intern(self, name: str) -> int:
+        node = self._ids.get(name)
+        if node is None:
+            node = self._ids[name] = len(self.names)
+            self.names.append(name)
+            self.paths.append(None)
+            self.successors.append({})
+            self.predecessors.append(set())
+            self.component_of.append(0)
+            self._add_component([node])
+        return node
+
+    def _targets(self, module: Path, deps: List[str]) -> Dict[int, int]:
+        """Resolve ``deps`` as :func:`.dependency_graph.edge_target` does; record the names."""
+        node = self._ids[module]
+        index = self.index
+        counts: Dict[int, int] = {}
+        prefixes: Set[str] = set()
+        for dep in import_records(deps):
+            name = index.absolute_name(module, dep)
+            if not name:
+                continue
+            prefix = ""
+            for part in name.split("."):
+                prefix = f"{prefix}.{part}" if prefix else part
+                prefixes.add(prefix)
+            found = index.resolve_name(name)
+            if found is not None and found in self._ids:
+                target = self._ids[found]
+                if target == node:
+                    continue
+            elif found is None and dep.level:
+                continue
+            else:
+                top = name if found is None else index.name(found)
+                target = self._intern(top.split(".", 1)[0])
+            counts[target] = counts.get(target, 0) + 1
+        self._record_imported(node, prefixes)
+        return counts
+
+    def _record_imported(self, node: int, prefixes: Set[str]) -> None:
+        old = self._imported[node]
+        for prefix in old - prefixes:
+            importers = self._importers[prefix]
+            importers.discard(node)
+            if not importers:
+                del self._importers[prefix]
+        for prefix in prefixes - old:
+            self._importers.setdefault(prefix, set()).add(node)
+        self._imported[node] = prefixes
+
+    def _set_edges(self, node: int, targets: Dict[int, int]) -> None:
+        for target in self.successors[node]:
+            self.predecessors[target].discard(node)
+        for target in targets:
+            self.predecessors[target].add(node)
+        self.successors[node] = targets
+
+    def _add_component(self, members: List[int]) -> None:
+        component = self._next_component
+        self._next_component += 1
+        self.members[component] = members
+        for node in members:
+            self.component_of[node] = component
+
+    def update(self, module: Path, deps: List[str]) -> Set[int]:
+        """Replace the imports of ``module``.
+
+        Returns the nodes whose edges changed (``module`` and the targets it
+        gained or lost), which is empty when the edges stayed the same.
+        """
+        node = self._ids[module]
+        self.imports[module] = deps
+        old = self.successors[node]
+        new = self._targets(module, deps)
+        if new == old:
+            return set()
+        removed = [target for target in old if target not in new]
+        added = [target for target in new if target not in old]
+        self._set_edges(node, new)
+
+        component_of = self.component_of
+        self._cycles.pop(component_of[node], None)
+        inside = [target for target in removed if component_of[target] == component_of[node]]
+        if any(not self._still_reaches(node, target) for target in inside):
+            self._split(component_of[node])
+        for target in added:
+            if component_of[target] != component_of[node]:
+                self._merge_cycle(node, target)
+        return {node, *removed, *added}
+
+    def reindex(self, index: ModuleIndex) -> Set[int]:
+        """Resolve imports against ``index`` from now on, e.g. after files were added or removed.
+
+        Modules of the graph that ``index`` lacks are absent: nothing resolves
+        to them any more, and callers give them no imports with :meth:`update`.
+        Only the modules importing a name that now refers to a different
+        module, or whose own name changed, are resolved again. Returns the
+        nodes whose edges changed, like :meth:`update`.
+        """
+        old, self.index = self.index, index
+        stale: Set[int] = set()
+        for name in old.changed_names(index):
+            stale |= self._importers.get(name, set())
+        for node in range(self.module_count):
+            module = self.paths[node]
+            if module in index:
+                name = index.name(module)
+                if name != self.names[node]:
+                    self.names[node] = name
+                    self._cycles.clear()
+                    stale.add(node)
+            elif module in old:
+                stale.add(node)
+        touched: Set[int] = set()
+        for node in sorted(stale):
+            module = self.paths[node]
+            touched |= self.update(module, self.imports[module])
+        return touched
+
+    def _still_reaches(self, source: int, target: int) -> bool:
+        """Return True if ``source`` reaches ``target`` without leaving their component.
+
+        ``target`` already reached ``source``, so then the component is
+        still strongly connected after losing the edge between them.
+        """
+        component = self.component_of[source]
+        component_of = self.component_of
+        seen = {source}
+        queue = deque([source])
+        while queue:
+            for child in self.successors[queue.popleft()]:
+                if child == target:
+                    return True
+                if child not in seen and component_of[child] == component:
+                    seen.add(child)
+                    queue.append(child)
+        return False
+
+    def _split(self, component: int) -> None:
+        """Recompute the strongly connected components inside ``component``."""
+        members = self.members.pop(component)
+        local = {node: position for position, node in enumerate(members)}
+        adjacency = [
+            [local[target] for target in self.successors[node] if target in local]
+            for node in members
+        ]
+        for part in strongly_connected_components(adjacency):
+            self._add_component([members[position] for position in part])
+
+    def _merge_cycle(self, source: int, target: int) -> None:
+        """Merge the components on every cycle closed by the edge ``source -> target``."""
+        # Nodes reachable from target ...
+        reachable = {target}
+        queue = deque([target])
+        while queue:
+            for child in self.successors[queue.popleft()]:
+                if child not in reachable:
+                    reachable.add(child)
+                    queue.append(child)
+        if source not in reachable:
+            return
+        # ... that also reach source lie on a cycle through the new edge.
+        on_cycle = {source}
+        queue = deque([source])
+        while queue:
+            for parent in self.predecessors[queue.popleft()]:
+                if parent in reachable and parent not in on_cycle:
+                    on_cycle.add(parent)
+                    queue.append(parent)
+        merged = {self.component_of[node] for node in on_cycle}
+        members: List[int] = []
+        for component in merged:
+            members.extend(self.members.pop(component))
+        self._add_component(members)
+
+    def afferent(self, node: int) -> int:
+        """Number of distinct analyzed modules importing ``node``."""
+        return len(self.predecessors[node])
+
+    def efferent(self, node: int) -> int:
+        """Number of distinct modules and external packages ``node`` imports."""
+        return len(self.successors[node])
+
+    def cycles(self) -> List[Cycle]:
+        """Return every circular dependency group, as :func:`find_cycles` would."""
+        cached = self._cycles
+        for component, members in self.members.items():
+            if len(members) > 1 and component not in cached:
+                cached[component] = describe_cycles(self, [members], self.names)[0]
+        for component in [component for component in cached if component not in self.members]:
+            del cached[component]
+        return sorted(cached.values(), key=lambda cycle: (-cycle.size, cycle.modules))
@@ -3,10 +3,9 @@
 from pathlib import Path
 from typing import Dict, List
 
-import ast
+from .parsed_module import ModuleStore, get_parsed_module
 
 
-def list_defined_functions(path: Path) -> List[str]:
+def list_defined_functions(path: Path, store: ModuleStore | None = None) -> List[str]:
     """Return a list of defined function names within the file."""
-    tree = ast.parse(path.read_text())
-    return [node.name for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
+    return list(get_parsed_module(path, store).functions)
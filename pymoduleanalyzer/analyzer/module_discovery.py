@@ -1,38 +1,38 @@
 """Basic module discovery implementation."""
 
 from pathlib import Path
-from typing import List
+from typing import Iterable, List
 
+from ..utils import profiling
+from ..utils.config import load_project_config
+from ..utils.file_utils import DEFAULT_EXCLUDE_DIRS, iter_python_files
 
-def discover_modules(root: str) -> List[Path]:
+
+def discover_modules(
+    root: str,
+    use_git: bool = False,
+    respect_gitignore: bool = True,
+    exclude: Iterable[str] | None = None,
+) -> List[Path]:
     """Return a list of Python module file paths under the given root directory.
     
-    Excludes virtual environments, installed packages, and common non-project directories.
+    Excludes virtual environments, installed packages, and common non-project
+    directories without descending into them. ``.gitignore`` files are honored
+    and extra ``exclude`` globs default to the ``exclude`` list of the root's
+    ``.pymoduleanalyzer.yml``. With ``use_git`` the file list comes from a
+    single ``git ls-files`` call instead of walking the tree.
     """
-    root_path = Path(root)
-    
-    # Directories to exclude
-    exclude_dirs = {
-        '.venv', 'venv', 'env', '.env',  # Virtual environments
-        '__pycache__', '.git', '.pytest_cache',  # Cache directories
-        'node_modules', '.tox', 'htmlcov',  # Build/test artifacts
-        'site-packages', 'dist-packages',  # Installed packages
-        '.mypy_cache', '.coverage',  # Tool caches
-        'build', 'dist', 'egg-info',  # Build outputs
-    }
-    
-    modules = []
-    for py_file in root_path.rglob("*.py"):
-        # Check if any parent directory is in exclude list
-        if any(part in exclude_dirs for part in py_file.parts):
-            continue
-        
-        # Skip if in hidden directory (starts with .)
-        if any(part.startswith('.') and part not in {'.', '..'} for part in py_file.parts):
-            continue
-            
-        # Only include if it's a regular file
-        if py_file.is_file():
-            modules.append(py_file)
-    
+    with profiling.phase("discover_modules", use_git=use_git):
+        if exclude is None:
+            exclude = load_project_config(Path(root)).get("exclude", [])
+        modules = list(
+            iter_python_files(
+                Path(root),
+                exclude_dirs=DEFAULT_EXCLUDE_DIRS,
+                exclude_patterns=exclude,
+                respect_gitignore=respect_gitignore,
+                use_git=use_git,
+            )
+        )
+        profiling.count(files=len(modules))
     return modules
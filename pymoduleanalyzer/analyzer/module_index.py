@@ -0,0 +1,149 @@
+"""Map module files to dotted names and resolve imports against them."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .import_records import ImportRecord, split_import
+
+
+class ModuleIndex:
+    """Fully qualified dotted names for a set of module files.
+
+    Package directories are the ones containing an ``__init__.py`` from the
+    given module list, so ``src`` layouts and plain script folders resolve
+    without touching the file system. Imports resolve with one dict
+    lookup per name component, preferring the longest matching module, so
+    ``from pkg import submodule`` points at the submodule when it exists and at
+    ``pkg/__init__.py`` otherwise.
+
+    Files in plain folders that would share a dotted name (``tests/unit/test_core.py``
+    and ``tests/integration/test_core.py``) are prefixed with their parent
+    directory names until they differ (``unit.test_core``,
+    ``integration.test_core``). The prefix is not part of their package.
+    """
+
+    def __init__(self, modules: Iterable[Path]) -> None:
+        modules = [Path(module) for module in modules]
+        package_dirs = {module.parent for module in modules if module.name == "__init__.py"}
+        found = {module: self._dotted_name(module, package_dirs) for module in modules}
+        # Number of directory names prepended to tell colliding files apart.
+        self._prefixed: Dict[Path, int] = {}
+        self._disambiguate(found)
+        self._names: Dict[Path, str] = {module: name for module, (name, _) in found.items()}
+        self._paths: Dict[str, Path] = {}
+        for module, name in self._names.items():
+            self._paths.setdefault(name, module)
+
+    @staticmethod
+    def _dotted_name(module: Path, package_dirs: set[Path]) -> Tuple[str, Path]:
+        """Return the dotted name of ``module`` and the first directory not part of it."""
+        parts = [] if module.name == "__init__.py" else [module.stem]
+        directory = module.parent
+        while directory in package_dirs and directory.name:
+            parts.append(directory.name)
+            if directory.parent == directory:
+                break
+            directory = directory.parent
+        return ".".join(reversed(parts)) or module.stem, directory
+
+    def _disambiguate(self, found: Dict[Path, Tuple[str, Path]]) -> None:
+        """Prefix colliding names in ``found`` with parent directory names until unique.
+
+        In a collision, only the modules prefixed most often so far are
+        extended, so a prefixed name never displaces a package module.
+        """
+        while True:
+            groups: Dict[str, List[Path]] = {}
+            for module, (name, _) in found.items():
+                groups.setdefault(name, []).append(module)
+            extended = False
+            for members in groups.values():
+                if len(members) < 2:
+                    continue
+                depths = [self._prefixed.get(module, 0) for module in members]
+                fewest = min(depths)
+                extend = [
+                    module for module, depth in zip(members, depths)
+                    if (depth > fewest or fewest == max(depths)) and found[module][1].name
+                ]
+                for module in extend:
+                    name, directory = found[module]
+                    found[module] = (f"{directory.name}.{name}", directory.parent)
+                    self._prefixed[module] = self._prefixed.get(module, 0) + 1
+                    extended = True
+            if not extended:
+                return
+
+    def name(self, module: Path) -> str:
+        """Return the dotted name of ``module``."""
+        return self._names[module]
+
+    def path(self, name: str) -> Path | None:
+        """Return the module file for a dotted name, if it is part of the index."""
+        return self._paths.get(name)
+
+    def is_package(self, module: Path) -> bool:
+        """Return True if ``module`` is a package ``__init__.py``."""
+        return module.name == "__init__.py"
+
+    def package(self, module: Path) -> str:
+        """Return the dotted name of the package containing ``module``."""
+        name = self._names[module]
+        prefixed = self._prefixed.get(module)
+        if prefixed:
+            name = name.split(".", prefixed)[-1]
+        if self.is_package(module):
+            return name
+        return name.rpartition(".")[0]
+
+    def absolute_name(self, importer: Path, dep: str | ImportRecord) -> str | None:
+        """Return ``dep`` as an absolute dotted name as seen from ``importer``.
+
+        ``dep`` is an :class:`ImportRecord` or its formatted string.
+        """
+        if isinstance(dep, ImportRecord):
+            level, parts = dep.level, dep.parts
+        else:
+            level, parts = split_import(dep)
+        if parts and parts[-1] == "*":
+            parts = parts[:-1]
+        if not level:
+            return ".".join(parts)
+        base = self.package(importer).split(".") if importer in self._names else []
+        base = [part for part in base if part]
+        if level - 1 > len(base):
+            return None
+        base = base[:len(base) - (level - 1)]
+        return ".".join([*base, *parts]) or None
+
+    def resolve(self, importer: Path, dep: str | ImportRecord) -> Path | None:
+        """Return the indexed module that ``dep`` (imported by ``importer``) refers to."""
+        return self.resolve_name(self.absolute_name(importer, dep))
+
+    def resolve_name(self, name: str | None) -> Path | None:
+        """Return the indexed module an absolute dotted ``name`` refers to."""
+        while name:
+            target = self._paths.get(name)
+            if target is not None:
+                return target
+            name = name.rpartition(".")[0]
+        return None
+
+    def changed_names(self, other: "ModuleIndex") -> Set[str]:
+        """Return the dotted names that refer to a different module (or none) in ``other``."""
+        return {
+            name
+            for name in self._paths.keys() | other._paths.keys()
+            if self._paths.get(name) != other._paths.get(name)
+        }
+
+    def __contains__(self, module: object) -> bool:
+        return module in self._names
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
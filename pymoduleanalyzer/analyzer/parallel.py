@@ -0,0 +1,59 @@
+"""Pluggable serial/thread/process execution of per-file work."""
+
+from __future__ import annotations
+
+import math
+import os
+from typing import Callable, List, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+EXECUTORS = ("serial", "thread", "process")
+
+
+def resolve_jobs(jobs: int) -> int:
+    """Return the worker count for ``jobs`` (``0`` or less means all cores)."""
+    return jobs if jobs > 0 else (os.cpu_count() or 1)
+
+
+def default_executor(jobs: int) -> str:
+    """Return the executor used when only a job count is given."""
+    return "serial" if resolve_jobs(jobs) == 1 else "process"
+
+
+def map_chunks(
+    func: Callable[[List[T]], List[R]],
+    items: Sequence[T],
+    jobs: int = 1,
+    executor: str = "serial",
+    chunksize: int | None = None,
+) -> List[R]:
+    """Apply ``func`` to chunks of ``items`` and return the results in input order.
+
+    ``func`` receives a list of items and must return one result per item. For
+    the ``process`` executor it has to be a picklable module-level function.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor {executor!r}; expected one of {EXECUTORS}")
+    items = list(items)
+    if not items:
+        return []
+    if executor == "serial":
+        return func(items)
+
+    workers = min(resolve_jobs(jobs), len(items))
+    if chunksize is None:
+        # A few chunks per worker keeps load balanced without drowning in IPC.
+        chunksize = max(1, min(256, math.ceil(len(items) / (workers * 4))))
+    chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+
+    # Imported here: concurrent.futures is slow to import and serial runs never need it.
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    results: List[R] = []
+    with pool_cls(max_workers=workers) as pool:
+        for chunk_result in pool.map(func, chunks):
+            results.extend(chunk_result)
+    return results
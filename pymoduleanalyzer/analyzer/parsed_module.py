@@ -0,0 +1,202 @@
+"""Shared parse-once store for Python source files."""
+
+from __future__ import annotations
+
+import ast
+import io
+import os
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from ..utils.cache import FileStamp, stamp_bytes
+from .import_records import SCOPE_FUNCTION, SCOPE_MODULE, SCOPE_NESTED, SCOPE_TYPE_CHECKING
+
+
+@dataclass
+class ParsedModule:
+    """Source, syntax tree and commonly needed facts for one file."""
+
+    path: Path
+    source: str
+    tree: ast.Module
+    imports: List[ast.AST] = field(default_factory=list)
+    import_scopes: List[int] = field(default_factory=list)
+    functions: List[str] = field(default_factory=list)
+    line_count: int = 0
+    class_count: int = 0
+    abstract_class_count: int = 0
+    stamp: FileStamp | None = None
+
+    @classmethod
+    def from_source(cls, path: Path, source: str) -> "ParsedModule":
+        """Parse ``source`` and collect imports, functions and classes in one walk.
+
+        Only statements can hold these, so the walk skips expressions. It
+        visits nodes breadth-first like ``ast.walk``, keeping the function
+        order of a full walk, and tracks the scope of each import (see
+        :mod:`.import_records`). Imports are returned in source order.
+        """
+        tree = ast.parse(source)
+        found: List[Tuple[ast.AST, int]] = []
+        functions: List[str] = []
+        class_count = abstract_class_count = 0
+        todo: deque[Tuple[ast.AST, int]] = deque([(tree, SCOPE_MODULE)])
+        while todo:
+            node, scope = todo.popleft()
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                found.append((node, scope))
+                continue
+            if isinstance(node, ast.FunctionDef):
+                functions.append(node.name)
+            elif isinstance(node, ast.ClassDef):
+                class_count += 1
+                abstract_class_count += _is_abstract(node)
+            fields = _block_fields(type(node))
+            if not fields:
+                continue
+            inner = _inner_scope(node, scope)
+            if isinstance(node, ast.If) and _dotted_tail(node.test) == "TYPE_CHECKING":
+                # Only the body of ``if TYPE_CHECKING:`` is skipped at run time.
+                todo.extend((child, SCOPE_TYPE_CHECKING) for child in node.body)
+                todo.extend((child, inner) for child in node.orelse)
+                continue
+            for name in fields:
+                todo.extend((child, inner) for child in getattr(node, name))
+        found.sort(key=lambda item: (item[0].lineno, item[0].col_offset))
+        return cls(
+            path=path,
+            source=source,
+            tree=tree,
+            imports=[node for node, _ in found],
+            import_scopes=[scope for _, scope in found],
+            functions=functions,
+            line_count=len(source.splitlines()),
+            class_count=class_count,
+            abstract_class_count=abstract_class_count,
+        )
+
+
+# Fields holding statements (or handlers and match cases wrapping them), per node type.
+_BLOCKS = ("body", "handlers", "orelse", "finalbody", "cases")
+_block_field_cache: Dict[type, Tuple[str, ...]] = {}
+
+
+def _block_fields(node_type: type) -> Tuple[str, ...]:
+    fields = _block_field_cache.get(node_type)
+    if fields is None:
+        fields = _block_field_cache[node_type] = (
+            ()
+            if issubclass(node_type, ast.expr)
+            else tuple(name for name in node_type._fields if name in _BLOCKS)
+        )
+    return fields
+
+
+def _inner_scope(node: ast.AST, scope: int) -> int:
+    """Return the scope of the statements nested in ``node``."""
+    if scope == SCOPE_TYPE_CHECKING or isinstance(node, ast.Module):
+        return scope
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        return SCOPE_FUNCTION
+    return SCOPE_NESTED if scope == SCOPE_MODULE else scope
+
+
+_ABSTRACT_BASES = {"ABC", "ABCMeta", "Protocol"}
+
+
+def _dotted_tail(node: ast.AST) -> str:
+    """Return the last component of a name or attribute expression."""
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Subscript):
+        return _dotted_tail(node.value)
+    return ""
+
+
+def _is_abstract(node: ast.ClassDef) -> bool:
+    """Return True for ABCs, protocols and classes declaring abstract methods."""
+    if any(_dotted_tail(base) in _ABSTRACT_BASES for base in node.bases):
+        return True
+    if any(_dotted_tail(keyword.value) == "ABCMeta" for keyword in node.keywords):
+        return True
+    return any(
+        isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+        and any(
+            _dotted_tail(decorator) == "abstractmethod" for decorator in item.decorator_list
+        )
+        for item in node.body
+    )
+
+
+class ModuleStore:
+    """Size-bounded LRU cache of :class:`ParsedModule` objects.
+
+    Entries are validated against the file's mtime and size so a file edited
+    during a long-running process is parsed again instead of served stale.
+    """
+
+    def __init__(self, maxsize: int = 512) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[tuple[int, int], ParsedModule]] = OrderedDict()
+
+    def get(self, path: Path) -> ParsedModule:
+        """Return the parsed module for ``path``, parsing it on a miss."""
+        key = os.fspath(path)
+        stat = os.stat(key)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == signature:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        data = Path(path).read_bytes()
+        parsed = ParsedModule.from_source(Path(path), decode_text(data))
+        parsed.stamp = stamp_bytes(data, stat)
+        if self.maxsize > 0:
+            self._entries[key] = (signature, parsed)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return parsed
+
+    def discard(self, path: Path) -> None:
+        """Forget any cached entry for ``path``."""
+        self._entries.pop(os.fspath(path), None)
+
+    def clear(self) -> None:
+        """Drop all cached entries and reset counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, (str, os.PathLike)) and os.fspath(path) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def decode_text(data: bytes) -> str:
+    """Return ``data`` decoded the way :meth:`Path.read_text` decodes a file."""
+    return io.TextIOWrapper(io.BytesIO(data), encoding="locale").read()
+
+
+_default_store = ModuleStore()
+
+
+def default_store() -> ModuleStore:
+    """Return the process-wide store used when no store is passed explicitly."""
+    return _default_store
+
+
+def get_parsed_module(path: Path, store: ModuleStore | None = None) -> ParsedModule:
+    """Return the parsed module for ``path`` from ``store`` or the default store."""
+    return (store if store is not None else _default_store).get(path)
@@ -0,0 +1,152 @@
+"""Transitive reachability over the SCC condensation of a dependency graph."""
+
+from __future__ import annotations
+
+from typing import Callable, Iterable, List, Sequence
+
+from .cycles import strongly_connected_components
+from .dependency_graph import DependencyGraph
+
+
+def _bits(positions: Iterable[int], size: int) -> int:
+    """Return an integer bitset with the given bit positions set."""
+    buffer = bytearray((size + 7) // 8)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, "little")
+
+
+class Condensation:
+    """Strongly connected components of a graph and the DAG between them.
+
+    ``components`` are in reverse topological order: every component comes
+    after all components it depends on. Bitsets are laid out per direction so
+    that the nodes a component can reach occupy the lowest bits: downstream
+    sets use ``position``, upstream sets use it mirrored. That keeps every
+    closure bitset as short as possible.
+    """
+
+    def __init__(self, graph: Sequence[Sequence[int]]) -> None:
+        self.components: List[List[int]] = strongly_connected_components(graph)
+        self.component_of = [0] * len(graph)
+        self.position = [0] * len(graph)
+        self.order: List[int] = []
+        for component, members in enumerate(self.components):
+            for node in members:
+                self.component_of[node] = component
+                self.position[node] = len(self.order)
+                self.order.append(node)
+
+        component_of = self.component_of
+        self.successors: List[List[int]] = []
+        self.predecessors: List[List[int]] = [[] for _ in self.components]
+        for component, members in enumerate(self.components):
+            targets = {
+                component_of[target]
+                for node in members
+                for target in graph[node]
+            }
+            targets.discard(component)
+            self.successors.append(sorted(targets))
+            for target in targets:
+                self.predecessors[target].append(component)
+
+    def bit(self, node: int, downstream: bool = True) -> int:
+        """Return the bit position of ``node`` in the given direction's layout."""
+        if downstream:
+            return self.position[node]
+        return len(self.order) - 1 - self.position[node]
+
+    def member_bits(self, component: int, downstream: bool = True) -> int:
+        """Return the bitset of a component's own members."""
+        members = self.components[component]
+        if len(members) == 1:
+            return 1 << self.bit(members[0], downstream)
+        return _bits((self.bit(node, downstream) for node in members), len(self.order))
+
+    def closure(self, downstream: bool = True) -> List[int]:
+        """Return, per component, the bitset of nodes reachable from it (itself included).
+
+        ``downstream=False`` gives the nodes that can reach the component.
+        """
+        count = len(self.components)
+        reach = [0] * count
+        if downstream:
+            order, edges = range(count), self.successors
+        else:
+            order, edges = range(count - 1, -1, -1), self.predecessors
+        for component in order:
+            bits = self.member_bits(component, downstream)
+            for other in edges[component]:
+                bits |= reach[other]
+            reach[component] = bits
+        return reach
+
+    def closure_counts(self, mask: int = -1, downstream: bool = True) -> List[int]:
+        """Return, per component, how many nodes in ``mask`` it reaches.
+
+        ``mask`` must use the same direction's layout, see :meth:`mask`.
+
+        Bitsets are released as soon as every component that needs them has
+        been processed, so peak memory follows the width of the DAG rather
+        than the full closure.
+        """
+        count = len(self.components)
+        if downstream:
+            order, edges, consumers = range(count), self.successors, self.predecessors
+        else:
+            order, edges, consumers = range(count - 1, -1, -1), self.predecessors, self.successors
+        pending = [len(consumers[component]) for component in range(count)]
+        reach: List[int | None] = [None] * count
+        counts = [0] * count
+        for component in order:
+            bits = self.member_bits(component, downstream)
+            for other in edges[component]:
+                bits |= reach[other]
+                pending[other] -= 1
+                if not pending[other]:
+                    reach[other] = None
+            counts[component] = (bits & mask).bit_count()
+            if pending[component]:
+                reach[component] = bits
+        return counts
+
+    def mask(self, predicate: Callable[[int], bool], downstream: bool = True) -> int:
+        """Return the bitset of nodes for which ``predicate(node)`` holds."""
+        return _bits(
+            (self.bit(node, downstream) for node in range(len(self.order)) if predicate(node)),
+            len(self.order),
+        )
+
+    def nodes(self, bits: int, downstream: bool = True) -> List[int]:
+        """Return the node IDs set in ``bits``, in bit order."""
+        order = self.order if downstream else self.order[::-1]
+        text = format(bits, "b")[::-1]
+        result = []
+        position = text.find("1")
+        while position != -1:
+            result.append(order[position])
+            position = text.find("1", position + 1)
+        return result
+
+
+def transitive_counts(
+    graph: DependencyGraph,
+    downstream: bool = True,
+    condensation: Condensation | None = None,
+) -> List[int]:
+    """Return, per node, the number of other analyzed modules it reaches.
+
+    ``downstream=False`` counts the analyzed modules that reach each node
+    (transitive fan-in). Pass ``condensation`` to share one SCC pass between
+    both directions.
+    """
+    if condensation is None:
+        condensation = Condensation(graph)
+    internal = condensation.mask(lambda node: not graph.is_external(node), downstream)
+    per_component = condensation.closure_counts(internal, downstream)
+    component_of = condensation.component_of
+    return [
+        per_component[component_of[node]] - (0 if graph.is_external(node) else 1)
+        for node in range(len(graph))
+    ]
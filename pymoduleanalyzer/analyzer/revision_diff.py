@@ -0,0 +1,273 @@
+"""Structural differences (edges, cycles, coupling) between two git revisions."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from importlib.util import decode_source
+from pathlib import Path
+from typing import Dict, List, Sequence, Set, Tuple
+
+from ..utils import profiling
+from ..utils.config import load_project_config
+from ..utils.file_utils import DEFAULT_EXCLUDE_DIRS, is_excluded
+from ..utils.git import cat_file, changed_files, resolve_commit, untracked_files
+from .cycles import Cycle
+from .import_analyzer import ParseError, analyze_source
+from .import_records import ImportTable
+from .incremental import IncrementalGraph
+from .module_index import ModuleIndex
+
+# Content of a module on one side: a blob SHA, WORK_TREE, or None when absent.
+WORK_TREE = "work tree"
+
+
+@dataclass
+class InstabilityChange:
+    """Afferent and efferent coupling of one module before and after."""
+
+    module: str
+    afferent: Tuple[int, int]
+    efferent: Tuple[int, int]
+
+    @staticmethod
+    def _instability(ca: int, ce: int) -> float:
+        return ce / (ca + ce) if ca + ce else 0.0
+
+    @property
+    def before(self) -> float:
+        """Instability on the base side."""
+        return self._instability(self.afferent[0], self.efferent[0])
+
+    @property
+    def after(self) -> float:
+        """Instability on the head side."""
+        return self._instability(self.afferent[1], self.efferent[1])
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation."""
+        return {
+            "module": self.module,
+            "instability": [round(self.before, 2), round(self.after, 2)],
+            "afferent": list(self.afferent),
+            "efferent": list(self.efferent),
+        }
+
+
+@dataclass
+class RevisionDiff:
+    """What changed structurally between ``base`` and ``head``."""
+
+    base: str
+    head: str
+    changed_files: List[str] = field(default_factory=list)
+    parsed_files: int = 0
+    added_modules: List[str] = field(default_factory=list)
+    removed_modules: List[str] = field(default_factory=list)
+    added_edges: List[Tuple[str, str]] = field(default_factory=list)
+    removed_edges: List[Tuple[str, str]] = field(default_factory=list)
+    new_cycles: List[Cycle] = field(default_factory=list)
+    resolved_cycles: List[Cycle] = field(default_factory=list)
+    instability: List[InstabilityChange] = field(default_factory=list)
+    errors: List[ParseError] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation."""
+        return {
+            "base": self.base,
+            "head": self.head,
+            "changed_files": self.changed_files,
+            "parsed_files": self.parsed_files,
+            "added_modules": self.added_modules,
+            "removed_modules": self.removed_modules,
+            "added_edges": [list(edge) for edge in self.added_edges],
+            "removed_edges": [list(edge) for edge in self.removed_edges],
+            "new_cycles": [cycle.to_dict() for cycle in self.new_cycles],
+            "resolved_cycles": [cycle.to_dict() for cycle in self.resolved_cycles],
+            "instability_changes": [change.to_dict() for change in self.instability],
+            "parse_errors": [
+                {"path": str(error.path), "message": error.message} for error in self.errors
+            ],
+        }
+
+
+def _revision_contents(
+    root: Path,
+    rev: str,
+    modules: Set[Path],
+    untracked: Set[Path],
+    exclude: Sequence[str],
+) -> Dict[Path, str | None]:
+    """Return the modules whose content at ``rev`` differs from the work tree.
+
+    Values are the blob SHA at ``rev``, or None for modules ``rev`` lacks.
+    Files deleted from the work tree are included unless the exclude
+    configuration would skip them.
+    """
+    contents: Dict[Path, str | None] = {module: None for module in untracked}
+    for rel_path, (status, blob) in changed_files(root, rev).items():
+        module = root / rel_path
+        if status == "A":
+            contents[module] = None
+        elif module in modules or (
+            status == "D" and not is_excluded(rel_path, DEFAULT_EXCLUDE_DIRS, exclude)
+        ):
+            contents[module] = blob
+    return contents
+
+
+def _side(contents: Dict[Path, str | None], module: Path, work: Set[Path]) -> str | None:
+    if module in contents:
+        return contents[module]
+    return WORK_TREE if module in work else None
+
+
+def _edge_changes(
+    graph: IncrementalGraph,
+    successors: List[Dict[int, int]],
+    names: List[str],
+    touched: Set[int],
+) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """Return the removed and added edges since ``graph`` had ``successors`` and ``names``.
+
+    Edges are compared by name, so the edges of a module renamed by a
+    package marker appearing or disappearing count as changed too.
+    """
+    renamed = {node for node, name in enumerate(names) if graph.names[node] != name}
+    sources = {node for node in touched | renamed if node < len(successors)}
+    if renamed:
+        sources.update(
+            source
+            for source, targets in enumerate(successors)
+            if not renamed.isdisjoint(targets)
+        )
+        for node in renamed:
+            sources.update(graph.predecessors[node])
+    removed: List[Tuple[str, str]] = []
+    added: List[Tuple[str, str]] = []
+    for source in sources:
+        before = {(names[source], names[target]) for target in successors[source]}
+        after = {
+            (graph.names[source], graph.names[target]) for target in graph.successors[source]
+        }
+        removed += before - after
+        added += after - before
+    return removed, added
+
+
+def diff_revisions(
+    root: str,
+    modules: List[Path],
+    imports: Dict[Path, ImportTable],
+    base: str,
+    head: str | None = None,
+    extractor: str = "ast",
+    min_change: float = 0.0,
+) -> RevisionDiff:
+    """Compare the import structure of ``base`` with ``head`` (default: the work tree).
+
+    ``modules`` and ``imports`` are the analysis of the work tree, usually
+    served from the cache. ``git diff`` against each revision lists the
+    files whose content differs there. Only those are read, through one
+    ``git cat-file --batch``, and parsed, once per distinct blob. The base
+    graph is the work-tree analysis with the base-side deltas applied;
+    head-side deltas are then applied to it with
+    :meth:`IncrementalGraph.update`, which reports the changed edges and
+    keeps cycles current. Each side resolves imports against its own
+    module set (:meth:`IncrementalGraph.reindex`), so the edges of both
+    sides are those a full analysis of that side would find.
+    Instability changes smaller than ``min_change`` are left out.
+    """
+    root_path = Path(root)
+    base_sha = resolve_commit(root, base)
+    head_sha = resolve_commit(root, head) if head else None
+    exclude = load_project_config(root_path).get("exclude", [])
+    work = set(modules)
+
+    with profiling.phase("git_diff"):
+        untracked = {root_path / rel_path for rel_path in untracked_files(root)} & work
+        base_contents = _revision_contents(root_path, base_sha, work, untracked, exclude)
+        head_contents: Dict[Path, str | None] = {}
+        if head_sha is not None:
+            head_contents = _revision_contents(root_path, head_sha, work, untracked, exclude)
+
+    extra = sorted(
+        {module for module in (*base_contents, *head_contents) if module not in work},
+        key=lambda module: module.parts,
+    )
+    union = list(modules) + extra
+    sides = {
+        module: (_side(base_contents, module, work), _side(head_contents, module, work))
+        for module in union
+    }
+    changed = [module for module in union if sides[module][0] != sides[module][1]]
+
+    # Parse every distinct blob either side needs, once.
+    blobs: Dict[str, Path] = {}
+    for module, pair in sides.items():
+        for content in pair:
+            if content not in (None, WORK_TREE):
+                blobs.setdefault(content, module)
+    errors: List[ParseError] = []
+    parsed: Dict[str, ImportTable] = {}
+    with profiling.phase("read_blobs", blobs=len(blobs)):
+        for blob, data in cat_file(root, blobs):
+            try:
+                parsed[blob] = analyze_source(blobs[blob], decode_source(data or b""), extractor)
+            except (SyntaxError, ValueError) as exc:
+                errors.append(ParseError(blobs[blob], f"{type(exc).__name__}: {exc}"))
+                parsed[blob] = ImportTable()
+
+    def deps(content: str | None, module: Path) -> ImportTable:
+        if content is None:
+            return ImportTable()
+        return imports.get(module, ImportTable()) if content == WORK_TREE else parsed[content]
+
+    result = RevisionDiff(base, head or WORK_TREE, parsed_files=len(blobs), errors=errors)
+    with profiling.phase("apply_deltas", changed=len(changed)):
+        base_index = ModuleIndex(module for module in union if sides[module][0] is not None)
+        head_index = ModuleIndex(module for module in union if sides[module][1] is not None)
+        graph = IncrementalGraph(
+            {module: deps(sides[module][0], module) for module in union}, ModuleIndex(union)
+        )
+        graph.reindex(base_index)
+        cycles_before = {tuple(cycle.modules): cycle for cycle in graph.cycles()}
+        afferent = [len(parents) for parents in graph.predecessors]
+        efferent = [len(children) for children in graph.successors]
+        # update() replaces a node's successor mapping, so a shallow copy keeps the base side.
+        successors = list(graph.successors)
+        names = list(graph.names)
+        touched = graph.reindex(head_index)
+        for module in changed:
+            touched |= graph.update(module, deps(sides[module][1], module))
+        cycles_after = {tuple(cycle.modules): cycle for cycle in graph.cycles()}
+        result.removed_edges, result.added_edges = _edge_changes(graph, successors, names, touched)
+
+    result.changed_files = [str(module) for module in changed]
+    for module in changed:
+        base_side, head_side = sides[module]
+        if base_side is None:
+            result.added_modules.append(head_index.name(module))
+        elif head_side is None:
+            result.removed_modules.append(base_index.name(module))
+    result.new_cycles = [cycle for key, cycle in cycles_after.items() if key not in cycles_before]
+    result.resolved_cycles = [
+        cycle for key, cycle in cycles_before.items() if key not in cycles_after
+    ]
+    for node in touched:
+        path = graph.paths[node]
+        if path is None or None in sides[path]:
+            continue
+        known = node < len(afferent)
+        change = InstabilityChange(
+            graph.names[node],
+            (afferent[node] if known else 0, graph.afferent(node)),
+            (efferent[node] if known else 0, graph.efferent(node)),
+        )
+        if change.before != change.after and abs(change.after - change.before) >= min_change:
+            result.instability.append(change)
+    result.instability.sort(
+        key=lambda change: (-abs(change.after - change.before), change.module)
+    )
+    result.added_edges.sort()
+    result.removed_edges.sort()
+    return result
@@ -0,0 +1,197 @@
+"""Split import analysis into shards that run separately, then merge the results."""
+
+from __future__ import annotations
+
+import fnmatch
+import gzip
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from ..utils import profiling
+from ..utils.file_utils import walk_order
+from .import_analyzer import ParseError, analyze_imports
+from .import_records import ImportTable
+from .parallel import map_chunks
+
+# Bump whenever the layout of shard files changes.
+SHARD_VERSION = 3
+
+# Shard of the files directly under the root (package sharding) and of the
+# files no glob matches (glob sharding).
+ROOT_SHARD = "__root__"
+REST_SHARD = "rest"
+
+
+def module_listing(rel_paths: Sequence[str]) -> dict:
+    """Return the count and digest identifying a complete, ordered module list."""
+    digest = hashlib.sha256("\0".join(rel_paths).encode()).hexdigest()
+    return {"count": len(rel_paths), "digest": digest}
+
+
+def plan_shards(rel_paths: Sequence[str], globs: Sequence[str] = ()) -> Dict[str, List[str]]:
+    """Group root-relative module paths into named shards, keeping their order.
+
+    Without ``globs`` every top-level directory is a shard. Otherwise a file
+    goes to the first glob matching its path, and to :data:`REST_SHARD`
+    when none does.
+    """
+    shards: Dict[str, List[str]] = {}
+    for rel_path in rel_paths:
+        if globs:
+            name = next(
+                (pattern for pattern in globs if fnmatch.fnmatchcase(rel_path, pattern)),
+                REST_SHARD,
+            )
+        else:
+            head, slash, _ = rel_path.partition("/")
+            name = head if slash else ROOT_SHARD
+        shards.setdefault(name, []).append(rel_path)
+    return shards
+
+
+def shard_file(output_dir: Path, name: str) -> Path:
+    """Return where the results of shard ``name`` are written."""
+    safe = re.sub(r"[^\w.-]+", "_", name).strip("._") or "shard"
+    return Path(output_dir) / f"{safe}.json.gz"
+
+
+def analyze_shard(
+    root: str,
+    name: str,
+    rel_paths: Sequence[str],
+    listing: dict,
+    output: Path,
+    extractor: str = "ast",
+) -> Tuple[int, int]:
+    """Analyze one shard and write its module table to ``output``.
+
+    Each row holds a module's root-relative path, its import table rows
+    (resolving them needs every package marker, so that waits for
+    :func:`merge_shards`) and its file metrics. Returns the module and
+    parse error counts.
+    """
+    modules = [Path(root) / rel_path for rel_path in rel_paths]
+    errors: List[ParseError] = []
+    file_metrics: Dict[Path, Dict[str, object]] = {}
+    imports = analyze_imports(
+        modules, errors=errors, extractor=extractor, file_metrics=file_metrics
+    )
+    rel = dict(zip(modules, rel_paths))
+    data = {
+        "version": SHARD_VERSION,
+        "shard": name,
+        "extractor": extractor,
+        "listing": listing,
+        "modules": [
+            [rel[module], imports[module].to_rows(), file_metrics.get(module)]
+            for module in modules
+        ],
+        "parse_errors": [[rel[error.path], error.message] for error in errors],
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(output, "wt", encoding="utf-8", compresslevel=1) as handle:
+        json.dump(data, handle, separators=(",", ":"))
+    return len(modules), len(errors)
+
+
+def _analyze_shard_chunk(
+    root: str, listing: dict, extractor: str, tasks: List[Tuple[str, List[str], Path]]
+) -> List[Tuple[int, int]]:
+    """Analyze a chunk of shards; module-level so process pools can pickle it."""
+    return [
+        analyze_shard(root, name, rel_paths, listing, output, extractor)
+        for name, rel_paths, output in tasks
+    ]
+
+
+def run_shards(
+    root: str,
+    shards: Dict[str, List[str]],
+    listing: dict,
+    output_dir: Path,
+    extractor: str = "ast",
+    jobs: int = 1,
+    executor: str = "serial",
+) -> Dict[str, Tuple[int, int]]:
+    """Analyze ``shards``, one worker task per shard, and return their counts by name."""
+    files = [shard_file(output_dir, name) for name in shards]
+    if len(set(files)) != len(files):
+        raise ValueError("two shard names map to the same file name")
+    tasks = [(name, rel_paths, path) for (name, rel_paths), path in zip(shards.items(), files)]
+    with profiling.phase("run_shards", shards=len(tasks)):
+        counts = map_chunks(
+            partial(_analyze_shard_chunk, root, listing, extractor),
+            tasks,
+            jobs=jobs,
+            executor=executor,
+            chunksize=1,
+        )
+    return dict(zip(shards, counts))
+
+
+@dataclass
+class MergedAnalysis:
+    """Shard results combined into what ``analyze_imports`` returns for the whole tree."""
+
+    modules: List[Path] = field(default_factory=list)
+    imports: Dict[Path, ImportTable] = field(default_factory=dict)
+    file_metrics: Dict[Path, Dict[str, object]] = field(default_factory=dict)
+    errors: List[ParseError] = field(default_factory=list)
+    extractor: str = "ast"
+
+
+def merge_shards(root: str, files: Sequence[Path]) -> MergedAnalysis:
+    """Combine shard files into the analysis of every module under ``root``.
+
+    Rows are put back in discovery order, so the graph, metrics and cycles
+    built from the result are identical to a single-process run. Raises
+    ``ValueError`` when the shards come from different module lists or
+    extractors, overlap, or do not cover every module.
+    """
+    rows: Dict[str, list] = {}
+    errors: Dict[str, str] = {}
+    listing = extractor = None
+    with profiling.phase("load_shards", shards=len(files)):
+        for path in files:
+            try:
+                with gzip.open(path, "rt", encoding="utf-8") as handle:
+                    data = json.load(handle)
+            except (OSError, ValueError) as exc:
+                raise ValueError(f"cannot read shard {path}: {exc}") from exc
+            if data.get("version") != SHARD_VERSION:
+                raise ValueError(f"{path} was written by an incompatible version")
+            if listing is None:
+                listing, extractor = data["listing"], data["extractor"]
+            elif data["listing"] != listing:
+                raise ValueError(f"{path} was produced from a different module list")
+            elif data["extractor"] != extractor:
+                raise ValueError(f"{path} was produced with a different import extractor")
+            for row in data["modules"]:
+                if row[0] in rows:
+                    raise ValueError(f"{row[0]} appears in more than one shard")
+                row[1] = ImportTable.from_rows(row[1])
+                rows[row[0]] = row
+            errors.update(data["parse_errors"])
+
+    order = sorted(rows, key=walk_order)
+    if listing is None or module_listing(order) != listing:
+        expected = listing["count"] if listing else 0
+        if len(order) == expected:
+            raise ValueError("the shards' modules differ from the list they were planned from")
+        raise ValueError(f"the shards cover {len(order)} of {expected} module(s)")
+    merged = MergedAnalysis(extractor=extractor)
+    for rel_path in order:
+        module = Path(root) / rel_path
+        _, imports, metrics = rows[rel_path]
+        merged.modules.append(module)
+        merged.imports[module] = imports
+        if rel_path in errors:
+            merged.errors.append(ParseError(module, errors[rel_path]))
+        elif metrics is not None:
+            merged.file_metrics[module] = metrics
+    return merged
@@ -1,3 +1,3 @@
 """Command line interface package."""
 
-__all__ = ["main", "commands"]
+__all__ = ["main", "commands", "watch"]
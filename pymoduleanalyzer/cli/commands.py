@@ -1,96 +1,877 @@
-"""CLI command definitions for PyModuleAnalyzer."""
+"""CLI command definitions for PyModuleAnalyzer.
 
+Only what option definitions need is imported at module level. Analysis,
+metrics and the visualizers are imported inside the commands that use
+them, so ``--help`` and unrelated subcommands start without loading
+numpy, jinja2 or the worker pools.
+"""
+
+import heapq
 import json
+import sys
+from contextlib import nullcontext
 from pathlib import Path
+from typing import TYPE_CHECKING, List
 
 import typer
 
-from ..analyzer.module_discovery import discover_modules
-from ..analyzer.import_analyzer import analyze_imports, detect_circular_dependencies
-from ..metrics.coupling import afferent_coupling, efferent_coupling, instability
-from ..visualization.graph_generator import generate_dot, generate_mermaid
+from ..analyzer.parallel import EXECUTORS, default_executor
+from ..utils import profiling
+from ..utils.cache import DEFAULT_CACHE_DIR, AnalysisCache, BlobCache
+from ..utils.json_stream import JsonStreamWriter, NdjsonWriter, dict_order
+
+if TYPE_CHECKING:
+    from ..analyzer.import_analyzer import ParseError
 
 
 app = typer.Typer(help="Repository analysis commands")
 
-@app.command()
-def repository(
-    path: str = ".",
-    json_output: str | None = None,
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    profile: bool = typer.Option(
+        False, "--profile", help="Print a phase timing and memory table to stderr"
+    ),
+    trace_out: str | None = typer.Option(
+        None, "--trace-out", help="Write phase timings as a Chrome trace-event JSON file"
+    ),
+    profile_memory: bool = typer.Option(
+        False,
+        "--profile-memory",
+        help="Also record per-phase peak memory with tracemalloc (slows the run down)",
+    ),
+    profile_files: int = typer.Option(
+        10, "--profile-files", help="Number of slowest files to report when profiling"
+    ),
 ) -> None:
-    """Analyze the given repository."""
-    modules = discover_modules(path)
-    typer.echo(f"Discovered {len(modules)} module(s).")
+    """Repository analysis commands."""
+    if not (profile or trace_out):
+        return
+    profiler = profiling.enable(profiling.Profiler(profile_memory, profile_files))
+    phase = profiler.phase(ctx.invoked_subcommand or "analyze")
+    phase.__enter__()
 
-    imports = analyze_imports(modules)
-    abs_count = sum(1 for deps in imports.values() for d in deps if not d.startswith("."))
-    rel_count = sum(1 for deps in imports.values() for d in deps if d.startswith("."))
-
-    aff = afferent_coupling(imports)
-    eff = efferent_coupling(imports)
-    inst = instability(aff, eff)
-
-    cycles = detect_circular_dependencies(imports)
-
-    analysis = {
-        "module_count": len(modules),
-        "absolute_imports": abs_count,
-        "relative_imports": rel_count,
-        "modules": {
-            module.stem: {
-                "afferent": aff[module],
-                "efferent": eff[module],
-                "instability": round(inst[module], 2),
-            }
-            for module in modules
-        },
-        "circular_dependencies": cycles,
-    }
+    def report() -> None:
+        phase.__exit__(None, None, None)
+        profiling.disable()
+        if profile:
+            typer.echo(profiler.summary(), err=True)
+        if trace_out:
+            profiler.write_trace(trace_out)
+            typer.echo(f"Wrote trace to {trace_out}", err=True)
 
-    if json_output:
-        Path(json_output).write_text(json.dumps(analysis, indent=2))
-        typer.echo(f"Wrote {json_output}")
+    ctx.call_on_close(report)
+
+
+# Options shared by every command that analyzes imports.
+NO_CACHE_OPTION = typer.Option(False, "--no-cache", help="Re-parse every file")
+CACHE_DIR_OPTION = typer.Option(
+    None, "--cache-dir", help=f"Cache location (default: <path>/{DEFAULT_CACHE_DIR})"
+)
+JOBS_OPTION = typer.Option(1, "--jobs", "-j", help="Parallel workers (0 = all cores)")
+EXECUTOR_OPTION = typer.Option(
+    None,
+    "--executor",
+    help=f"Execution backend: {', '.join(EXECUTORS)} (default: process when --jobs > 1)",
+)
+USE_GIT_OPTION = typer.Option(
+    False, "--use-git", help="List files with git ls-files instead of walking the tree"
+)
+FAST_IMPORTS_OPTION = typer.Option(
+    False, "--fast-imports", help="Extract imports with the scanner instead of a full parse"
+)
+
+
+def _open_cache(path: str, no_cache: bool, cache_dir: str | None) -> AnalysisCache | None:
+    """Return the analysis cache for ``path`` unless caching is disabled."""
+    if no_cache:
+        return None
+    return AnalysisCache(Path(cache_dir) if cache_dir else Path(path) / DEFAULT_CACHE_DIR)
+
+
+def _discover_modules(path: str, use_git: bool = False) -> List[Path]:
+    """Return the modules under ``path``, reporting a failed ``git ls-files`` as bad usage."""
+    from ..analyzer.module_discovery import discover_modules
+
+    try:
+        return discover_modules(path, use_git=use_git)
+    except RuntimeError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--use-git") from exc
+
+
+def _check_executor(executor: str | None) -> None:
+    if executor is not None and executor not in EXECUTORS:
+        raise typer.BadParameter(
+            f"expected one of {', '.join(EXECUTORS)}", param_hint="--executor"
+        )
+
+
+def _run_analysis(
+    modules,
+    cache: AnalysisCache | None,
+    jobs: int,
+    executor: str | None,
+    errors: "list[ParseError]",
+    fast_imports: bool = False,
+    file_metrics: dict | None = None,
+    err: bool = False,
+):
+    """Analyze imports with the requested backend and report cache counters.
+
+    ``err`` sends the progress messages to stderr, for when stdout carries
+    machine-readable output.
+    """
+    from ..analyzer.import_analyzer import analyze_imports
+
+    _check_executor(executor)
+    options = dict(
+        jobs=jobs,
+        executor=executor or default_executor(jobs),
+        errors=errors,
+        extractor="scan" if fast_imports else "ast",
+        file_metrics=file_metrics,
+    )
+    if cache is None:
+        imports = analyze_imports(modules, **options)
+    else:
+        with cache:
+            imports = analyze_imports(modules, cache=cache, **options)
+        typer.echo(f"Cache: {cache.hits} hit(s), {cache.misses} miss(es).", err=err)
+    _echo_errors(errors, err)
+    return imports
+
+
+def _echo_errors(errors: "list[ParseError]", err: bool = False) -> None:
+    """List files that failed to parse."""
+    if errors:
+        typer.echo(f"Failed to parse {len(errors)} file(s):", err=err)
+        for error in errors:
+            typer.echo(f" - {error.path}: {error.message}", err=err)
+
+
+REPORT_FORMATS = ("text", "json", "compact", "ndjson")
+REPORT_FORMAT_OPTION = typer.Option(
+    None,
+    "--format",
+    "-f",
+    help=(
+        "Report format: text, json (indented), compact (streamed JSON) or ndjson"
+        " (one record per line); default json with --json-output, else text"
+    ),
+)
+
+
+def _report_format(format: str | None, json_output: str | None) -> "tuple[str, bool]":
+    """Return the report format to use and whether the report goes to stdout."""
+    format = format or ("json" if json_output else "text")
+    if format not in REPORT_FORMATS:
+        raise typer.BadParameter(
+            f"expected one of {', '.join(REPORT_FORMATS)}", param_hint="--format"
+        )
+    return format, format != "text" and json_output in (None, "-")
+
+
+def _write_report(handle, format: str, header: dict, sections: dict) -> None:
+    """Write the repository report, streaming for the compact and ndjson formats.
+
+    ``sections`` maps ``modules`` and ``packages`` to iterables of
+    ``(name, record)`` pairs and ``functions``, ``circular_dependencies``
+    and ``parse_errors`` to iterables of records; nothing is materialized
+    except for the indented ``json`` format.
+    """
+    if format == "json":
+        report = dict(header)
+        report["modules"] = dict(sections["modules"])
+        report["packages"] = dict(sections["packages"])
+        report["functions"] = list(sections["functions"])
+        report["circular_dependencies"] = list(sections["circular_dependencies"])
+        report["parse_errors"] = list(sections["parse_errors"])
+        json.dump(report, handle, indent=2)
+    elif format == "compact":
+        writer = JsonStreamWriter(handle)
+        writer.begin("{")
+        writer.items(header.items())
+        for key in ("modules", "packages"):
+            writer.begin("{", key)
+            writer.items(sections[key])
+            writer.end()
+        for key in ("functions", "circular_dependencies", "parse_errors"):
+            writer.begin("[", key)
+            for record in sections[key]:
+                writer.item(record)
+            writer.end()
+        writer.end()
+    else:
+        writer = NdjsonWriter(handle)
+        for record in sections["parse_errors"]:
+            writer.write({"type": "parse_error", **record})
+        for key, kind in (("modules", "module"), ("packages", "package")):
+            for name, record in sections[key]:
+                writer.write({"type": kind, "name": name, **record})
+        for record in sections["functions"]:
+            writer.write({"type": "function", **record})
+        cycle_count = 0
+        for record in sections["circular_dependencies"]:
+            writer.write({"type": "cycle", **record})
+            cycle_count += 1
+        writer.write({"type": "summary", **header, "cycle_count": cycle_count})
+        writer.close()
+
+
+def _report_repository(
+    modules,
+    imports,
+    file_metrics: dict,
+    errors: "list[ParseError]",
+    format: str,
+    json_output: str | None,
+    to_stdout: bool,
+) -> None:
+    """Build the graph and metrics from analysis results and print or write the report."""
+    from ..analyzer.cycles import find_cycles
+    from ..analyzer.dependency_graph import DependencyGraph
+    from ..analyzer.import_records import relative_count
+    from ..analyzer.module_index import ModuleIndex
+    from ..metrics.graph_metrics import compute_metrics
+
+    rel_count = sum(relative_count(deps) for deps in imports.values())
+    abs_count = sum(len(deps) for deps in imports.values()) - rel_count
+
+    index = ModuleIndex(modules)
+    dependency_graph = DependencyGraph.from_imports(imports, index)
+    # Abstractness needs class counts, which the import scanner does not collect.
+    counts = [file_metrics.get(module) or {} for module in modules]
+    with profiling.phase("compute_metrics", modules=len(modules)):
+        metrics = compute_metrics(
+            dependency_graph,
+            class_counts=[entry.get("class_count", 0) for entry in counts],
+            abstract_counts=[entry.get("abstract_class_count", 0) for entry in counts],
+            packages=[index.package(module) for module in modules],
+        )
+
+    cycles = find_cycles(dependency_graph)
+    # Complexity comes from the syntax tree, so the import scanner has none either.
+    complexity = [entry.get("complexity") for entry in counts]
+
+    if format != "text":
+        names = dependency_graph.names
+        order = dict_order(names[:dependency_graph.module_count])
+        header = {
+            "module_count": len(modules),
+            "absolute_imports": abs_count,
+            "relative_imports": rel_count,
+        }
+        sections = {
+            "modules": (
+                (names[node], _module_record(metrics.module(node), complexity[node]))
+                for node in order
+            ),
+            "packages": (
+                (name, package.to_dict()) for name, package in metrics.packages.items()
+            ),
+            "functions": (
+                {"module": names[node], **function}
+                for node in order
+                if complexity[node]
+                for function in complexity[node]["functions"]
+            ),
+            "circular_dependencies": (cycle.to_dict() for cycle in cycles),
+            "parse_errors": (
+                {"path": str(error.path), "message": error.message} for error in errors
+            ),
+        }
+        if to_stdout:
+            target = nullcontext(sys.stdout)
+        else:
+            target = open(json_output, "w", encoding="utf-8")
+        with target as handle, profiling.phase("write_report", format=format):
+            _write_report(handle, format, header, sections)
+        if not to_stdout:
+            typer.echo(f"Wrote {json_output}")
         return
 
     typer.echo(f"Absolute imports: {abs_count}, Relative imports: {rel_count}")
     typer.echo("Module coupling:")
-    for module in modules:
+    for node in range(dependency_graph.module_count):
         typer.echo(
-            f" - {module.stem}: Ca={aff[module]} Ce={eff[module]} I={inst[module]:.2f}"
+            f" - {dependency_graph.names[node]}: Ca={metrics.afferent[node]}"
+            f" Ce={metrics.efferent[node]} I={metrics.instability[node]:.2f}"
+            f" A={metrics.abstractness[node]:.2f} D={metrics.distance[node]:.2f}"
         )
 
     if cycles:
         typer.echo("Circular dependencies detected:")
-        for a, b in cycles:
-            typer.echo(f" - {a} <-> {b}")
+        for cycle in cycles:
+            path = " -> ".join(cycle.cycle + cycle.cycle[:1])
+            typer.echo(f" - {path} ({cycle.size} module(s) involved)")
     else:
         typer.echo("No circular dependencies found.")
 
+    functions = [
+        (function["cyclomatic"], dependency_graph.names[node], function["name"])
+        for node, entry in enumerate(complexity)
+        if entry
+        for function in entry["functions"]
+    ]
+    if functions:
+        typer.echo("Most complex functions:")
+        for cyclomatic, module, name in heapq.nlargest(10, functions):
+            typer.echo(f" - {module}.{name}: CC={cyclomatic}")
+
+
+def _module_record(record: dict, complexity: dict | None) -> dict:
+    """Add the module-level complexity, without the per-function list, to ``record``."""
+    if complexity:
+        record["complexity"] = {
+            key: value for key, value in complexity.items() if key != "functions"
+        }
+    return record
+
+
+@app.command()
+def repository(
+    path: str = ".",
+    json_output: str | None = None,
+    no_cache: bool = NO_CACHE_OPTION,
+    cache_dir: str | None = CACHE_DIR_OPTION,
+    jobs: int = JOBS_OPTION,
+    executor: str | None = EXECUTOR_OPTION,
+    fast_imports: bool = FAST_IMPORTS_OPTION,
+    use_git: bool = USE_GIT_OPTION,
+    format: str | None = REPORT_FORMAT_OPTION,
+) -> None:
+    """Analyze the given repository.
+
+    Machine-readable formats go to --json-output or, when it is omitted
+    or "-", to stdout with progress messages moved to stderr.
+    """
+
+    format, to_stdout = _report_format(format, json_output)
+    modules = _discover_modules(path, use_git)
+    typer.echo(f"Discovered {len(modules)} module(s).", err=to_stdout)
+
+    errors: list[ParseError] = []
+    file_metrics: dict = {}
+    imports = _run_analysis(
+        modules,
+        _open_cache(path, no_cache, cache_dir),
+        jobs,
+        executor,
+        errors,
+        fast_imports,
+        file_metrics,
+        err=to_stdout,
+    )
+    _report_repository(modules, imports, file_metrics, errors, format, json_output, to_stdout)
+
 
 @app.command()
 def graph(
     path: str = ".",
     output: str = "dependencies.dot",
     format: str = typer.Option(
-        "dot", "--format", "-f", help="graph format: dot or mermaid"
+        "dot", "--format", "-f", help="graph format: dot, mermaid or html"
     ),
     json_input: str | None = typer.Option(
         None,
         "--json-input",
         help="Load imports mapping from JSON instead of analyzing the repository",
     ),
+    collapse_packages: bool = typer.Option(
+        False, "--collapse-packages", help="Draw one node per package instead of per module"
+    ),
+    depth: int | None = typer.Option(
+        None, "--depth", min=1, help="Summarize to packages this many name levels deep"
+    ),
+    top: int | None = typer.Option(
+        None, "--top", min=1, help="Keep only the N heaviest package edges (implies --depth 2)"
+    ),
+    focus: str | None = typer.Option(
+        None, "--focus", help="Drill down into one package (implies --depth 1)"
+    ),
+    externals: bool = typer.Option(
+        False, "--externals", help="Include external packages in a summary"
+    ),
+    layout: str = typer.Option(
+        "layered", "--layout", help="HTML layout: layered or force"
+    ),
+    physics: bool = typer.Option(
+        False, "--physics", help="Start the HTML viewer with physics enabled"
+    ),
+    no_cache: bool = NO_CACHE_OPTION,
+    cache_dir: str | None = CACHE_DIR_OPTION,
+    jobs: int = JOBS_OPTION,
+    executor: str | None = EXECUTOR_OPTION,
+    fast_imports: bool = FAST_IMPORTS_OPTION,
+    use_git: bool = USE_GIT_OPTION,
 ) -> None:
     """Generate a dependency graph."""
+    from ..analyzer.dependency_graph import DependencyGraph
+    from ..visualization.layout import LAYOUTS
+
     if json_input:
         data = json.loads(Path(json_input).read_text())
         imports = {Path(k): v for k, v in data.items()}
     else:
-        modules = discover_modules(path)
-        imports = analyze_imports(modules)
-    if format == "mermaid" or output.endswith(".mmd"):
-        data = generate_mermaid(imports)
+        modules = _discover_modules(path, use_git)
+        imports = _run_analysis(
+            modules, _open_cache(path, no_cache, cache_dir), jobs, executor, [], fast_imports
+        )
+    dependency_graph = DependencyGraph.from_imports(imports)
+    if format == "html" or output.endswith(".html"):
+        kind = "html"
+    elif format == "mermaid" or output.endswith(".mmd"):
+        kind = "mermaid"
+    else:
+        kind = "dot"
+    if layout not in LAYOUTS:
+        raise typer.BadParameter(f"expected one of {', '.join(LAYOUTS)}", param_hint="--layout")
+    if depth is None and top is None and focus is None:
+        if kind == "html" and collapse_packages:
+            raise typer.BadParameter(
+                "use --depth for HTML package views", param_hint="--collapse-packages"
+            )
+        with open(output, "w") as handle, profiling.phase("render_graph", format=kind):
+            if kind == "html":
+                from ..visualization.viewer import write_viewer
+
+                edges = write_viewer(handle, dependency_graph, layout, physics)
+            else:
+                from ..visualization.graph_generator import write_dot, write_mermaid
+
+                writer = write_mermaid if kind == "mermaid" else write_dot
+                edges = writer(handle, dependency_graph, collapse_packages)
+        typer.echo(f"Wrote {output} ({edges} edge(s))")
+        return
+
+    if collapse_packages:
+        raise typer.BadParameter(
+            "cannot be combined with --depth, --top or --focus", param_hint="--collapse-packages"
+        )
+    if depth is None:
+        depth = 1 if focus else 2
+    from ..visualization.summary import summarize, write_summary_dot, write_summary_mermaid
+
+    with profiling.phase("summarize", depth=depth):
+        summary = summarize(dependency_graph, depth, top, focus, externals)
+    with open(output, "w") as handle, profiling.phase("render_graph", format=kind):
+        if kind == "html":
+            from ..visualization.viewer import write_summary_viewer
+
+            edges = write_summary_viewer(handle, summary, layout, physics)
+        else:
+            writer = write_summary_mermaid if kind == "mermaid" else write_summary_dot
+            edges = writer(handle, summary)
+    omitted = f", {summary.omitted_edges} lighter edge(s) omitted" if summary.omitted_edges else ""
+    typer.echo(f"Wrote {output} ({len(summary.names)} node(s), {edges} edge(s){omitted})")
+
+
+@app.command()
+def impact(
+    targets: List[str] = typer.Argument(..., help="Dotted module names or file paths"),
+    path: str = ".",
+    downstream: bool = typer.Option(
+        False, "--downstream", help="List what the targets depend on instead of their dependents"
+    ),
+    tests_only: bool = typer.Option(False, "--tests-only", help="Only list affected test files"),
+    index_file: str | None = typer.Option(
+        None,
+        "--index",
+        help="Reachability index to reuse (default: <cache dir>/impact-index.json.gz)",
+    ),
+    rebuild: bool = typer.Option(
+        False, "--rebuild", help="Rebuild the index even if it is current"
+    ),
+    json_output: str | None = None,
+    no_cache: bool = NO_CACHE_OPTION,
+    cache_dir: str | None = CACHE_DIR_OPTION,
+    jobs: int = JOBS_OPTION,
+    executor: str | None = EXECUTOR_OPTION,
+    fast_imports: bool = FAST_IMPORTS_OPTION,
+    use_git: bool = USE_GIT_OPTION,
+) -> None:
+    """Show which modules and tests are affected by changing the given modules."""
+    from ..analyzer.dependency_graph import DependencyGraph
+    from ..analyzer.impact import ImpactIndex
+
+    modules = _discover_modules(path, use_git)
+    if index_file is None and not no_cache:
+        cache_root = Path(cache_dir) if cache_dir else Path(path) / DEFAULT_CACHE_DIR
+        index_file = str(cache_root / "impact-index.json.gz")
+
+    index = None
+    if index_file and not rebuild:
+        index = ImpactIndex.load(Path(index_file))
+        if index is not None and index.is_stale(modules):
+            index = None
+    if index is None:
+        # With --tests-only, stdout carries nothing but the test paths.
+        errors: list[ParseError] = []
+        imports = _run_analysis(
+            modules,
+            _open_cache(path, no_cache, cache_dir),
+            jobs,
+            executor,
+            errors,
+            fast_imports,
+            err=tests_only,
+        )
+        index = ImpactIndex.from_graph(DependencyGraph.from_imports(imports))
+        if index_file:
+            index.record_signatures()
+            index.save(Path(index_file))
+            typer.echo(
+                f"Built impact index for {len(modules)} module(s): {index_file}", err=tests_only
+            )
+
+    nodes = []
+    for target in targets:
+        node = index.node(target)
+        if node is None:
+            # Paths may also be given relative to the analyzed repository.
+            node = index.node(str(Path(path) / target))
+        if node is None:
+            raise typer.BadParameter(f"unknown module {target!r}", param_hint="TARGETS")
+        nodes.append(node)
+
+    affected = index.downstream_of(nodes) if downstream else index.upstream_of(nodes)
+    # Tests to run are always the dependents, whichever closure is listed.
+    tests = index.affected_tests(nodes)
+    result = {
+        "targets": [index.names[node] for node in nodes],
+        "direction": "downstream" if downstream else "upstream",
+        "modules": [
+            {"name": index.names[node], "path": index.paths[node]} for node in affected
+        ],
+        "tests": [index.paths[node] for node in tests],
+    }
+
+    if json_output:
+        Path(json_output).write_text(json.dumps(result, indent=2))
+        typer.echo(f"Wrote {json_output}")
+        return
+
+    if not tests_only:
+        label = "Dependencies" if downstream else "Affected modules"
+        typer.echo(f"{label} ({len(affected)}):")
+        for node in affected:
+            typer.echo(f" - {index.names[node]}")
+        typer.echo(f"Affected tests ({len(tests)}):")
+    for node in tests:
+        typer.echo(index.paths[node] if tests_only else f" - {index.paths[node]}")
+
+
+@app.command()
+def watch(
+    path: str = ".",
+    json_output: str | None = None,
+    dot_output: str | None = typer.Option(None, "--dot-output", help="DOT graph to keep updated"),
+    mermaid_output: str | None = typer.Option(
+        None, "--mermaid-output", help="Mermaid graph to keep updated"
+    ),
+    debounce: float = typer.Option(
+        0.2, "--debounce", help="Seconds of quiet before a batch of changes is processed"
+    ),
+    poll: bool = typer.Option(False, "--poll", help="Poll file mtimes instead of using inotify"),
+    interval: float = typer.Option(1.0, "--interval", help="Polling interval in seconds"),
+    no_cache: bool = NO_CACHE_OPTION,
+    cache_dir: str | None = CACHE_DIR_OPTION,
+    jobs: int = JOBS_OPTION,
+    executor: str | None = EXECUTOR_OPTION,
+    fast_imports: bool = FAST_IMPORTS_OPTION,
+    use_git: bool = USE_GIT_OPTION,
+) -> None:
+    """Re-analyze changed files as they are saved and keep the outputs up to date."""
+    from ..utils.watcher import create_watcher
+    from .watch import run_watch
+
+    modules = _discover_modules(path, use_git)
+    typer.echo(f"Discovered {len(modules)} module(s).")
+    errors: list[ParseError] = []
+    file_metrics: dict = {}
+    imports = _run_analysis(
+        modules,
+        _open_cache(path, no_cache, cache_dir),
+        jobs,
+        executor,
+        errors,
+        fast_imports,
+        file_metrics,
+    )
+    watcher = create_watcher(
+        Path(path),
+        lambda: _discover_modules(path, use_git),
+        debounce=debounce,
+        interval=interval,
+        polling=poll,
+    )
+    typer.echo(f"Watching {path} ({watcher.backend}); press Ctrl+C to stop.")
+    try:
+        run_watch(
+            watcher,
+            lambda: _discover_modules(path, use_git),
+            modules,
+            imports,
+            file_metrics,
+            errors,
+            lambda: _open_cache(path, no_cache, cache_dir),
+            extractor="scan" if fast_imports else "ast",
+            json_output=json_output,
+            dot_output=dot_output,
+            mermaid_output=mermaid_output,
+        )
+    except KeyboardInterrupt:
+        typer.echo("Stopped watching.")
+
+
+@app.command()
+def diff(
+    base: str = typer.Option(..., "--base", help="Revision to compare from"),
+    head: str | None = typer.Option(
+        None, "--head", help="Revision to compare to (default: the work tree)"
+    ),
+    path: str = ".",
+    json_output: str | None = None,
+    min_change: float = typer.Option(
+        0.0, "--min-change", help="Hide instability changes smaller than this"
+    ),
+    no_cache: bool = NO_CACHE_OPTION,
+    cache_dir: str | None = CACHE_DIR_OPTION,
+    jobs: int = JOBS_OPTION,
+    executor: str | None = EXECUTOR_OPTION,
+    fast_imports: bool = FAST_IMPORTS_OPTION,
+    use_git: bool = USE_GIT_OPTION,
+) -> None:
+    """Show the edges, cycles and instability that changed between two git revisions."""
+    from ..analyzer.revision_diff import diff_revisions
+
+    modules = _discover_modules(path, use_git)
+    errors: list[ParseError] = []
+    imports = _run_analysis(
+        modules, _open_cache(path, no_cache, cache_dir), jobs, executor, errors, fast_imports
+    )
+    try:
+        result = diff_revisions(
+            path,
+            modules,
+            imports,
+            base,
+            head,
+            extractor="scan" if fast_imports else "ast",
+            min_change=min_change,
+        )
+    except RuntimeError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--base/--head") from exc
+
+    if json_output:
+        Path(json_output).write_text(json.dumps(result.to_dict(), indent=2))
+        typer.echo(f"Wrote {json_output}")
+        return
+
+    typer.echo(
+        f"{result.base} -> {result.head}: {len(result.changed_files)} changed file(s),"
+        f" {result.parsed_files} parsed."
+    )
+    for error in result.errors:
+        typer.echo(f" ! {error.path}: {error.message}")
+
+    def cycle_path(cycle) -> str:
+        return " -> ".join(cycle.cycle + cycle.cycle[:1])
+
+    sections = [
+        ("Added modules", [f" + {name}" for name in result.added_modules]),
+        ("Removed modules", [f" - {name}" for name in result.removed_modules]),
+        (
+            "Edges",
+            [f" + {source} -> {target}" for source, target in result.added_edges]
+            + [f" - {source} -> {target}" for source, target in result.removed_edges],
+        ),
+        ("New cycles", [f" + {cycle_path(cycle)}" for cycle in result.new_cycles]),
+        ("Resolved cycles", [f" - {cycle_path(cycle)}" for cycle in result.resolved_cycles]),
+        (
+            "Instability changes",
+            [
+                f" {change.module}: {change.before:.2f} -> {change.after:.2f}"
+                f" (Ca {change.afferent[0]} -> {change.afferent[1]},"
+                f" Ce {change.efferent[0]} -> {change.efferent[1]})"
+                for change in result.instability
+            ],
+        ),
+    ]
+    for title, lines in sections:
+        if lines:
+            typer.echo(f"{title} ({len(lines)}):")
+            for line in lines:
+                typer.echo(line)
+
+
+HISTORY_FORMATS = ("csv", "ndjson")
+
+
+@app.command()
+def history(
+    rev_range: str = typer.Option(
+        "HEAD", "--range", help="Commits to analyze, e.g. main~500..main (first parents only)"
+    ),
+    step: int = typer.Option(
+        1, "--step", help="Analyze every Nth commit, counting back from the newest"
+    ),
+    path: str = ".",
+    output: str = typer.Option("-", "--output", "-o", help="File to write, or - for stdout"),
+    format: str | None = typer.Option(
+        None,
+        "--format",
+        "-f",
+        help="csv or ndjson; default from the --output extension, else csv",
+    ),
+    no_cache: bool = NO_CACHE_OPTION,
+    cache_dir: str | None = CACHE_DIR_OPTION,
+    jobs: int = JOBS_OPTION,
+    executor: str | None = EXECUTOR_OPTION,
+    fast_imports: bool = FAST_IMPORTS_OPTION,
+) -> None:
+    """Write module count, coupling and cycle metrics for a range of commits."""
+    import csv
+
+    from ..analyzer.history import HistoryPoint, iter_history
+
+    if format is None:
+        format = "ndjson" if output.endswith((".ndjson", ".jsonl")) else "csv"
+    if format not in HISTORY_FORMATS:
+        raise typer.BadParameter(
+            f"expected one of {', '.join(HISTORY_FORMATS)}", param_hint="--format"
+        )
+    if step < 1:
+        raise typer.BadParameter("must be at least 1", param_hint="--step")
+    _check_executor(executor)
+    to_stdout = output == "-"
+    cache = None
+    if not no_cache:
+        cache = BlobCache(Path(cache_dir) if cache_dir else Path(path) / DEFAULT_CACHE_DIR)
+
+    if to_stdout:
+        target = nullcontext(sys.stdout)
     else:
-        data = generate_dot(imports)
-    Path(output).write_text(data)
-    typer.echo(f"Wrote {output}")
+        target = open(output, "w", encoding="utf-8", newline="")
+    count = 0
+    with target as handle, cache or nullcontext():
+        points = iter_history(
+            path,
+            rev_range,
+            step,
+            extractor="scan" if fast_imports else "ast",
+            jobs=jobs,
+            executor=executor,
+            cache=cache,
+        )
+        if format == "csv":
+            writer = csv.DictWriter(handle, HistoryPoint.columns(), lineterminator="\n")
+            writer.writeheader()
+            write = writer.writerow
+        else:
+            write = NdjsonWriter(handle).write
+        try:
+            for point in points:
+                write(point.to_dict())
+                count += 1
+            handle.flush()
+        except RuntimeError as exc:
+            raise typer.BadParameter(str(exc), param_hint="--range") from exc
+    if cache is not None:
+        typer.echo(f"Cache: {cache.hits} hit(s), {cache.misses} miss(es).", err=to_stdout)
+    typer.echo(f"Analyzed {count} commit(s).", err=to_stdout)
+    if not to_stdout:
+        typer.echo(f"Wrote {output}")
+
+
+@app.command()
+def shard(
+    path: str = ".",
+    output_dir: str = typer.Option("shards", "--output-dir", help="Directory for shard files"),
+    globs: List[str] = typer.Option(
+        None, "--glob", help="Shard by path glob (repeatable) instead of top-level directory"
+    ),
+    only: List[str] = typer.Option(
+        None, "--only", help="Analyze only these shards (repeatable), e.g. one per CI job"
+    ),
+    list_shards: bool = typer.Option(
+        False, "--list", help="Print the shard names and module counts, then exit"
+    ),
+    jobs: int = JOBS_OPTION,
+    executor: str | None = EXECUTOR_OPTION,
+    fast_imports: bool = FAST_IMPORTS_OPTION,
+    use_git: bool = USE_GIT_OPTION,
+) -> None:
+    """Analyze the repository in shards, writing one mergeable result file per shard."""
+    from ..analyzer.shards import module_listing, plan_shards, run_shards, shard_file
+
+    modules = _discover_modules(path, use_git)
+    rel_paths = [module.relative_to(path).as_posix() for module in modules]
+    plan = plan_shards(rel_paths, globs or ())
+    if list_shards:
+        for name, files in plan.items():
+            typer.echo(f"{name}\t{len(files)}")
+        return
+    if only:
+        unknown = sorted(set(only) - set(plan))
+        if unknown:
+            raise typer.BadParameter(
+                f"unknown shard(s): {', '.join(unknown)}", param_hint="--only"
+            )
+    _check_executor(executor)
+    typer.echo(f"Analyzing {len(only or plan)} of {len(plan)} shard(s).")
+    if only:
+        plan = {name: files for name, files in plan.items() if name in only}
+    try:
+        results = run_shards(
+            path,
+            plan,
+            module_listing(rel_paths),
+            Path(output_dir),
+            extractor="scan" if fast_imports else "ast",
+            jobs=jobs,
+            executor=executor or default_executor(jobs),
+        )
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--glob") from exc
+    for name, (count, failed) in results.items():
+        typer.echo(
+            f" - {name}: {count} module(s), {failed} parse error(s)"
+            f" -> {shard_file(Path(output_dir), name)}"
+        )
+
+
+@app.command()
+def merge(
+    shard_files: List[str] = typer.Argument(..., help="Shard files written by analyze shard"),
+    path: str = ".",
+    json_output: str | None = None,
+    format: str | None = REPORT_FORMAT_OPTION,
+) -> None:
+    """Merge shard files and report on them exactly as analyze repository would.
+
+    --path must name the repository the same way it was given to
+    analyze shard so module paths match.
+    """
+    from ..analyzer.shards import merge_shards
 
+    format, to_stdout = _report_format(format, json_output)
+    try:
+        merged = merge_shards(path, [Path(name) for name in shard_files])
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc), param_hint="SHARD_FILES") from exc
+    typer.echo(
+        f"Merged {len(merged.modules)} module(s) from {len(shard_files)} shard(s).",
+        err=to_stdout,
+    )
+    _echo_errors(merged.errors, to_stdout)
+    _report_repository(
+        merged.modules,
+        merged.imports,
+        merged.file_metrics,
+        merged.errors,
+        format,
+        json_output,
+        to_stdout,
+    )
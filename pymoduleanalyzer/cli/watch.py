@@ -0,0 +1,252 @@
+"""Live outputs and the event loop behind ``analyze watch``."""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List
+
+import typer
+
+from ..analyzer.import_analyzer import ParseError, analyze_imports
+from ..analyzer.import_records import ImportTable, relative_count
+from ..analyzer.incremental import IncrementalGraph
+from ..analyzer.module_index import ModuleIndex
+from ..utils.cache import AnalysisCache
+from ..utils.json_stream import dict_order
+from ..utils.watcher import Watcher
+from ..visualization.graph_generator import (
+    dot_edge,
+    dot_node,
+    mermaid_edge,
+    mermaid_node,
+    node_ids,
+    write_dot,
+    write_mermaid,
+)
+
+
+def _indent(text: str, prefix: str) -> str:
+    """Indent every line but the first, matching nested ``json.dumps(indent=2)`` output."""
+    return text.replace("\n", "\n" + prefix)
+
+
+class LiveOutputs:
+    """JSON, DOT and Mermaid outputs that are re-rendered per module.
+
+    Each node keeps its rendered JSON entry and its DOT/Mermaid declaration
+    and edge lines; :meth:`refresh` re-renders only the nodes an update
+    touched and then joins the cached pieces. Diagrams are identical to
+    :func:`write_dot` and :func:`write_mermaid`; when two modules share a
+    dotted name the diagrams are written by those functions instead. The JSON text is identical to
+    ``json.dumps(report, indent=2)`` of the ``analyze repository`` layout,
+    minus the package and transitive metrics, which need the whole graph,
+    and the per-function complexity list.
+    """
+
+    def __init__(
+        self,
+        graph: IncrementalGraph,
+        file_metrics: Dict[Path, dict],
+        errors: List[ParseError],
+        json_output: str | None = None,
+        dot_output: str | None = None,
+        mermaid_output: str | None = None,
+    ) -> None:
+        self.graph = graph
+        self.file_metrics = file_metrics
+        self.errors = errors
+        self.json_output = json_output
+        self.dot_output = dot_output
+        self.mermaid_output = mermaid_output
+        self._modules: List[str] = []
+        self._order = dict_order(graph.names[:graph.module_count])
+        self._ids: List[str] = []
+        self._dot: List[str] = []
+        self._mermaid: List[str] = []
+        self._dot_nodes: List[str] = []
+        self._mermaid_nodes: List[str] = []
+        self._cycles: list = []
+        self._cycles_text = "[]"
+        self._relative = 0
+        self._total = 0
+        for deps in graph.imports.values():
+            self.count_imports(deps, 1)
+        self.refresh(range(graph.module_count), edges_changed=True)
+
+    def count_imports(self, deps: ImportTable, sign: int) -> None:
+        """Add (``sign=1``) or remove (``sign=-1``) a module's imports from the totals."""
+        self._total += sign * len(deps)
+        self._relative += sign * relative_count(deps)
+
+    def _module_entry(self, node: int) -> str:
+        graph = self.graph
+        ca, ce = graph.afferent(node), graph.efferent(node)
+        metrics = self.file_metrics.get(graph.paths[node]) or {}
+        classes = metrics.get("class_count", 0)
+        inst = ce / (ca + ce) if ca + ce else 0.0
+        abstractness = metrics.get("abstract_class_count", 0) / classes if classes else 0.0
+        entry = {
+            "afferent": ca,
+            "efferent": ce,
+            "instability": round(inst, 2),
+            "abstractness": round(abstractness, 2),
+            "distance": round(abs(abstractness + inst - 1.0), 2),
+        }
+        complexity = metrics.get("complexity")
+        if complexity:
+            entry["complexity"] = {
+                key: value for key, value in complexity.items() if key != "functions"
+            }
+        name = json.dumps(graph.names[node])
+        return f"    {name}: " + _indent(json.dumps(entry, indent=2), "    ")
+
+    def refresh(self, touched: Iterable[int], edges_changed: bool) -> None:
+        """Re-render ``touched`` nodes and rewrite the configured outputs."""
+        graph = self.graph
+        names = graph.names
+        size = len(names)
+        diagrams = edges_changed and bool(self.dot_output or self.mermaid_output)
+        self._modules.extend([""] * (graph.module_count - len(self._modules)))
+        if diagrams and len(self._ids) != size:
+            # New external nodes appeared; IDs only depend on names, but the
+            # collision order may, so recompute them all.
+            self._ids = node_ids(names)
+            touched = range(size)
+        for pieces in (self._dot, self._mermaid, self._dot_nodes, self._mermaid_nodes):
+            pieces.extend([""] * (size - len(pieces)))
+        ids = self._ids
+        for node in touched:
+            if self.json_output and not graph.is_external(node):
+                self._modules[node] = self._module_entry(node)
+            if not diagrams:
+                continue
+            targets = graph.successors[node]
+            used = bool(targets or graph.predecessors[node])
+            if self.dot_output:
+                self._dot_nodes[node] = dot_node(ids[node], names[node]) + "\n" if used else ""
+                self._dot[node] = "".join(dot_edge(ids[node], ids[t]) + "\n" for t in targets)
+            if self.mermaid_output:
+                self._mermaid_nodes[node] = (
+                    mermaid_node(ids[node], names[node]) + "\n" if used else ""
+                )
+                self._mermaid[node] = "".join(
+                    mermaid_edge(ids[node], ids[t]) + "\n" for t in targets
+                )
+        if edges_changed:
+            cycles = graph.cycles()
+            if cycles != self._cycles:
+                self._cycles = cycles
+                self._cycles_text = _indent(
+                    json.dumps([cycle.to_dict() for cycle in cycles], indent=2), "  "
+                )
+
+        if self.json_output:
+            Path(self.json_output).write_text(self.render_json())
+        if not diagrams:
+            return
+        unique = len(set(names)) == size
+        if self.dot_output:
+            with open(self.dot_output, "w") as handle:
+                if unique:
+                    handle.write("digraph dependencies {\n")
+                    handle.writelines(self._dot_nodes)
+                    handle.writelines(self._dot)
+                    handle.write("}\n")
+                else:
+                    write_dot(handle, graph)
+        if self.mermaid_output:
+            with open(self.mermaid_output, "w") as handle:
+                if unique:
+                    handle.write("flowchart TD\n")
+                    handle.writelines(self._mermaid_nodes)
+                    handle.writelines(self._mermaid)
+                else:
+                    write_mermaid(handle, graph)
+
+    def render_json(self) -> str:
+        """Return the JSON report text."""
+        errors = [{"path": str(error.path), "message": error.message} for error in self.errors]
+        modules = ",\n".join(self._modules[node] for node in self._order)
+        parts = [
+            f'  "module_count": {self.graph.module_count}',
+            f'  "absolute_imports": {self._total - self._relative}',
+            f'  "relative_imports": {self._relative}',
+            '  "modules": ' + ("{\n" + modules + "\n  }" if modules else "{}"),
+            '  "circular_dependencies": ' + self._cycles_text,
+            '  "parse_errors": ' + _indent(json.dumps(errors, indent=2), "  "),
+        ]
+        return "{\n" + ",\n".join(parts) + "\n}"
+
+
+def run_watch(
+    watcher: Watcher,
+    discover: Callable[[], List[Path]],
+    modules: List[Path],
+    imports: Dict[Path, ImportTable],
+    file_metrics: Dict[Path, dict],
+    errors: List[ParseError],
+    open_cache: Callable[[], AnalysisCache | None],
+    extractor: str = "ast",
+    json_output: str | None = None,
+    dot_output: str | None = None,
+    mermaid_output: str | None = None,
+) -> None:
+    """Apply each debounced batch of changes to the graph and outputs until interrupted."""
+    graph = IncrementalGraph(imports, ModuleIndex(modules))
+    outputs = LiveOutputs(graph, file_metrics, errors, json_output, dot_output, mermaid_output)
+
+    def analyze(paths: List[Path], found: List[ParseError]) -> Dict[Path, ImportTable]:
+        cache = open_cache()
+        try:
+            return analyze_imports(
+                paths, cache=cache, errors=found, extractor=extractor, file_metrics=file_metrics
+            )
+        finally:
+            if cache is not None:
+                cache.close()
+
+    with watcher:
+        while True:
+            changed = watcher.changes()
+            start = time.perf_counter()
+            known = changed is not None and all(
+                graph.node_id(module) is not None and module.is_file() for module in changed
+            )
+            if not known:
+                # Files were added or removed: module names and import
+                # resolution may shift, so rebuild from (cached) results.
+                found = discover()
+                if changed is None or set(found) != set(modules):
+                    modules = found
+                    errors.clear()
+                    graph = IncrementalGraph(analyze(modules, errors), ModuleIndex(modules))
+                    outputs = LiveOutputs(
+                        graph, file_metrics, errors, json_output, dot_output, mermaid_output
+                    )
+                    elapsed = (time.perf_counter() - start) * 1000
+                    typer.echo(f"Rebuilt {len(modules)} module(s) in {elapsed:.0f} ms")
+                    continue
+                changed = {module for module in changed if graph.node_id(module) is not None}
+
+            updated = sorted(changed)
+            batch_errors: List[ParseError] = []
+            new_imports = analyze(updated, batch_errors)
+            errors[:] = [error for error in errors if error.path not in changed]
+            errors.extend(batch_errors)
+            touched = {graph.node_id(module) for module in updated}
+            edges_changed = False
+            for module in updated:
+                outputs.count_imports(graph.imports[module], -1)
+                outputs.count_imports(new_imports[module], 1)
+                moved = graph.update(module, new_imports[module])
+                edges_changed = edges_changed or bool(moved)
+                touched |= moved
+            outputs.refresh(touched, edges_changed)
+            elapsed = (time.perf_counter() - start) * 1000
+            typer.echo(
+                f"Updated {len(updated)} file(s) in {elapsed:.0f} ms"
+                f" ({'imports changed' if edges_changed else 'same imports'},"
+                f" {len(errors)} parse error(s))"
+            )
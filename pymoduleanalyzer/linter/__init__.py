@@ -1,3 +1,3 @@
 """Linting utilities."""
 
-__all__ = ["rules", "suggestions", "precommit"]
+__all__ = ["rules", "suggestions", "engine", "precommit"]
@@ -0,0 +1,188 @@
+"""Single-pass lint engine: every enabled rule shares one walk of each file."""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import sys
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Sequence, Tuple
+
+from ..analyzer.parallel import default_executor, map_chunks
+from ..utils.cache import DEFAULT_CACHE_DIR, LintCache
+from .rules import RULES, Finding, Rule
+
+# Bump whenever a rule's findings change for the same source and options.
+LINT_VERSION = 1
+
+# Below this many files to lint, starting worker processes costs more than it saves.
+PARALLEL_MIN_FILES = 16
+
+RuleSpec = Tuple[str, Dict[str, object]]
+
+
+@dataclass
+class LintSettings:
+    """The ``linting:`` section of ``.pymoduleanalyzer.yml``."""
+
+    rules: List[RuleSpec] = field(default_factory=list)
+    jobs: int = 0
+    cache: bool = True
+    cache_dir: str | None = None
+
+
+def lint_settings(config: Mapping) -> LintSettings:
+    """Return the lint settings from a project configuration.
+
+    ``rules`` maps rule names to ``true``/``false`` or to an options mapping,
+    which enables the rule unless it sets ``enabled: false``. Rules that are
+    not mentioned keep their default state. Raises ValueError for unknown
+    rules or options and for values of the wrong type.
+    """
+    section = config.get("linting") or {}
+    if not isinstance(section, Mapping):
+        raise ValueError("linting must be a mapping")
+    configured = section.get("rules") or {}
+    if not isinstance(configured, Mapping):
+        raise ValueError("linting.rules must map rule names to settings")
+    unknown = set(configured) - set(RULES)
+    if unknown:
+        raise ValueError(f"unknown lint rule(s): {', '.join(sorted(unknown))}")
+    specs: List[RuleSpec] = []
+    for name, rule in RULES.items():
+        options = configured.get(name)
+        if options is None:
+            options = {"enabled": rule.enabled_by_default}
+        elif isinstance(options, bool):
+            options = {"enabled": options}
+        elif not isinstance(options, Mapping):
+            raise ValueError(
+                f"rule {name} must be true, false or a mapping of options, not {options!r}"
+            )
+        options = dict(options)
+        enabled = options.pop("enabled", True)
+        if not isinstance(enabled, bool):
+            raise ValueError(f"enabled of rule {name} must be true or false, not {enabled!r}")
+        if enabled:
+            rule(**options)  # Validate the options before any file is read.
+            specs.append((name, options))
+    jobs = section.get("jobs", 0)
+    if isinstance(jobs, bool) or not isinstance(jobs, int):
+        raise ValueError(f"linting.jobs must be an integer, not {jobs!r}")
+    cache_dir = section.get("cache_dir")
+    if cache_dir is not None and not isinstance(cache_dir, str):
+        raise ValueError(f"linting.cache_dir must be a path, not {cache_dir!r}")
+    cache = section.get("cache", True)
+    if not isinstance(cache, bool):
+        raise ValueError(f"linting.cache must be true or false, not {cache!r}")
+    return LintSettings(
+        rules=specs,
+        jobs=jobs,
+        cache=cache,
+        cache_dir=cache_dir,
+    )
+
+
+class _Dispatcher(ast.NodeVisitor):
+    """Walk a tree once, handing each node to the rules registered for its type."""
+
+    def __init__(self, rules: Sequence[Rule]) -> None:
+        self._interest = [
+            (node_type, rule.visit) for rule in rules for node_type in rule.node_types
+        ]
+        self._handlers: Dict[type, Tuple[Callable[[ast.AST], None], ...]] = {}
+
+    def visit(self, node: ast.AST) -> None:
+        node_type = type(node)
+        handlers = self._handlers.get(node_type)
+        if handlers is None:
+            handlers = self._handlers[node_type] = tuple(
+                handler for wanted, handler in self._interest if issubclass(node_type, wanted)
+            )
+        for handler in handlers:
+            handler(node)
+        self.generic_visit(node)
+
+
+def lint_source(source: bytes | str, specs: Sequence[RuleSpec]) -> List[Finding]:
+    """Run the rules in ``specs`` over one file's source in a single tree walk."""
+    try:
+        tree = ast.parse(source)
+    except SyntaxError as exc:
+        return [Finding("syntax-error", exc.msg, exc.lineno)]
+    except ValueError as exc:  # null bytes
+        return [Finding("syntax-error", str(exc))]
+    rules = [RULES[name](**options) for name, options in specs]
+    _Dispatcher(rules).visit(tree)
+    findings: List[Finding] = []
+    for rule in rules:
+        rule.finish()
+        findings.extend(rule.findings)
+    return findings
+
+
+def _lint_chunk(specs: Sequence[RuleSpec], sources: List[bytes]) -> List[List[Finding]]:
+    """Lint a chunk of sources; module-level so process pools can pickle it."""
+    return [lint_source(source, specs) for source in sources]
+
+
+def config_key(specs: Sequence[RuleSpec]) -> str:
+    """Return the cache key for a rule configuration."""
+    version = f"{LINT_VERSION}-py{sys.version_info[0]}.{sys.version_info[1]}"
+    return json.dumps([version, specs], sort_keys=True, default=str)
+
+
+def lint_paths(
+    paths: Sequence[str],
+    specs: Sequence[RuleSpec],
+    jobs: int = 0,
+    executor: str | None = None,
+    cache: LintCache | None = None,
+) -> Dict[str, List[Finding]]:
+    """Lint ``paths`` and return their findings in input order.
+
+    Files whose content hash is in ``cache`` are not parsed. The rest are
+    linted with ``executor`` (by default in worker processes when ``jobs``
+    allows more than one and at least :data:`PARALLEL_MIN_FILES` files need
+    linting). Unreadable files are reported as findings.
+    """
+    results: Dict[str, List[Finding]] = {}
+    pending: List[Tuple[str, bytes, str]] = []
+    key = config_key(specs)
+    for path in paths:
+        try:
+            source = Path(path).read_bytes()
+        except OSError as exc:
+            results[path] = [Finding("read-error", exc.strerror or str(exc))]
+            continue
+        digest = hashlib.sha256(source).hexdigest()
+        cached = cache.lookup(digest, key) if cache is not None else None
+        if cached is not None:
+            results[path] = [Finding(**finding) for finding in cached]
+        else:
+            pending.append((path, source, digest))
+
+    if pending:
+        if executor is None:
+            executor = default_executor(jobs) if len(pending) >= PARALLEL_MIN_FILES else "serial"
+        found = map_chunks(
+            partial(_lint_chunk, list(specs)),
+            [source for _, source, _ in pending],
+            jobs=jobs,
+            executor=executor,
+        )
+        for (path, _, digest), findings in zip(pending, found):
+            results[path] = findings
+            if cache is not None:
+                cache.store(digest, key, [asdict(finding) for finding in findings])
+    return {path: results[path] for path in paths}
+
+
+def open_lint_cache(root: Path, settings: LintSettings) -> LintCache | None:
+    """Return the lint cache for a project unless the settings disable it."""
+    if not settings.cache:
+        return None
+    return LintCache(Path(root) / (settings.cache_dir or DEFAULT_CACHE_DIR))
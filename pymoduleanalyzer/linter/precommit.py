@@ -1,19 +1,33 @@
 """Pre-commit hook integration."""
 
 import sys
+from contextlib import nullcontext
 from pathlib import Path
 
-from .suggestions import suggest_private
+from ..utils.config import load_project_config
+from .engine import lint_paths, lint_settings, open_lint_cache
 
 
-def run(paths: list[str]) -> int:
-    """Run linter on the provided file paths."""
+def run(paths: list[str], root: Path | str = ".") -> int:
+    """Lint the provided file paths with the rules configured for ``root``.
+
+    Prints one line per finding and returns 1 if there were any, or 2 if
+    the configuration is invalid.
+    """
+    if not paths:
+        return 0
+    try:
+        settings = lint_settings(load_project_config(Path(root)))
+    except ValueError as exc:
+        print(f"Invalid lint configuration: {exc}", file=sys.stderr)
+        return 2
+    cache = open_lint_cache(Path(root), settings)
+    with cache if cache is not None else nullcontext():
+        results = lint_paths(paths, settings.rules, settings.jobs, cache=cache)
     failed = False
-    for path_str in paths:
-        path = Path(path_str)
-        suggestion = suggest_private(path)
-        if suggestion:
-            print(suggestion)
+    for path, findings in results.items():
+        for finding in findings:
+            print(finding.format(path))
             failed = True
     return 1 if failed else 0
 
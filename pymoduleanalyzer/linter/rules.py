@@ -1,10 +1,159 @@
 """Basic linting rules."""
 
+from __future__ import annotations
+
+import ast
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Tuple, Type
 
-from ..metrics.encapsulation import private_method_ratio
+if TYPE_CHECKING:
+    from ..analyzer.parsed_module import ModuleStore
 
 
-def check_private_methods(path: Path, threshold: float = 0.5) -> bool:
+def check_private_methods(
+    path: Path, threshold: float = 0.5, store: ModuleStore | None = None
+) -> bool:
     """Return True if private method ratio meets threshold."""
-    return private_method_ratio(path) >= threshold
+    # Deferred: the pre-commit hook imports the rules before any file is parsed.
+    from ..metrics.encapsulation import private_method_ratio
+
+    return private_method_ratio(path, store) >= threshold
+
+
+@dataclass
+class Finding:
+    """One problem reported by a rule; ``line`` is None for file-level findings."""
+
+    rule: str
+    message: str
+    line: int | None = None
+
+    def format(self, path: object) -> str:
+        """Return the finding as ``path[:line]: message [rule]``."""
+        location = f"{path}:{self.line}" if self.line else str(path)
+        return f"{location}: {self.message} [{self.rule}]"
+
+
+def _same_type(value: object, default: object) -> bool:
+    """Return True if ``value`` can replace the option default ``default``."""
+    if isinstance(value, bool) or isinstance(default, bool):
+        return isinstance(value, bool) and isinstance(default, bool)
+    if isinstance(default, float):
+        return isinstance(value, (int, float))
+    return isinstance(value, type(default))
+
+
+class Rule:
+    """Base class for rules run by :mod:`.engine`.
+
+    ``node_types`` lists the AST node classes (base classes match their
+    subclasses) the rule wants to see. The engine creates one instance per
+    file, calls :meth:`visit` for each matching node during its single walk
+    of the tree and then :meth:`finish`. Configured options override the
+    defaults in ``options`` and become attributes; they must have the type of
+    the default (an integer is accepted where the default is a float).
+    """
+
+    name = ""
+    node_types: Tuple[Type[ast.AST], ...] = ()
+    options: Dict[str, object] = {}
+    enabled_by_default = True
+
+    def __init__(self, **options: object) -> None:
+        unknown = set(options) - set(self.options)
+        if unknown:
+            names = ", ".join(sorted(unknown))
+            raise ValueError(f"unknown option(s) for rule {self.name}: {names}")
+        for key, default in self.options.items():
+            value = options.get(key, default)
+            if not _same_type(value, default):
+                raise ValueError(
+                    f"option {key} of rule {self.name} must be"
+                    f" {type(default).__name__}, not {value!r}"
+                )
+            setattr(self, key, value)
+        self.findings: List[Finding] = []
+
+    def report(self, message: str, node: ast.AST | None = None) -> None:
+        """Record a finding, at the line of ``node`` if given."""
+        self.findings.append(Finding(self.name, message, getattr(node, "lineno", None)))
+
+    def visit(self, node: ast.AST) -> None:
+        """Inspect one node of a type listed in ``node_types``."""
+
+    def finish(self) -> None:
+        """Report file-level findings once the walk is complete."""
+
+
+RULES: Dict[str, Type[Rule]] = {}
+
+
+def register(rule: Type[Rule]) -> Type[Rule]:
+    """Class decorator adding ``rule`` to :data:`RULES` under its name."""
+    RULES[rule.name] = rule
+    return rule
+
+
+@register
+class PrivateMethodsRule(Rule):
+    """Suggest making functions private when too few of them are."""
+
+    name = "private-methods"
+    node_types = (ast.FunctionDef,)
+    options = {"threshold": 0.3, "min_functions": 1}
+
+    def __init__(self, **options: object) -> None:
+        super().__init__(**options)
+        self.functions = 0
+        self.private = 0
+
+    def visit(self, node: ast.AST) -> None:
+        self.functions += 1
+        self.private += node.name.startswith("_")
+
+    def finish(self) -> None:
+        if self.functions < self.min_functions:
+            return
+        if self.private / self.functions < self.threshold:
+            self.report(
+                f"consider making some functions private ({self.private} of"
+                f" {self.functions} are, threshold {self.threshold:.0%})"
+            )
+
+
+@register
+class WildcardImportRule(Rule):
+    """Flag ``from module import *``, which hides what a module depends on."""
+
+    name = "wildcard-import"
+    node_types = (ast.ImportFrom,)
+    enabled_by_default = False
+
+    def visit(self, node: ast.AST) -> None:
+        if any(alias.name == "*" for alias in node.names):
+            self.report(f"wildcard import from {'.' * node.level}{node.module or ''}", node)
+
+
+@register
+class TooManyImportsRule(Rule):
+    """Flag modules importing more distinct modules than ``max``."""
+
+    name = "too-many-imports"
+    node_types = (ast.Import, ast.ImportFrom)
+    options = {"max": 20}
+    enabled_by_default = False
+
+    def __init__(self, **options: object) -> None:
+        super().__init__(**options)
+        self.modules: set = set()
+
+    def visit(self, node: ast.AST) -> None:
+        if isinstance(node, ast.Import):
+            self.modules.update(alias.name for alias in node.names)
+        else:
+            self.modules.add("." * node.level + (node.module or ""))
+
+    def finish(self) -> None:
+        if len(self.modules) > self.max:
+            self.report(f"imports {len(self.modules)} modules (max {self.max})")
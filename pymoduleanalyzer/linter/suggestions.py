@@ -2,11 +2,12 @@
 
 from pathlib import Path
 
+from ..analyzer.parsed_module import ModuleStore
 from .rules import check_private_methods
 
 
-def suggest_private(path: Path) -> str | None:
+def suggest_private(path: Path, store: ModuleStore | None = None) -> str | None:
     """Suggest making functions private if ratio is below threshold."""
-    if not check_private_methods(path, threshold=0.3):
+    if not check_private_methods(path, threshold=0.3, store=store):
         return f"Consider making some functions in {path} private"
     return None
@@ -1,3 +1,3 @@
 """Metrics calculation utilities."""
 
-__all__ = ["coupling", "complexity", "encapsulation"]
+__all__ = ["coupling", "complexity", "encapsulation", "graph_metrics"]
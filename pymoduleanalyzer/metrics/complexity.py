@@ -1,8 +1,381 @@
-"""Simple code complexity metric stubs."""
+"""Cyclomatic complexity, nesting, Halstead and line metrics per function and module.
 
+Everything comes from one walk over the statements of a parsed module and
+one regular-expression token pass over its source. The walk finds function
+spans, block nesting and ``match`` cases. The token pass counts decision
+keywords, Halstead operators and operands, and blank and comment-only lines;
+the replacement fields of f-strings are tokenized like any other code.
+Each function is measured on its own lines; nested functions are reported
+separately and left out of the enclosing function's figures.
+"""
+
+from __future__ import annotations
+
+import ast
+import keyword
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import accumulate
 from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+from ..analyzer.parsed_module import ModuleStore, get_parsed_module
+
+# One token per match, most frequent kinds first. A newline token also takes
+# the blank lines and the comment-only line that follow it, so line kinds come
+# out of the same pass.
+_TOKEN_RE = re.compile(
+    r"""
+    [ \t\f\r]*+(?:\\\r?\n[ \t\f\r]*+)*+
+    (
+        [^\W\d]\w*+(?!['"])
+      | \n(?:[ \t\f\r]*+\n)*+(?:[ \t\f\r]*+\#[^\n]*+)?
+      | [(),\[\]]
+      | \d(?:[\w.]|(?<=[eE])[-+])*+
+      | (?:[rR][fF]|[fF][rR]?)(?:'''|\"\"\"|'|")
+      | [rRbBuU]{0,2}(?:
+            '''(?:\\[\s\S]|[^\\'])*+(?:'(?!'')(?:\\[\s\S]|[^\\'])*+)*'''
+          | \"\"\"(?:\\[\s\S]|[^\\"])*+(?:"(?!"")(?:\\[\s\S]|[^\\"])*+)*\"\"\"
+          | '[^'\\\n]*+(?:\\.[^'\\\n]*+)*+'
+          | "[^"\\\n]*+(?:\\.[^"\\\n]*+)*+"
+        )
+      | \#[^\n]*+
+      | \*\*=?|//=?|>>=?|<<=?|->|\.\.\.|[-+*/%@&|^=<>!:]=|[^\s\w]
+    )
+    """,
+    re.VERBOSE,
+)
+# Text without a match holds no f-string and is tokenized in one ``findall``.
+# Otherwise the token above is only the opening of an f-string, whose body is
+# scanned by hand: PEP 701 lets its fields nest strings in the same quotes.
+_FSTRING_RE = re.compile(r"[fF][rR]?['\"]")
+_PREFIXES = "rRfF"
+_QUOTES = frozenset(("'", '"', "'''", '"""'))
+
+# Each occurrence opens one more independent path; ``match`` cases are
+# counted from the syntax tree, as ``case`` is also a valid name.
+_DECISIONS = ("if", "elif", "for", "while", "except", "with", "assert", "and", "or")
+_OPERATORS = frozenset(keyword.kwlist) - {"True", "False", "None"} | frozenset(
+    "+ - * / % @ & | ^ ~ < > = . , : ; ( [ { ! ** // >> << -> "
+    "+= -= *= /= %= @= &= |= ^= <= >= == != := **= //= >>= <<=".split()
+)
+# A bracket pair is one operator.
+_CLOSING = frozenset(")]}")
+
+_FUNCTIONS = (ast.FunctionDef, ast.AsyncFunctionDef)
+_NESTING = (
+    ast.If, ast.For, ast.AsyncFor, ast.While, ast.Try, ast.TryStar, ast.With, ast.AsyncWith,
+    ast.Match,
+)
+_BLOCKS = ("body", "handlers", "orelse", "finalbody", "cases")
+
+
+@dataclass
+class Halstead:
+    """Halstead counts; operators are keywords and punctuation, operands names and literals."""
+
+    distinct_operators: int = 0
+    distinct_operands: int = 0
+    operators: int = 0
+    operands: int = 0
+
+    @property
+    def volume(self) -> float:
+        """Program length times the bits needed to pick one token of the vocabulary."""
+        vocabulary = self.distinct_operators + self.distinct_operands
+        length = self.operators + self.operands
+        return length * math.log2(vocabulary) if vocabulary > 1 else 0.0
+
+    @property
+    def difficulty(self) -> float:
+        """``n1 / 2 * N2 / n2``."""
+        if not self.distinct_operands:
+            return 0.0
+        return self.distinct_operators / 2 * self.operands / self.distinct_operands
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation."""
+        return {
+            "distinct_operators": self.distinct_operators,
+            "distinct_operands": self.distinct_operands,
+            "operators": self.operators,
+            "operands": self.operands,
+            "volume": round(self.volume, 1),
+            "difficulty": round(self.difficulty, 1),
+            "effort": round(self.volume * self.difficulty, 1),
+        }
+
+
+@dataclass
+class Complexity:
+    """Metrics of one function, or of a whole module with its functions.
+
+    For a module, ``cyclomatic`` is the total over the module-level code and
+    every function, and the line counts and Halstead figures cover the file.
+    """
+
+    name: str
+    lineno: int
+    lines: int = 0
+    sloc: int = 0
+    comment_lines: int = 0
+    blank_lines: int = 0
+    cyclomatic: int = 1
+    max_nesting: int = 0
+    halstead: Halstead = field(default_factory=Halstead)
+    functions: List["Complexity"] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation (without ``functions``)."""
+        return {
+            "line": self.lineno,
+            "lines": self.lines,
+            "sloc": self.sloc,
+            "comment_lines": self.comment_lines,
+            "blank_lines": self.blank_lines,
+            "cyclomatic": self.cyclomatic,
+            "max_nesting": self.max_nesting,
+            "halstead": self.halstead.to_dict(),
+        }
+
+
+@dataclass
+class _Block:
+    """A function (or the module body) found by the statement walk."""
+
+    name: str
+    lineno: int
+    first: int
+    last: int
+    children: List[int] = field(default_factory=list)
+    max_nesting: int = 0
+    cases: int = 0
+
+
+_FUNCTION, _CLASS, _NESTED = 1, 2, 3
+_node_kinds: Dict[type, Tuple[int, Tuple[str, ...]]] = {}
+
+
+def _node_kind(node_type: type) -> Tuple[int, Tuple[str, ...]]:
+    """Return what ``node_type`` means to the walk and its statement-list fields."""
+    kind = _node_kinds.get(node_type)
+    if kind is None:
+        if issubclass(node_type, _FUNCTIONS):
+            code = _FUNCTION
+        elif issubclass(node_type, ast.ClassDef):
+            code = _CLASS
+        else:
+            code = _NESTED if issubclass(node_type, _NESTING) else 0
+        fields = () if issubclass(node_type, ast.expr) else tuple(
+            name for name in reversed(node_type._fields) if name in _BLOCKS
+        )
+        kind = _node_kinds[node_type] = (code, fields)
+    return kind
+
+
+def _walk(tree: ast.Module, line_total: int) -> List[_Block]:
+    """Return the module body and every function, in source order."""
+    blocks = [_Block("<module>", 1, 1, line_total)]
+    stack: List[Tuple[ast.AST, int, int, str]] = [(tree, 0, 0, "")]
+    while stack:
+        node, block, depth, prefix = stack.pop()
+        kind, fields = _node_kind(type(node))
+        if kind == _FUNCTION:
+            first = min([node.lineno, *(item.lineno for item in node.decorator_list)])
+            blocks[block].children.append(len(blocks))
+            block, depth = len(blocks), 0
+            blocks.append(_Block(prefix + node.name, node.lineno, first, node.end_lineno))
+            prefix = f"{prefix}{node.name}.<locals>."
+        elif kind == _CLASS:
+            prefix = f"{prefix}{node.name}."
+        elif kind == _NESTED:
+            depth += 1
+            if depth > blocks[block].max_nesting:
+                blocks[block].max_nesting = depth
+            if isinstance(node, ast.Match):
+                blocks[block].cases += len(node.cases)
+        # Fields and statements are pushed in reverse, so functions are found
+        # in source order; simple statements hold no blocks and are skipped.
+        for name in fields:
+            children = getattr(node, name)
+            # An ``elif`` is an ``If`` alone in the ``orelse`` of the ``If``
+            # before it, and sits on that ``If``'s level.
+            if (
+                name == "orelse" and len(children) == 1
+                and isinstance(node, ast.If) and isinstance(children[0], ast.If)
+            ):
+                stack.append((children[0], block, depth - 1, prefix))
+                continue
+            for child in reversed(children):
+                if _node_kind(type(child))[1]:
+                    stack.append((child, block, depth, prefix))
+    return blocks
+
+
+def _tokens(text: str) -> List[str]:
+    """Return the tokens of ``text``, with those of f-string replacement fields."""
+    if not _FSTRING_RE.search(text):
+        return _TOKEN_RE.findall(text)
+    tokens: List[str] = []
+    _scan(text, 0, tokens, False)
+    return tokens
+
+
+def _scan(text: str, pos: int, tokens: List[str], field: bool) -> int:
+    """Append the tokens of ``text`` from ``pos`` to ``tokens``; return the end position.
+
+    In a replacement ``field`` the scan stops after its closing brace; layout
+    tokens and the ``!r`` conversion are not recorded there.
+    """
+    depth, conversion = 0, False
+    while True:
+        for match in _TOKEN_RE.finditer(text, pos):
+            token = match.group(1)
+            if token.lstrip(_PREFIXES) in _QUOTES:
+                pos = _fstring(text, match.start(1), match.end(), tokens)
+                break
+            if field:
+                if conversion or token[0] in "\n#":
+                    conversion = False
+                    continue
+                if token in "([{":
+                    depth += 1
+                elif token in ")]}":
+                    if not depth:
+                        return match.end()
+                    depth -= 1
+                elif not depth and token == ":":
+                    return _format_spec(text, match.end(), tokens)
+                elif not depth and token == "!":
+                    conversion = True
+                    continue
+            tokens.append(token)
+        else:
+            return len(text)
+
+
+def _fstring(text: str, start: int, pos: int, tokens: List[str]) -> int:
+    """Tokenize the f-string opened at ``start``, with its body at ``pos``; return its end."""
+    prefix = text[start:pos]
+    quote = prefix.lstrip(_PREFIXES)
+    raw = "r" in prefix or "R" in prefix
+    end = len(text)
+    while pos < end:
+        char = text[pos]
+        if char == "\\":
+            # A backslash never escapes a brace, but ``\N{...}`` is one escape.
+            if not raw and text.startswith("N{", pos + 1):
+                pos = text.find("}", pos) + 1 or end
+            else:
+                pos += 1 if text.startswith(("{", "}"), pos + 1) else 2
+        elif text.startswith(quote, pos):
+            pos += len(quote)
+            break
+        elif char == "{" and not text.startswith("{{", pos):
+            pos = _scan(text, pos + 1, tokens, True)
+        elif char == "\n" and len(quote) == 1:
+            break
+        else:
+            pos += 2 if text.startswith(("{{", "}}"), pos) else 1
+    # The literal itself is one operand, as for any other string.
+    tokens.append(text[start:pos])
+    return pos
+
+
+def _format_spec(text: str, pos: int, tokens: List[str]) -> int:
+    """Tokenize the fields nested in a format spec at ``pos``; return the end of its field."""
+    end = len(text)
+    while pos < end:
+        char = text[pos]
+        if char == "}":
+            return pos + 1
+        pos = _scan(text, pos + 1, tokens, True) if char == "{" else pos + 1
+    return pos
+
+
+def _measure(text: str, lines: int) -> Tuple[Complexity, Set[str], Set[str]]:
+    """Measure source ``text`` holding ``lines`` whole lines; also return the token sets."""
+    counts = Counter(_tokens("\n" + text))
+    result = Complexity("", 0, lines)
+    operators = counts.keys() & _OPERATORS
+    # Newlines (with the blank and comment-only lines they took) and comments.
+    layout = {token for token in counts if token[0] in "\n#"}
+    operands = counts.keys() - operators - layout - _CLOSING
+    for token in layout:
+        if token[0] == "\n":
+            count = counts[token]
+            result.blank_lines += (token.count("\n") - 1) * count
+            if "#" in token:
+                result.comment_lines += count
+    halstead = result.halstead
+    halstead.distinct_operators = len(operators)
+    halstead.distinct_operands = len(operands)
+    halstead.operators = sum(map(counts.__getitem__, operators))
+    halstead.operands = sum(map(counts.__getitem__, operands))
+    result.sloc = lines - result.blank_lines - result.comment_lines
+    result.cyclomatic = 1 + sum(map(counts.__getitem__, _DECISIONS))
+    return result, operators, operands
+
+
+def module_complexity(tree: ast.Module, source: str) -> Complexity:
+    """Return the metrics of a parsed module and of each of its functions."""
+    pieces = source.split("\n")
+    line_total = len(pieces) - (pieces[-1] == "")
+    # offsets[n] is where line n + 1 starts.
+    offsets = [0, *accumulate(map((1).__add__, map(len, pieces)))]
+    blocks = _walk(tree, line_total)
+
+    module = Complexity("<module>", 1)
+    operators: Set[str] = set()
+    operands: Set[str] = set()
+    for block in blocks:
+        # The block's own lines: its span minus the spans of nested functions.
+        spans, start = [], block.first
+        for child in block.children:
+            spans.append((start, blocks[child].first - 1))
+            start = blocks[child].last + 1
+        spans.append((start, block.last))
+        text = "".join(source[offsets[a - 1]:offsets[b]] for a, b in spans if a <= b)
+        own, block_operators, block_operands = _measure(
+            text, sum(b - a + 1 for a, b in spans if a <= b)
+        )
+        own.name, own.lineno = block.name, block.lineno
+        own.cyclomatic += block.cases
+        own.max_nesting = block.max_nesting
+        operators |= block_operators
+        operands |= block_operands
+        module.lines += own.lines
+        module.sloc += own.sloc
+        module.comment_lines += own.comment_lines
+        module.blank_lines += own.blank_lines
+        module.halstead.operators += own.halstead.operators
+        module.halstead.operands += own.halstead.operands
+        module.max_nesting = max(module.max_nesting, own.max_nesting)
+        if block is blocks[0]:
+            module.cyclomatic = own.cyclomatic
+        else:
+            module.cyclomatic += own.cyclomatic
+            module.functions.append(own)
+    module.halstead.distinct_operators = len(operators)
+    module.halstead.distinct_operands = len(operands)
+    return module
+
+
+def line_count(path: Path, store: ModuleStore | None = None) -> int:
+    """Return the number of lines in the file.
+
+    The count is shared with the parsed module in ``store``; files that do not
+    parse are counted from their text.
+    """
+    try:
+        return get_parsed_module(path, store).line_count
+    except (SyntaxError, ValueError):
+        return len(Path(path).read_text().splitlines())
 
 
-def line_count(path: Path) -> int:
-    """Return the number of lines in the file."""
-    return len(path.read_text().splitlines())
+def file_complexity(path: Path, store: ModuleStore | None = None) -> Complexity:
+    """Return the complexity metrics of the file at ``path``."""
+    parsed = get_parsed_module(path, store)
+    return module_complexity(parsed.tree, parsed.source)
@@ -3,23 +3,25 @@
 from pathlib import Path
 from typing import Dict, Iterable, List
 
+from ..analyzer.dependency_graph import DependencyGraph
+from ..analyzer.module_index import ModuleIndex
+
 
 def efferent_coupling(imports: Dict[Path, List[str]]) -> Dict[Path, int]:
     """Return efferent coupling (outgoing dependencies) per module."""
     return {module: len(deps) for module, deps in imports.items()}
 
 
-def afferent_coupling(imports: Dict[Path, List[str]]) -> Dict[Path, int]:
+def afferent_coupling(
+    imports: Dict[Path, List[str]],
+    index: ModuleIndex | None = None,
+    graph: DependencyGraph | None = None,
+) -> Dict[Path, int]:
     """Return afferent coupling (incoming dependencies) per module."""
-    name_map = {module.stem: module for module in imports}
-    counts: Dict[Path, int] = {module: 0 for module in imports}
-    for module, deps in imports.items():
-        for dep in deps:
-            dep_name = dep.split(".")[0]
-            target = name_map.get(dep_name)
-            if target is not None:
-                counts[target] += 1
-    return counts
+    if graph is None:
+        graph = DependencyGraph.from_imports(imports, index)
+    counts = graph.in_degrees(weighted=True)
+    return {graph.paths[node]: counts[node] for node in range(graph.module_count)}
 
 
 def instability(afferent: Dict[Path, int], efferent: Dict[Path, int]) -> Dict[Path, float]:
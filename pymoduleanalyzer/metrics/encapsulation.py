@@ -3,13 +3,12 @@
 from pathlib import Path
 from typing import List
 
-import ast
+from ..analyzer.parsed_module import ModuleStore, get_parsed_module
 
 
-def private_method_ratio(path: Path) -> float:
+def private_method_ratio(path: Path, store: ModuleStore | None = None) -> float:
     """Return ratio of private to total methods in a file."""
-    tree = ast.parse(path.read_text())
-    methods = [node.name for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
+    methods = get_parsed_module(path, store).functions
     if not methods:
         return 0.0
     private = [m for m in methods if m.startswith('_')]
@@ -0,0 +1,222 @@
+"""Whole-graph coupling, abstractness and transitive metrics in one pass."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+from ..analyzer.dependency_graph import DependencyGraph
+from ..analyzer.reachability import Condensation, transitive_counts
+from ..utils import profiling
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+@dataclass
+class PackageMetrics:
+    """Martin's package metrics for one package."""
+
+    modules: int
+    afferent: int
+    efferent: int
+    instability: float
+    abstractness: float
+    distance: float
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation."""
+        return {
+            "modules": self.modules,
+            "afferent": self.afferent,
+            "efferent": self.efferent,
+            "instability": round(self.instability, 2),
+            "abstractness": round(self.abstractness, 2),
+            "distance": round(self.distance, 2),
+        }
+
+
+@dataclass
+class GraphMetrics:
+    """Per-module metrics as lists indexed by module node ID.
+
+    ``afferent`` counts distinct analyzed modules importing a module and
+    ``efferent`` the distinct modules and external packages it imports. The
+    transitive counts only include analyzed modules.
+    """
+
+    afferent: List[int]
+    efferent: List[int]
+    instability: List[float]
+    abstractness: List[float]
+    distance: List[float]
+    transitive_fan_in: List[int] = field(default_factory=list)
+    transitive_fan_out: List[int] = field(default_factory=list)
+    packages: Dict[str, PackageMetrics] = field(default_factory=dict)
+
+    def module(self, node: int) -> dict:
+        """Return a JSON-serializable representation of one module's metrics."""
+        result = {
+            "afferent": self.afferent[node],
+            "efferent": self.efferent[node],
+            "instability": round(self.instability[node], 2),
+            "abstractness": round(self.abstractness[node], 2),
+            "distance": round(self.distance[node], 2),
+        }
+        if self.transitive_fan_in:
+            result["transitive_fan_in"] = self.transitive_fan_in[node]
+            result["transitive_fan_out"] = self.transitive_fan_out[node]
+        return result
+
+
+def module_packages(graph: DependencyGraph) -> List[str]:
+    """Return the dotted package name of every analyzed module."""
+    packages = []
+    for node in range(graph.module_count):
+        name = graph.names[node]
+        if graph.paths[node].name == "__init__.py":
+            packages.append(name)
+        else:
+            packages.append(name.rpartition(".")[0])
+    return packages
+
+
+def _ratios(numerator, denominator):
+    """Return ``numerator / denominator`` element-wise, 0.0 where the denominator is 0."""
+    if np is not None:
+        numerator = np.asarray(numerator, dtype=np.float64)
+        denominator = np.asarray(denominator, dtype=np.float64)
+        result = np.zeros_like(numerator)
+        np.divide(numerator, denominator, out=result, where=denominator > 0)
+        return result
+    return [n / d if d else 0.0 for n, d in zip(numerator, denominator)]
+
+
+def _distances(abstractness, instability):
+    """Return the distance from the main sequence, ``|A + I - 1|``."""
+    if np is not None:
+        return np.abs(abstractness + instability - 1.0)
+    return [abs(a + i - 1.0) for a, i in zip(abstractness, instability)]
+
+
+def _tolist(values) -> list:
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+def _package_counts_numpy(graph: DependencyGraph, package_ids: List[int], package_total: int):
+    """Return per-package module, afferent and efferent counts using NumPy."""
+    count = len(graph)
+    offsets = np.frombuffer(graph.offsets, dtype=np.int32)
+    targets = np.frombuffer(graph.targets, dtype=np.int32).astype(np.int64)
+    sources = np.repeat(np.arange(count, dtype=np.int64), np.diff(offsets))
+    # External nodes get a package ID of their own so they always count as outside.
+    package_of = np.concatenate((
+        np.asarray(package_ids, dtype=np.int64),
+        np.arange(package_total, package_total + count - graph.module_count, dtype=np.int64),
+    ))
+    source_packages = package_of[sources]
+    target_packages = package_of[targets]
+    crossing = source_packages != target_packages
+
+    outgoing = np.unique(source_packages[crossing] * count + targets[crossing])
+    efferent = np.bincount(outgoing // count, minlength=package_total)[:package_total]
+    internal = crossing & (targets < graph.module_count)
+    incoming = np.unique(target_packages[internal] * count + sources[internal])
+    afferent = np.bincount(incoming // count, minlength=package_total)[:package_total]
+    modules = np.bincount(package_of[:graph.module_count], minlength=package_total)
+    return modules, afferent, efferent
+
+
+def _package_counts_python(graph: DependencyGraph, package_ids: List[int], package_total: int):
+    """Return per-package module, afferent and efferent counts without NumPy."""
+    outgoing: List[set] = [set() for _ in range(package_total)]
+    incoming: List[set] = [set() for _ in range(package_total)]
+    modules = [0] * package_total
+    for node in range(graph.module_count):
+        modules[package_ids[node]] += 1
+    for source, target, _weight in graph.edges():
+        package = package_ids[source]
+        if graph.is_external(target):
+            outgoing[package].add(target)
+        elif package_ids[target] != package:
+            outgoing[package].add(target)
+            incoming[package_ids[target]].add(source)
+    return modules, [len(found) for found in incoming], [len(found) for found in outgoing]
+
+
+def compute_metrics(
+    graph: DependencyGraph,
+    class_counts: Sequence[int] | None = None,
+    abstract_counts: Sequence[int] | None = None,
+    packages: Sequence[str] | None = None,
+    transitive: bool = True,
+) -> GraphMetrics:
+    """Compute coupling, abstractness and transitive metrics for every module.
+
+    ``class_counts`` and ``abstract_counts`` are aligned with the module node
+    IDs; modules without classes have an abstractness of 0. Uses NumPy when
+    it is installed and plain Python otherwise.
+    """
+    module_count = graph.module_count
+    classes = list(class_counts) if class_counts is not None else [0] * module_count
+    abstract = list(abstract_counts) if abstract_counts is not None else [0] * module_count
+
+    if np is not None:
+        efferent = np.diff(np.frombuffer(graph.offsets, dtype=np.int32))[:module_count]
+        afferent = np.diff(np.frombuffer(graph.reverse_offsets, dtype=np.int32))[:module_count]
+        total = afferent + efferent
+    else:
+        efferent = graph.out_degrees()[:module_count]
+        afferent = graph.in_degrees()[:module_count]
+        total = [a + e for a, e in zip(afferent, efferent)]
+    instability = _ratios(efferent, total)
+    abstractness = _ratios(abstract, classes)
+    distance = _distances(abstractness, instability)
+
+    result = GraphMetrics(
+        afferent=_tolist(afferent),
+        efferent=_tolist(efferent),
+        instability=_tolist(instability),
+        abstractness=_tolist(abstractness),
+        distance=_tolist(distance),
+    )
+    if transitive:
+        with profiling.phase("transitive_metrics"):
+            condensation = Condensation(graph)
+            fan_in = transitive_counts(graph, False, condensation)
+            fan_out = transitive_counts(graph, True, condensation)
+        result.transitive_fan_in = fan_in[:module_count]
+        result.transitive_fan_out = fan_out[:module_count]
+
+    with profiling.phase("package_metrics"):
+        if packages is None:
+            packages = module_packages(graph)
+        names = sorted(set(packages))
+        lookup = {name: position for position, name in enumerate(names)}
+        package_ids = [lookup[name] for name in packages]
+        package_classes = [0] * len(names)
+        package_abstract = [0] * len(names)
+        for node, package in enumerate(package_ids):
+            package_classes[package] += classes[node]
+            package_abstract[package] += abstract[node]
+
+        counter = _package_counts_numpy if np is not None else _package_counts_python
+        modules, package_afferent, package_efferent = counter(graph, package_ids, len(names))
+        package_total = [
+            a + e for a, e in zip(_tolist(package_afferent), _tolist(package_efferent))
+        ]
+        package_instability = _tolist(_ratios(_tolist(package_efferent), package_total))
+        package_abstractness = _tolist(_ratios(package_abstract, package_classes))
+        for position, name in enumerate(names):
+            a, i = package_abstractness[position], package_instability[position]
+            result.packages[name] = PackageMetrics(
+                modules=int(modules[position]),
+                afferent=int(package_afferent[position]),
+                efferent=int(package_efferent[position]),
+                instability=i,
+                abstractness=a,
+                distance=abs(a + i - 1.0),
+            )
+    return result
@@ -1,3 +1,3 @@
 """Utility helpers."""
 
-__all__ = ["file_utils", "config"]
+__all__ = ["file_utils", "config", "cache", "watcher", "json_stream", "profiling", "git"]
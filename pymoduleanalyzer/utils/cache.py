@@ -0,0 +1,288 @@
+"""Persistent on-disk cache of per-file analysis results."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Tuple
+
+if TYPE_CHECKING:
+    from ..analyzer.import_records import ImportTable
+
+DEFAULT_CACHE_DIR = ".pymoduleanalyzer_cache"
+
+# Bump whenever the meaning of the cached columns changes.
+SCHEMA_VERSION = 6
+
+
+def _cache_version() -> str:
+    """Return the version key stored alongside cached entries."""
+    return f"{SCHEMA_VERSION}-py{sys.version_info[0]}.{sys.version_info[1]}"
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+class FileStamp(NamedTuple):
+    """Size, mtime and SHA-256 digest of the bytes an analysis was run on."""
+
+    size: int
+    mtime_ns: int
+    digest: str
+
+
+def stamp_bytes(data: bytes, stat: os.stat_result) -> FileStamp:
+    """Return the stamp of ``data``, read from a file after it was ``stat``-ed.
+
+    Taking the mtime before the read means an edit racing the read makes the
+    stamp look older than the file, so the next lookup checks the digest.
+    """
+    return FileStamp(len(data), stat.st_mtime_ns, hashlib.sha256(data).hexdigest())
+
+
+def _connect(cache_dir: Path, name: str):
+    """Create ``cache_dir`` (ignored by git) and open the database ``name`` in it."""
+    import sqlite3  # Deferred: only commands that open a cache need it.
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    ignore_file = cache_dir / ".gitignore"
+    if not ignore_file.exists():
+        ignore_file.write_text("*\n")
+    return sqlite3.connect(cache_dir / name)
+
+
+def _load_imports(text: str) -> ImportTable:
+    """Rebuild a stored import table from its JSON rows."""
+    from ..analyzer.import_records import ImportTable  # Deferred: keeps startup light.
+
+    return ImportTable.from_rows(json.loads(text))
+
+
+@dataclass
+class CacheEntry:
+    """Cached analysis results for a single file."""
+
+    imports: ImportTable
+    metrics: Dict[str, object] = field(default_factory=dict)
+
+
+class AnalysisCache:
+    """SQLite-backed cache keyed by path, size and mtime.
+
+    When size matches but mtime does not (fresh checkouts, ``touch``), the
+    content hash decides whether the entry can still be reused. Each entry
+    records the import extractor that produced it: full-parse (``ast``)
+    entries serve every run, while ``scan`` entries lack most metrics and
+    only serve ``scan`` runs.
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+        self._conn = _connect(self.cache_dir, "analysis.sqlite3")
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        conn = self._conn
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != _cache_version():
+            conn.execute("DROP TABLE IF EXISTS files")
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                (_cache_version(),),
+            )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+            "digest TEXT, extractor TEXT, imports TEXT, metrics TEXT)"
+        )
+        conn.commit()
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        return os.path.abspath(path)
+
+    def lookup(self, path: Path, extractor: str = "ast") -> CacheEntry | None:
+        """Return the cached entry for ``path`` if the file is unchanged.
+
+        Entries a ``scan`` run stored are misses for ``extractor="ast"``, and
+        so are files that can no longer be read.
+        """
+        key = self._key(path)
+        row = self._conn.execute(
+            "SELECT size, mtime_ns, digest, extractor, imports, metrics FROM files "
+            "WHERE path = ?",
+            (key,),
+        ).fetchone()
+        if row is None or row[3] not in ("ast", extractor):
+            self.misses += 1
+            return None
+
+        size, mtime_ns, digest, _, imports, metrics = row
+        try:
+            stat = os.stat(key)
+            changed = stat.st_size != size or (
+                stat.st_mtime_ns != mtime_ns and file_digest(path) != digest
+            )
+        except OSError:
+            changed = True
+        if changed:
+            self.misses += 1
+            return None
+        if stat.st_mtime_ns != mtime_ns:
+            self._conn.execute(
+                "UPDATE files SET mtime_ns = ? WHERE path = ?", (stat.st_mtime_ns, key)
+            )
+
+        self.hits += 1
+        return CacheEntry(imports=_load_imports(imports), metrics=json.loads(metrics))
+
+    def store(
+        self,
+        path: Path,
+        stamp: FileStamp,
+        imports: ImportTable,
+        metrics: Dict[str, object] | None = None,
+        extractor: str = "ast",
+    ) -> None:
+        """Record analysis results for ``path``, produced with ``extractor``.
+
+        ``stamp`` describes the bytes that were analyzed; the file is not read
+        again, as it may have changed since.
+        """
+        key = self._key(path)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files "
+            "(path, size, mtime_ns, digest, extractor, imports, metrics) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                stamp.size,
+                stamp.mtime_ns,
+                stamp.digest,
+                extractor,
+                json.dumps(imports.to_rows()),
+                json.dumps(metrics or {}),
+            ),
+        )
+
+    def close(self) -> None:
+        """Flush pending writes and close the database."""
+        self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self) -> "AnalysisCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class LintCache:
+    """SQLite cache of lint findings keyed by file content hash.
+
+    ``config`` identifies the rule set and options the findings were
+    produced with, so changing the configuration never serves stale
+    results. Entries do not depend on the path, so renamed or copied files
+    hit the cache too.
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+        self._conn = _connect(self.cache_dir, "lint.sqlite3")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS findings ("
+            "digest TEXT, config TEXT, findings TEXT, PRIMARY KEY (digest, config))"
+        )
+
+    def lookup(self, digest: str, config: str) -> List[dict] | None:
+        """Return the findings recorded for this content and configuration, if any."""
+        row = self._conn.execute(
+            "SELECT findings FROM findings WHERE digest = ? AND config = ?", (digest, config)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def store(self, digest: str, config: str, findings: List[dict]) -> None:
+        """Record the findings for this content and configuration."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO findings (digest, config, findings) VALUES (?, ?, ?)",
+            (digest, config, json.dumps(findings)),
+        )
+
+    def close(self) -> None:
+        """Flush pending writes and close the database."""
+        self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self) -> "LintCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class BlobCache:
+    """SQLite cache of import tables keyed by git blob SHA.
+
+    A blob SHA names the file content, so entries stay valid across commits,
+    branches and renames. ``config`` identifies the extractor; a failed parse
+    is stored as its error message.
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+        self._conn = _connect(self.cache_dir, "blobs.sqlite3")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blobs ("
+            "blob TEXT, config TEXT, imports TEXT, error TEXT, PRIMARY KEY (blob, config))"
+        )
+
+    @staticmethod
+    def config_key(extractor: str) -> str:
+        """Return the ``config`` value for results produced with ``extractor``."""
+        return f"{_cache_version()}-{extractor}"
+
+    def lookup(self, blob: str, config: str) -> Tuple[ImportTable, str | None] | None:
+        """Return ``(imports, error)`` recorded for this blob and configuration, if any."""
+        row = self._conn.execute(
+            "SELECT imports, error FROM blobs WHERE blob = ? AND config = ?", (blob, config)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return _load_imports(row[0]), row[1]
+
+    def store(self, blob: str, config: str, imports: ImportTable, error: str | None) -> None:
+        """Record the parse result for this blob and configuration."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO blobs (blob, config, imports, error) VALUES (?, ?, ?, ?)",
+            (blob, config, json.dumps(imports.to_rows()), error),
+        )
+
+    def close(self) -> None:
+        """Flush pending writes and close the database."""
+        self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self) -> "BlobCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
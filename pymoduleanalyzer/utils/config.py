@@ -3,11 +3,29 @@
 from dataclasses import dataclass
 from pathlib import Path
 
+CONFIG_FILE = ".pymoduleanalyzer.yml"
+
 
 def load_config(path: Path) -> dict:
-    """Load a YAML configuration file."""
-    import yaml
+    """Load a YAML configuration file.
 
+    Raises ValueError when the file is not valid YAML or does not hold a mapping.
+    """
     if not path.exists():
         return {}
-    return yaml.safe_load(path.read_text())
+    import yaml
+
+    try:
+        config = yaml.safe_load(path.read_text())
+    except yaml.YAMLError as exc:
+        raise ValueError(f"{path} is not valid YAML: {exc}") from exc
+    if config is None:
+        return {}
+    if not isinstance(config, dict):
+        raise ValueError(f"{path} must hold a mapping, not {type(config).__name__}")
+    return config
+
+
+def load_project_config(root: Path) -> dict:
+    """Load ``.pymoduleanalyzer.yml`` from the repository root, if present."""
+    return load_config(Path(root) / CONFIG_FILE)
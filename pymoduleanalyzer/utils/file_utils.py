@@ -1,8 +1,252 @@
 """File system utilities."""
 
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+import subprocess
 from pathlib import Path
+from typing import Iterable, Iterator, List
+
+# Directories that never contain project sources.
+DEFAULT_EXCLUDE_DIRS = frozenset({
+    '.venv', 'venv', 'env', '.env',  # Virtual environments
+    '__pycache__', '.git', '.pytest_cache',  # Cache directories
+    'node_modules', '.tox', 'htmlcov',  # Build/test artifacts
+    'site-packages', 'dist-packages',  # Installed packages
+    '.mypy_cache', '.coverage',  # Tool caches
+    'build', 'dist', 'egg-info',  # Build outputs
+})
+
+
+def _gitignore_regex(pattern: str) -> re.Pattern[str]:
+    """Translate a gitignore glob into a regex over a relative POSIX path."""
+    anchored = "/" in pattern.rstrip("/")
+    pattern = pattern.strip("/")
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            parts.append("/.*")
+            i += 3
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                parts.append(re.escape("["))
+                i += 1
+            else:
+                parts.append(pattern[i:end + 1].replace("[!", "[^"))
+                i = end + 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    prefix = "" if anchored else "(?:.*/)?"
+    return re.compile(prefix + "".join(parts) + r"\Z")
+
+
+class GitIgnore:
+    """Rules of the ``.gitignore`` files seen on the way down a tree."""
+
+    def __init__(self) -> None:
+        # (base directory relative to root, regex, negated, directory only)
+        self._rules: list[tuple[str, re.Pattern[str], bool, bool]] = []
+
+    def extended(self, directory: str, ignore_file: Path) -> "GitIgnore":
+        """Return a copy with the rules of ``ignore_file`` (found in ``directory``) added."""
+        child = GitIgnore()
+        child._rules = list(self._rules)
+        try:
+            lines = ignore_file.read_text().splitlines()
+        except (OSError, UnicodeDecodeError):
+            return self
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            child._rules.append((directory, _gitignore_regex(line), negated, dir_only))
+        return child
+
+    def ignored(self, rel_path: str, is_dir: bool) -> bool:
+        """Return True if ``rel_path`` (POSIX, relative to the root) is ignored."""
+        result = False
+        for base, regex, negated, dir_only in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not rel_path.startswith(base + "/"):
+                    continue
+                candidate = rel_path[len(base) + 1:]
+            else:
+                candidate = rel_path
+            if regex.match(candidate):
+                result = not negated
+        return result
+
+
+def _excluded(
+    name: str, rel_path: str, exclude_dirs: Iterable[str], patterns: List[str]
+) -> bool:
+    """Return True if a directory entry matches the exclude configuration."""
+    if name.startswith("."):
+        return True
+    if name in exclude_dirs or name.endswith(".egg-info"):
+        return True
+    return any(
+        fnmatch.fnmatchcase(name, pattern) or fnmatch.fnmatchcase(rel_path, pattern)
+        for pattern in patterns
+    )
+
+
+def _walk_tree(
+    root: Path,
+    exclude_dirs: Iterable[str],
+    exclude_patterns: Iterable[str],
+    respect_gitignore: bool,
+) -> Iterator[tuple[str, bool]]:
+    """Yield ``(relative path, is_dir)`` for every included directory and Python file."""
+    exclude_dirs = frozenset(exclude_dirs)
+    patterns = list(exclude_patterns)
+    stack: list[tuple[str, str, GitIgnore]] = [(os.fspath(root), "", GitIgnore())]
+    while stack:
+        directory, rel_dir, ignore = stack.pop()
+        if respect_gitignore:
+            ignore_file = Path(directory) / ".gitignore"
+            if ignore_file.is_file():
+                ignore = ignore.extended(rel_dir, ignore_file)
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if is_dir:
+                if _excluded(entry.name, rel_path, exclude_dirs, patterns):
+                    continue
+            elif not entry.name.endswith(".py") or not entry.is_file():
+                continue
+            elif entry.name.startswith(".") or any(
+                fnmatch.fnmatchcase(rel_path, pattern) for pattern in patterns
+            ):
+                continue
+            if respect_gitignore and ignore.ignored(rel_path, is_dir):
+                continue
+            if is_dir:
+                subdirs.append((entry.path, rel_path, ignore))
+            else:
+                yield rel_path, False
+        for _, rel_path, _ in subdirs:
+            yield rel_path, True
+        # Reverse so the stack pops subdirectories in sorted order.
+        stack.extend(reversed(subdirs))
+
+
+def walk_python_files(
+    root: Path,
+    exclude_dirs: Iterable[str] = DEFAULT_EXCLUDE_DIRS,
+    exclude_patterns: Iterable[str] = (),
+    respect_gitignore: bool = True,
+) -> Iterator[Path]:
+    """Yield Python files under ``root`` in sorted order, pruning as it descends.
+
+    Hidden entries, ``exclude_dirs`` names, ``exclude_patterns`` globs (matched
+    against the name or the root-relative path) and ``.gitignore`` rules are
+    checked before a directory is entered, so excluded trees are never walked.
+    """
+    root = Path(root)
+    for rel_path, is_dir in _walk_tree(root, exclude_dirs, exclude_patterns, respect_gitignore):
+        if not is_dir:
+            yield root / rel_path
+
+
+def walk_directories(
+    root: Path,
+    exclude_dirs: Iterable[str] = DEFAULT_EXCLUDE_DIRS,
+    exclude_patterns: Iterable[str] = (),
+    respect_gitignore: bool = True,
+) -> Iterator[Path]:
+    """Yield ``root`` and every directory :func:`walk_python_files` would descend into."""
+    root = Path(root)
+    yield root
+    for rel_path, is_dir in _walk_tree(root, exclude_dirs, exclude_patterns, respect_gitignore):
+        if is_dir:
+            yield root / rel_path
+
+
+def walk_order(rel_path: str) -> list[tuple[int, str]]:
+    """Sort key reproducing :func:`walk_python_files` order (files before subdirectories)."""
+    parts = rel_path.split("/")
+    return [(1, part) for part in parts[:-1]] + [(0, parts[-1])]
+
+
+def git_python_files(
+    root: Path,
+    exclude_dirs: Iterable[str] = DEFAULT_EXCLUDE_DIRS,
+    exclude_patterns: Iterable[str] = (),
+) -> Iterator[Path]:
+    """Yield Python files under ``root`` known to git, using one ``git ls-files`` call.
+
+    Tracked and untracked-but-not-ignored files are listed. Raises
+    ``RuntimeError`` when ``root`` is not inside a git work tree.
+    """
+    root = Path(root)
+    proc = subprocess.run(
+        ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard", "--", "*.py"],
+        cwd=root,
+        capture_output=True,
+    )
+    if proc.returncode != 0:
+        message = proc.stderr.decode(errors="replace").strip()
+        raise RuntimeError(message or "git ls-files failed")
+    exclude_dirs = frozenset(exclude_dirs)
+    patterns = list(exclude_patterns)
+    for rel_path in sorted(set(proc.stdout.decode().split("\0")) - {""}, key=walk_order):
+        # Files deleted from the work tree are still listed as tracked.
+        if not is_excluded(rel_path, exclude_dirs, patterns) and (root / rel_path).is_file():
+            yield root / rel_path
+
+
+def is_excluded(
+    rel_path: str,
+    exclude_dirs: Iterable[str] = DEFAULT_EXCLUDE_DIRS,
+    exclude_patterns: Iterable[str] = (),
+) -> bool:
+    """Return True if a walk of the tree would skip ``rel_path`` (POSIX, root-relative)."""
+    patterns = list(exclude_patterns)
+    prefix = ""
+    for part in rel_path.split("/"):
+        prefix = f"{prefix}/{part}" if prefix else part
+        if _excluded(part, prefix, exclude_dirs, patterns):
+            return True
+    return False
 
 
-def iter_python_files(root: Path):
+def iter_python_files(
+    root: Path,
+    exclude_dirs: Iterable[str] = DEFAULT_EXCLUDE_DIRS,
+    exclude_patterns: Iterable[str] = (),
+    respect_gitignore: bool = True,
+    use_git: bool = False,
+) -> Iterator[Path]:
     """Yield all Python files under the given root."""
-    yield from root.rglob("*.py")
+    if use_git:
+        yield from git_python_files(root, exclude_dirs, exclude_patterns)
+    else:
+        yield from walk_python_files(root, exclude_dirs, exclude_patterns, respect_gitignore)
@@ -0,0 +1,170 @@
+"""Thin wrappers around the git commands used to analyze other revisions."""
+
+from __future__ import annotations
+
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+# File modes of regular (non-symlink, non-submodule) files in git trees.
+REGULAR_MODES = ("100644", "100755")
+
+
+def run_git(args: List[str], cwd: Path | str, input: bytes | None = None) -> bytes:
+    """Return the output of ``git <args>`` run in ``cwd``, fed ``input`` on stdin.
+
+    Raises ``RuntimeError`` with git's message when the command fails.
+    """
+    proc = subprocess.run(["git", *args], cwd=cwd, input=input, capture_output=True)
+    if proc.returncode != 0:
+        message = proc.stderr.decode(errors="replace").strip()
+        raise RuntimeError(message or f"git {args[0]} failed")
+    return proc.stdout
+
+
+def resolve_commit(cwd: Path | str, rev: str) -> str:
+    """Return the commit SHA ``rev`` names; raises ``RuntimeError`` if there is none."""
+    try:
+        output = run_git(["rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}"], cwd)
+    except RuntimeError as exc:
+        raise RuntimeError(f"unknown revision {rev!r}") from exc
+    return output.decode().strip()
+
+
+def show_prefix(cwd: Path | str) -> str:
+    """Return the path of ``cwd`` relative to the work tree root, with a trailing slash."""
+    return run_git(["rev-parse", "--show-prefix"], cwd).decode().strip()
+
+
+def changed_files(
+    cwd: Path | str, rev: str, pathspec: str = "*.py"
+) -> Dict[str, Tuple[str, str]]:
+    """Return ``{path: (status, blob)}`` for files that differ between ``rev`` and the work tree.
+
+    Only files under ``cwd`` are listed, relative to it. Status is ``A``
+    (only in the work tree), ``D`` (only in ``rev``) or ``M`` (anything
+    else, such as type changes); ``blob`` is the file's blob SHA in
+    ``rev`` (all zeros for ``A``). Untracked files are not listed.
+    """
+    output = run_git(
+        ["diff", "--raw", "--no-abbrev", "--no-renames", "--relative", "-z", rev, "--", pathspec],
+        cwd,
+    ).decode()
+    fields = output.split("\0")
+    changes: Dict[str, Tuple[str, str]] = {}
+    for meta, path in zip(fields[::2], fields[1::2]):
+        if not path:
+            continue
+        _, _, blob, _, status = meta.split(" ")
+        changes[path] = (status if status in ("A", "D") else "M", blob)
+    return changes
+
+
+def log_commits(cwd: Path | str, rev_range: str) -> List[Tuple[str, str]]:
+    """Return ``(sha, committer date)`` for ``rev_range``'s first-parent commits, oldest first."""
+    args = ["log", "--first-parent", "--reverse", "--format=%H %cI", "--end-of-options", rev_range]
+    try:
+        output = run_git(args, cwd)
+    except RuntimeError as exc:
+        raise RuntimeError(f"invalid revision range {rev_range!r}") from exc
+    return [tuple(line.split(" ", 1)) for line in output.decode().splitlines()]
+
+
+def tree_blobs(cwd: Path | str, commit: str, suffix: str = ".py") -> Dict[str, str]:
+    """Return ``{path: blob}`` for regular ``suffix`` files under ``cwd`` at ``commit``."""
+    output = run_git(["ls-tree", "-r", "-z", commit], cwd).decode()
+    blobs: Dict[str, str] = {}
+    for entry in output.split("\0"):
+        meta, _, path = entry.partition("\t")
+        if path.endswith(suffix):
+            mode, _, blob = meta.split(" ")
+            if mode in REGULAR_MODES:
+                blobs[path] = blob
+    return blobs
+
+
+def tree_diffs(
+    cwd: Path | str, pairs: Sequence[Tuple[str, str]], pathspec: str = "*.py"
+) -> Dict[str, Dict[str, str | None]]:
+    """Return ``{new: {path: blob}}`` for ``(old, new)`` commit pairs, from one ``git diff-tree``.
+
+    ``blob`` is the file's blob SHA at ``new``, or None when it is deleted
+    there (or no longer a regular file). Paths are relative to ``cwd`` and
+    limited to it; pairs without changes are missing from the result.
+    """
+    lines = "".join(f"{new} {old}\n" for old, new in pairs).encode()
+    output = run_git(
+        [
+            "diff-tree", "--stdin", "-r", "-z", "--raw", "--no-abbrev", "--no-renames",
+            "--relative", "--", pathspec,
+        ],
+        cwd,
+        input=lines,
+    ).decode()
+    fields = iter(output.split("\0"))
+    diffs: Dict[str, Dict[str, str | None]] = {}
+    current: Dict[str, str | None] = {}
+    for field in fields:
+        if field.startswith(":"):
+            _, mode, _, blob, _ = field[1:].split(" ")
+            current[next(fields)] = blob if mode in REGULAR_MODES else None
+        elif field:
+            current = diffs.setdefault(field, {})
+    return diffs
+
+
+def untracked_files(cwd: Path | str, pathspec: str = "*.py") -> List[str]:
+    """Return untracked, not ignored files under ``cwd``, relative to it."""
+    output = run_git(["ls-files", "-z", "--others", "--exclude-standard", "--", pathspec], cwd)
+    return [path for path in output.decode().split("\0") if path]
+
+
+def cat_file(cwd: Path | str, objects: Iterable[str]) -> Iterator[Tuple[str, bytes | None]]:
+    """Yield ``(object, contents)`` for each object name, read by one ``git cat-file --batch``.
+
+    Object names are anything git can resolve, such as ``rev:path`` (path
+    relative to the work tree root) or a blob SHA. Missing objects yield
+    None. Names are written from a thread so large batches cannot deadlock
+    on a full pipe.
+    """
+    objects = list(objects)
+    proc = subprocess.Popen(
+        ["git", "cat-file", "--batch"],
+        cwd=cwd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+
+    def feed() -> None:
+        try:
+            for name in objects:
+                proc.stdin.write(name.encode() + b"\n")
+        except BrokenPipeError:
+            pass
+        finally:
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+
+    writer = threading.Thread(target=feed, daemon=True)
+    writer.start()
+    stdout = proc.stdout
+    try:
+        for name in objects:
+            header = stdout.readline()
+            if not header:
+                raise RuntimeError("git cat-file exited early")
+            fields = header.split()
+            if fields[-1] in (b"missing", b"ambiguous"):
+                yield name, None
+                continue
+            contents = stdout.read(int(fields[2]))
+            stdout.read(1)  # The newline after each object.
+            yield name, contents
+    finally:
+        stdout.close()
+        writer.join()
+        proc.wait()
@@ -0,0 +1,92 @@
+"""Incremental JSON and NDJSON writers."""
+
+from __future__ import annotations
+
+import json
+from typing import IO, Any, Dict, Iterable, List, Sequence
+
+_ENCODE = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def dict_order(keys: Sequence[str]) -> List[int]:
+    """Return the indices ``dict(zip(keys, values))`` would keep, in its order.
+
+    A dict keeps the first position of a repeated key and its last value, so
+    streamed output only matches the in-memory layout when it does the same.
+    """
+    last = {key: position for position, key in enumerate(keys)}
+    return [last[key] for key in dict.fromkeys(keys)]
+
+
+class JsonStreamWriter:
+    """Write one compact JSON document piece by piece.
+
+    Containers are opened with :meth:`begin` and closed with :meth:`end`;
+    :meth:`item` writes a complete value. Only the current nesting path is
+    kept in memory, so memory use does not grow with the document. The
+    handle is flushed every ``flush_every`` items so readers such as
+    ``jq --stream`` see output while it is being produced.
+    """
+
+    def __init__(self, handle: IO[str], flush_every: int = 1000) -> None:
+        self.handle = handle
+        self.flush_every = flush_every
+        self._stack: List[List[Any]] = []  # [closing bracket, items written]
+        self._pending = 0
+
+    def _prefix(self, key: str | None) -> str:
+        if not self._stack:
+            return ""
+        frame = self._stack[-1]
+        separator = "," if frame[1] else ""
+        frame[1] += 1
+        if frame[0] == "}":
+            if key is None:
+                raise ValueError("object members need a key")
+            return separator + _ENCODE(key) + ":"
+        return separator
+
+    def begin(self, kind: str = "{", key: str | None = None) -> None:
+        """Open an object (``"{"``) or array (``"["``)."""
+        self.handle.write(self._prefix(key) + kind)
+        self._stack.append(["}" if kind == "{" else "]", 0])
+
+    def item(self, value: Any, key: str | None = None) -> None:
+        """Write a complete value into the current container."""
+        self.handle.write(self._prefix(key) + _ENCODE(value))
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.handle.flush()
+            self._pending = 0
+
+    def items(self, pairs: Iterable[tuple[str, Any]]) -> None:
+        """Write ``(key, value)`` members into the current object."""
+        for key, value in pairs:
+            self.item(value, key)
+
+    def end(self) -> None:
+        """Close the innermost open container."""
+        self.handle.write(self._stack.pop()[0])
+        if not self._stack:
+            self.handle.flush()
+
+
+class NdjsonWriter:
+    """Write one JSON record per line, flushing every ``flush_every`` records."""
+
+    def __init__(self, handle: IO[str], flush_every: int = 1000) -> None:
+        self.handle = handle
+        self.flush_every = flush_every
+        self._pending = 0
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Write a single record."""
+        self.handle.write(_ENCODE(record) + "\n")
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.handle.flush()
+            self._pending = 0
+
+    def close(self) -> None:
+        """Flush buffered records."""
+        self.handle.flush()
@@ -0,0 +1,216 @@
+"""Phase timing, slow-file tracking and peak memory for ``--profile``/``--trace-out``.
+
+Library code wraps its phases in :func:`phase`. Until :func:`enable` installs
+a :class:`Profiler`, that returns one shared no-op context manager, so the
+hooks cost a global lookup per phase when profiling is off.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+_NULL = nullcontext()
+
+
+def max_rss() -> int | None:
+    """Return the peak resident set size of this process in bytes, if known."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Profiler:
+    """Collect nested phase timings, file counts and the slowest parsed files.
+
+    Each phase records wall and CPU time (of this process) and, when
+    ``memory`` is set, the tracemalloc peak reached while it ran. Tracing
+    allocations slows Python code down several times, so it is off by
+    default. Nested phases are kept as children of the phase that was open.
+    """
+
+    def __init__(self, memory: bool = False, slowest: int = 10) -> None:
+        self.memory = memory
+        self.slowest = slowest
+        self.events: List[Dict[str, Any]] = []
+        self._stack: List[Dict[str, Any]] = []
+        self._files: List[Tuple[float, str]] = []
+        self._origin = time.perf_counter_ns()
+        self._started_tracing = False
+
+    def start(self) -> None:
+        """Start memory tracing if requested."""
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        """Stop memory tracing started by :meth:`start`."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def phase(self, name: str, **args: Any) -> Iterator[Dict[str, Any]]:
+        """Time the enclosed block as phase ``name``; ``args`` are attached to the event."""
+        tracing = self.memory and tracemalloc.is_tracing()
+        if tracing:
+            # The peak counter is global: fold it into the parent before resetting.
+            if self._stack:
+                parent = self._stack[-1]
+                parent["peak"] = max(parent["peak"], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        event = {
+            "name": name,
+            "depth": len(self._stack),
+            "args": dict(args),
+            "peak": 0,
+            "start": time.perf_counter_ns(),
+            "cpu": time.process_time_ns(),
+        }
+        self._stack.append(event)
+        try:
+            yield event["args"]
+        finally:
+            event["wall"] = time.perf_counter_ns() - event["start"]
+            event["cpu"] = time.process_time_ns() - event["cpu"]
+            self._stack.pop()
+            if tracing:
+                event["peak"] = max(event["peak"], tracemalloc.get_traced_memory()[1])
+                if self._stack:
+                    parent = self._stack[-1]
+                    parent["peak"] = max(parent["peak"], event["peak"])
+            self.events.append(event)
+
+    def count(self, **counts: int) -> None:
+        """Add ``counts`` to the innermost open phase."""
+        if self._stack:
+            args = self._stack[-1]["args"]
+            for key, value in counts.items():
+                args[key] = args.get(key, 0) + value
+
+    def record_file(self, path: Path | str, seconds: float) -> None:
+        """Remember the parse time of one file, keeping only the slowest ones."""
+        item = (seconds, str(path))
+        if len(self._files) < self.slowest:
+            heapq.heappush(self._files, item)
+        elif self._files and item > self._files[0]:
+            heapq.heapreplace(self._files, item)
+
+    def slowest_files(self) -> List[Tuple[float, str]]:
+        """Return ``(seconds, path)`` of the slowest files, slowest first."""
+        return sorted(self._files, reverse=True)
+
+    def summary(self) -> str:
+        """Return the phase table and the slowest files as text."""
+        rows = [f"{'Phase':<36}{'Wall ms':>10}{'CPU ms':>10}{'Peak MB':>9}  Details"]
+        for event in sorted(self.events, key=lambda event: event["start"]):
+            name = "  " * event["depth"] + event["name"]
+            peak = f"{event['peak'] / 1e6:>9.1f}" if self.memory else f"{'-':>9}"
+            details = ", ".join(f"{key}={value}" for key, value in event["args"].items())
+            wall, cpu = event["wall"] / 1e6, event["cpu"] / 1e6
+            rows.append(f"{name:<36}{wall:>10.1f}{cpu:>10.1f}{peak}  {details}")
+        rss = max_rss()
+        if rss is not None:
+            rows.append(f"Process max RSS: {rss / 1e6:.1f} MB")
+        if self._files:
+            rows.append("")
+            rows.append(f"Slowest {len(self._files)} file(s) to parse:")
+            rows.extend(
+                f"{seconds * 1000:>10.1f} ms  {path}" for seconds, path in self.slowest_files()
+            )
+        return "\n".join(rows)
+
+    def trace(self) -> Dict[str, Any]:
+        """Return the phases as a Chrome trace-event document."""
+        pid, tid = os.getpid(), threading.get_ident()
+        events = [
+            {
+                "name": event["name"],
+                "cat": "phase",
+                "ph": "X",
+                "ts": (event["start"] - self._origin) / 1000,
+                "dur": event["wall"] / 1000,
+                "pid": pid,
+                "tid": tid,
+                "args": {
+                    **event["args"],
+                    "cpu_ms": round(event["cpu"] / 1e6, 3),
+                    **({"peak_mb": round(event["peak"] / 1e6, 3)} if self.memory else {}),
+                },
+            }
+            for event in self.events
+        ]
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "maxRssBytes": max_rss(),
+            "slowestFiles": [
+                {"path": path, "ms": round(seconds * 1000, 3)}
+                for seconds, path in self.slowest_files()
+            ],
+        }
+
+    def write_trace(self, path: Path | str) -> None:
+        """Write :meth:`trace` as JSON, loadable in chrome://tracing or Perfetto."""
+        Path(path).write_text(json.dumps(self.trace()))
+
+
+_active: Profiler | None = None
+
+
+def enable(profiler: Profiler) -> Profiler:
+    """Install ``profiler`` as the target of the module-level hooks."""
+    global _active
+    _active = profiler
+    profiler.start()
+    return profiler
+
+
+def disable() -> Profiler | None:
+    """Remove the active profiler and return it."""
+    global _active
+    profiler, _active = _active, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+def enabled() -> bool:
+    """Return True while a profiler is installed."""
+    return _active is not None
+
+
+def phase(name: str, **args: Any):
+    """Return a context manager timing phase ``name``, or a no-op one when disabled."""
+    profiler = _active
+    if profiler is None:
+        return _NULL
+    return profiler.phase(name, **args)
+
+
+def count(**counts: int) -> None:
+    """Add counts (files, edges, ...) to the innermost open phase."""
+    if _active is not None:
+        _active.count(**counts)
+
+
+def record_file(path: Path | str, seconds: float) -> None:
+    """Record the parse time of one file."""
+    if _active is not None:
+        _active.record_file(path, seconds)
@@ -0,0 +1,209 @@
+"""File system change notification with inotify and a polling fallback."""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Set
+
+from .file_utils import walk_directories
+
+# inotify(7) constants.
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (
+    IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    | IN_DELETE_SELF
+)
+_EVENT = struct.Struct("iIII")
+
+
+class Watcher:
+    """Base class: reports batches of changed Python files under a root.
+
+    :meth:`changes` blocks until something changes and then waits for
+    ``debounce`` seconds of quiet, so an editor's save (or a ``git checkout``)
+    arrives as one batch. It returns ``None`` when the watcher lost track of
+    events and the caller should rescan everything.
+    """
+
+    backend = "none"
+
+    def __init__(self, root: Path, debounce: float = 0.2) -> None:
+        self.root = Path(root)
+        self.debounce = debounce
+
+    def _poll(self, timeout: float | None) -> Set[Path] | None:
+        """Return the changes seen within ``timeout`` seconds (``None`` = forever)."""
+        raise NotImplementedError
+
+    def changes(self) -> Set[Path] | None:
+        """Block until files change; return the debounced batch of changed paths."""
+        batch = self._poll(None)
+        while batch is not None:
+            more = self._poll(self.debounce)
+            if more is None:
+                return None
+            if not more:
+                break
+            batch |= more
+        return batch
+
+    def close(self) -> None:
+        """Release operating system resources."""
+
+    def __enter__(self) -> "Watcher":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class InotifyWatcher(Watcher):
+    """Linux watcher using inotify through ``ctypes``; one watch per directory."""
+
+    backend = "inotify"
+
+    def __init__(
+        self,
+        root: Path,
+        debounce: float = 0.2,
+        directories: Callable[[Path], Iterable[Path]] = walk_directories,
+    ) -> None:
+        super().__init__(root, debounce)
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._directories = directories
+        self._watches: Dict[int, Path] = {}
+        for directory in directories(self.root):
+            self._add_watch(directory)
+
+    def _add_watch(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            # The directory vanished or the user watch limit was reached.
+            return
+        self._watches[wd] = directory
+
+    def _poll(self, timeout: float | None) -> Set[Path] | None:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed: Set[Path] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                return None
+            directory = self._watches.get(wd)
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            if directory is None or not name:
+                continue
+            path = directory / os.fsdecode(name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # Watch the new tree and report files that appeared before the watch did.
+                    for subdirectory in self._directories(path):
+                        self._add_watch(subdirectory)
+                        changed.update(subdirectory.glob("*.py"))
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    return None
+            elif path.suffix == ".py":
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher(Watcher):
+    """Portable watcher comparing size and mtime of the listed files."""
+
+    backend = "polling"
+
+    def __init__(
+        self,
+        root: Path,
+        list_files: Callable[[], Iterable[Path]],
+        debounce: float = 0.2,
+        interval: float = 1.0,
+    ) -> None:
+        super().__init__(root, debounce)
+        self.interval = interval
+        self._list_files = list_files
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self) -> Dict[Path, tuple[int, int]]:
+        snapshot = {}
+        for path in self._list_files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _poll(self, timeout: float | None) -> Set[Path] | None:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._take_snapshot()
+            old = self._snapshot
+            self._snapshot = snapshot
+            changed = {
+                path for path in snapshot.keys() | old.keys()
+                if snapshot.get(path) != old.get(path)
+            }
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            wait = self.interval if deadline is None else min(self.interval, timeout)
+            time.sleep(wait)
+
+
+def create_watcher(
+    root: Path,
+    list_files: Callable[[], Iterable[Path]],
+    directories: Callable[[Path], Iterable[Path]] = walk_directories,
+    debounce: float = 0.2,
+    interval: float = 1.0,
+    polling: bool = False,
+) -> Watcher:
+    """Return an inotify watcher when available, else a polling watcher."""
+    if not polling:
+        try:
+            return InotifyWatcher(root, debounce, directories)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, list_files, debounce, interval)
+
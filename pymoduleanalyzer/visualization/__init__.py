@@ -1,3 +1,3 @@
 """Visualization helpers."""
 
-__all__ = ["graph_generator", "report_builder"]
+__all__ = ["graph_generator", "layout", "report_builder", "summary", "viewer"]
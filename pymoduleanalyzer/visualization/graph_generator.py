@@ -1,7 +1,12 @@
 """Generate simple dependency graphs using Graphviz."""
 
+import base64
+import hashlib
+import io
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, IO, Iterator, List, Sequence, Tuple
+
+from ..analyzer.dependency_graph import DependencyGraph
 
 try:
     import graphviz
@@ -9,22 +14,145 @@ except ImportError:  # pragma: no cover - optional dependency
     graphviz = None
 
 
-def generate_dot(imports: Dict[Path, List[str]]) -> str:
+def node_ids(names: Sequence[str]) -> List[str]:
+    """Return a short diagram ID for every node name.
+
+    IDs are derived from a hash of the name alone, so a module keeps its ID
+    when others are added or removed; the rare collision is resolved in
+    sorted name order. Equal names share one ID.
+    """
+    ids = [""] * len(names)
+    taken: Dict[str, str] = {}
+    for position in sorted(range(len(names)), key=names.__getitem__):
+        name = names[position]
+        digest = hashlib.blake2b(name.encode(), digest_size=5).digest()
+        base = candidate = "n" + base64.b32encode(digest).decode().lower()
+        suffix = 1
+        while taken.get(candidate, name) != name:
+            candidate = f"{base}{suffix}"
+            suffix += 1
+        taken[candidate] = name
+        ids[position] = candidate
+    return ids
+
+
+def dot_node(node_id: str, name: str) -> str:
+    """Return the DOT declaration of one node."""
+    label = name.replace("\\", "\\\\").replace('"', '\\"')
+    return f'    {node_id} [label="{label}"];'
+
+
+def dot_edge(source_id: str, target_id: str) -> str:
+    """Return the DOT line for one edge."""
+    return f"    {source_id} -> {target_id};"
+
+
+def mermaid_node(node_id: str, name: str) -> str:
+    """Return the Mermaid declaration of one node."""
+    label = name.replace('"', "#quot;")
+    return f'    {node_id}["{label}"]'
+
+
+def mermaid_edge(source_id: str, target_id: str) -> str:
+    """Return the Mermaid line for one edge."""
+    return f"    {source_id} --> {target_id}"
+
+
+def _package_names(graph) -> List[str]:
+    """Return the package of every node; top-level modules and externals stay as they are."""
+    groups = []
+    for node, name in enumerate(graph.names):
+        path = graph.paths[node]
+        if path is None or path.name == "__init__.py" or "." not in name:
+            groups.append(name)
+        else:
+            groups.append(name.rpartition(".")[0])
+    return groups
+
+
+def _diagram(graph, collapse_packages: bool) -> Tuple[List[str], List[bool], Iterator]:
+    """Return node names, which nodes have edges, and an edge iterator.
+
+    Module-level edges come straight from the graph, which already stores
+    each pair once. Package-level edges (and modules sharing a dotted name)
+    are deduplicated with a set of ``source * count + target`` integers,
+    dropping edges that stay inside one node.
+    """
+    groups = _package_names(graph) if collapse_packages else graph.names
+    group_ids: Dict[str, int] = {}
+    group_of = [group_ids.setdefault(group, len(group_ids)) for group in groups]
+    names = list(group_ids)
+    count = len(names)
+    used = [False] * count
+    if count == len(graph.names):
+        for source, target, _ in graph.edges():
+            used[source] = used[target] = True
+        return names, used, ((source, target) for source, target, _ in graph.edges())
+
+    seen = set()
+    edges = []
+    for source, target, _ in graph.edges():
+        source, target = group_of[source], group_of[target]
+        key = source * count + target
+        if source != target and key not in seen:
+            seen.add(key)
+            edges.append((source, target))
+            used[source] = used[target] = True
+    return names, used, iter(edges)
+
+
+def write_dot(handle: IO[str], graph, collapse_packages: bool = False) -> int:
+    """Stream the graph to ``handle`` in DOT format; return the number of edges."""
+    names, used, edges = _diagram(graph, collapse_packages)
+    ids = node_ids(names)
+    handle.write("digraph dependencies {\n")
+    for node, name in enumerate(names):
+        if used[node]:
+            handle.write(dot_node(ids[node], name) + "\n")
+    count = 0
+    for source, target in edges:
+        handle.write(dot_edge(ids[source], ids[target]) + "\n")
+        count += 1
+    handle.write("}\n")
+    return count
+
+
+def write_mermaid(handle: IO[str], graph, collapse_packages: bool = False) -> int:
+    """Stream the graph to ``handle`` as a Mermaid flowchart; return the number of edges."""
+    names, used, edges = _diagram(graph, collapse_packages)
+    ids = node_ids(names)
+    handle.write("flowchart TD\n")
+    for node, name in enumerate(names):
+        if used[node]:
+            handle.write(mermaid_node(ids[node], name) + "\n")
+    count = 0
+    for source, target in edges:
+        handle.write(mermaid_edge(ids[source], ids[target]) + "\n")
+        count += 1
+    return count
+
+
+def generate_dot(
+    imports: Dict[Path, List[str]],
+    graph: DependencyGraph | None = None,
+    collapse_packages: bool = False,
+) -> str:
     """Return DOT representation of the import graph."""
-    dot_lines = ["digraph dependencies {"]
-    for module, deps in imports.items():
-        module_label = module.stem
-        for dep in deps:
-            dot_lines.append(f"    {module_label} -> \"{dep}\"")
-    dot_lines.append("}")
-    return "\n".join(dot_lines)
+    if graph is None:
+        graph = DependencyGraph.from_imports(imports)
+    buffer = io.StringIO()
+    write_dot(buffer, graph, collapse_packages)
+    return buffer.getvalue()
 
 
-def generate_mermaid(imports: Dict[Path, List[str]]) -> str:
+def generate_mermaid(
+    imports: Dict[Path, List[str]],
+    graph: DependencyGraph | None = None,
+    collapse_packages: bool = False,
+) -> str:
     """Return Mermaid flowchart representation of the import graph."""
-    lines = ["flowchart TD"]
-    for module, deps in imports.items():
-        module_label = module.stem
-        for dep in deps:
-            lines.append(f"    {module_label} --> {dep}")
-    return "\n".join(lines)
+    if graph is None:
+        graph = DependencyGraph.from_imports(imports)
+    buffer = io.StringIO()
+    write_mermaid(buffer, graph, collapse_packages)
+    return buffer.getvalue()
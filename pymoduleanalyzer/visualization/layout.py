@@ -0,0 +1,205 @@
+"""Node coordinates for dependency diagrams, computed ahead of rendering."""
+
+from __future__ import annotations
+
+import math
+import random
+from typing import List, Sequence, Tuple
+
+from ..analyzer.reachability import Condensation
+
+Position = Tuple[float, float]
+
+LAYOUTS = ("layered", "force")
+
+
+def layered_layout(
+    adjacency: Sequence[Sequence[int]],
+    node_gap: float = 160.0,
+    layer_gap: float = 120.0,
+    sweeps: int = 4,
+) -> List[Position]:
+    """Return a layered (Sugiyama-style) position for every node.
+
+    Strongly connected components are condensed first, so the layering runs
+    on a DAG: a component sits one layer above the deepest component it
+    imports, which puts leaf dependencies at the bottom. Members of a cycle
+    are placed side by side. The order within each layer is improved with
+    ``sweeps`` alternating barycenter passes to reduce crossings; long edges
+    are not split into dummy nodes, so every pass stays O(V log V + E).
+    """
+    condensation = Condensation(adjacency)
+    components = condensation.components
+    successors = condensation.successors
+    predecessors = condensation.predecessors
+    # Components come in reverse topological order, so successors are done first.
+    layer = [0] * len(components)
+    for component in range(len(components)):
+        if successors[component]:
+            layer[component] = 1 + max(layer[other] for other in successors[component])
+    depth = max(layer, default=0)
+    layers: List[List[int]] = [[] for _ in range(depth + 1)]
+    for component in range(len(components)):
+        layers[layer[component]].append(component)
+
+    center = [0.0] * len(components)
+
+    def place(row: List[int]) -> None:
+        # Components are as wide as their member count; centre the row on 0.
+        width = sum(len(components[component]) for component in row)
+        offset = -width / 2
+        for component in row:
+            size = len(components[component])
+            center[component] = offset + size / 2
+            offset += size
+
+    for row in layers:
+        place(row)
+    for sweep in range(sweeps):
+        # Alternate top-down (align with importers) and bottom-up (with imports).
+        downward = sweep % 2 == 0
+        rows = range(depth, -1, -1) if downward else range(depth + 1)
+        neighbours = predecessors if downward else successors
+        for index in rows:
+            row = layers[index]
+            barycenter = {}
+            for component in row:
+                others = neighbours[component]
+                barycenter[component] = (
+                    sum(center[other] for other in others) / len(others)
+                    if others else center[component]
+                )
+            row.sort(key=barycenter.__getitem__)
+            place(row)
+
+    positions: List[Position] = [(0.0, 0.0)] * len(adjacency)
+    for component, members in enumerate(components):
+        y = (depth - layer[component]) * layer_gap
+        left = center[component] - len(members) / 2 + 0.5
+        for offset, node in enumerate(sorted(members)):
+            positions[node] = ((left + offset) * node_gap, y)
+    return positions
+
+
+class _Cell:
+    """Quadtree cell with the total mass and centre of mass of its points."""
+
+    __slots__ = ("x", "y", "half", "mass", "mx", "my", "point", "children")
+
+    def __init__(self, x: float, y: float, half: float) -> None:
+        self.x, self.y, self.half = x, y, half
+        self.mass = 0
+        self.mx = self.my = 0.0
+        self.point = -1
+        self.children: List["_Cell"] | None = None
+
+
+def _build_tree(xs: List[float], ys: List[float]) -> _Cell:
+    """Return the Barnes-Hut quadtree over the points, built by recursive splitting."""
+    low_x, high_x = min(xs), max(xs)
+    low_y, high_y = min(ys), max(ys)
+    half = max(high_x - low_x, high_y - low_y, 1.0) / 2 + 1e-6
+    root = _Cell((low_x + high_x) / 2, (low_y + high_y) / 2, half)
+    stack = [(root, list(range(len(xs))))]
+    while stack:
+        cell, points = stack.pop()
+        cell.mass = len(points)
+        cell.mx = sum(xs[point] for point in points) / cell.mass
+        cell.my = sum(ys[point] for point in points) / cell.mass
+        if len(points) == 1 or cell.half < 1e-3:
+            cell.point = points[0]
+            continue
+        quadrants: List[List[int]] = [[], [], [], []]
+        for point in points:
+            quadrants[(xs[point] >= cell.x) + 2 * (ys[point] >= cell.y)].append(point)
+        half = cell.half / 2
+        cell.children = []
+        for quadrant, members in enumerate(quadrants):
+            if members:
+                child = _Cell(
+                    cell.x + (half if quadrant & 1 else -half),
+                    cell.y + (half if quadrant & 2 else -half),
+                    half,
+                )
+                cell.children.append(child)
+                stack.append((child, members))
+    return root
+
+
+def force_layout(
+    adjacency: Sequence[Sequence[int]],
+    iterations: int = 50,
+    node_gap: float = 160.0,
+    theta: float = 1.0,
+    seed: int = 0,
+) -> List[Position]:
+    """Return a force-directed (Fruchterman-Reingold) position for every node.
+
+    Repulsion is approximated with a Barnes-Hut quadtree: a cell whose size
+    over distance is below ``theta`` acts as one body, so an iteration costs
+    O(V log V + E) instead of O(V^2). The temperature cools linearly, so the
+    layout settles after ``iterations`` steps.
+    """
+    count = len(adjacency)
+    if count == 0:
+        return []
+    rng = random.Random(seed)
+    side = math.sqrt(count) * node_gap
+    xs = [rng.uniform(0, side) for _ in range(count)]
+    ys = [rng.uniform(0, side) for _ in range(count)]
+    edges = [(source, target) for source in range(count) for target in adjacency[source]
+             if target != source]
+    k = node_gap
+    k2 = k * k
+    theta2 = theta * theta
+    temperature = side / 10
+
+    for step in range(iterations):
+        dx = [0.0] * count
+        dy = [0.0] * count
+        root = _build_tree(xs, ys)
+        for point in range(count):
+            px, py = xs[point], ys[point]
+            fx = fy = 0.0
+            stack = [root]
+            while stack:
+                cell = stack.pop()
+                if cell.point == point:
+                    continue
+                ox, oy = px - cell.mx, py - cell.my
+                distance2 = ox * ox + oy * oy or 1e-2
+                if cell.children is None or 4 * cell.half * cell.half < theta2 * distance2:
+                    # Repulsive force k^2 / d along the unit vector: k^2 * o / d^2.
+                    scale = k2 * cell.mass / distance2
+                    fx += ox * scale
+                    fy += oy * scale
+                else:
+                    stack.extend(cell.children)
+            dx[point] = fx
+            dy[point] = fy
+        for source, target in edges:
+            ox, oy = xs[source] - xs[target], ys[source] - ys[target]
+            # Attractive force d^2 / k along the unit vector: o * d / k.
+            scale = math.sqrt(ox * ox + oy * oy) / k
+            dx[source] -= ox * scale
+            dy[source] -= oy * scale
+            dx[target] += ox * scale
+            dy[target] += oy * scale
+        for point in range(count):
+            length = math.sqrt(dx[point] ** 2 + dy[point] ** 2)
+            if length > temperature:
+                dx[point] *= temperature / length
+                dy[point] *= temperature / length
+            xs[point] += dx[point]
+            ys[point] += dy[point]
+        temperature = side / 10 * (1 - (step + 1) / iterations) + 1.0
+    return list(zip(xs, ys))
+
+
+def compute_layout(adjacency: Sequence[Sequence[int]], layout: str = "layered") -> List[Position]:
+    """Return positions from the named layout, one of :data:`LAYOUTS`."""
+    if layout == "layered":
+        return layered_layout(adjacency)
+    if layout == "force":
+        return force_layout(adjacency)
+    raise ValueError(f"unknown layout {layout!r}; expected one of {', '.join(LAYOUTS)}")
@@ -1,14 +1,111 @@
-"""Build simple HTML reports."""
+"""Build HTML dependency reports."""
 
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from io import StringIO
 from pathlib import Path
-from typing import Dict, List
+from typing import IO, Dict, Iterator, List, Mapping, Sequence
 
-from jinja2 import Template
+from jinja2 import Environment, FileSystemLoader, Template
+from markupsafe import Markup
 
+TEMPLATES = Path(__file__).parent / "templates"
 
-def build_report(imports: Dict[Path, List[str]]) -> str:
-    """Return a minimal HTML report of module dependencies."""
-    template = Template(
-        """<html><body><h1>Dependencies</h1><ul>{% for module, deps in imports.items() %}<li>{{ module }}: {{ deps|join(', ') }}</li>{% endfor %}</ul></body></html>"""
+# Rows (or strings) serialized per chunk of the streamed data blob.
+CHUNK_SIZE = 1000
+
+
+@lru_cache(maxsize=None)
+def environment() -> Environment:
+    """Return the shared template environment; each template compiles once per process."""
+    return Environment(
+        loader=FileSystemLoader(str(TEMPLATES)), autoescape=True, auto_reload=False
     )
-    return template.render(imports=imports)
+
+
+def get_template(name: str) -> Template:
+    """Return the compiled template ``name`` from :data:`TEMPLATES`."""
+    return environment().get_template(name)
+
+
+def script_text(text: str) -> Markup:
+    """Mark ``text`` safe for an inline ``<script>`` element.
+
+    Script contents are not HTML-escaped; only ``</`` can end them early.
+    """
+    return Markup(text.replace("</", "<\\/"))
+
+
+@lru_cache(maxsize=None)
+def inline_script(name: str) -> Markup:
+    """Return the script ``name`` from :data:`TEMPLATES`, ready to inline."""
+    return script_text((TEMPLATES / name).read_text())
+
+
+def _json_items(items: Sequence) -> str:
+    return json.dumps(items, separators=(",", ":"))[1:-1]
+
+
+def _report_data(imports: Mapping[object, Sequence[str]]) -> Iterator[Markup]:
+    """Yield the report's JSON blob in chunks.
+
+    Each row is ``[module, dependency, ...]`` as indices into ``strings``,
+    so names repeated across modules are stored once. Only the current
+    chunk and the string table are held in memory.
+    """
+    strings: Dict[str, int] = {}
+    yield Markup('{"rows":[')
+    separator = ""
+    batch: List[List[int]] = []
+    for module, deps in imports.items():
+        row = []
+        for name in (str(module), *deps):
+            index = strings.get(name)
+            if index is None:
+                index = strings[name] = len(strings)
+            row.append(index)
+        batch.append(row)
+        if len(batch) == CHUNK_SIZE:
+            yield script_text(separator + _json_items(batch))
+            separator, batch = ",", []
+    if batch:
+        yield script_text(separator + _json_items(batch))
+    yield Markup('],"strings":[')
+    names = list(strings)
+    for start in range(0, len(names), CHUNK_SIZE):
+        prefix = "," if start else ""
+        yield script_text(prefix + _json_items(names[start:start + CHUNK_SIZE]))
+    yield Markup("]}")
+
+
+def write_report(
+    handle: IO[str],
+    imports: Mapping[object, Sequence[str]],
+    title: str = "Dependencies",
+) -> int:
+    """Stream the HTML report of ``imports`` to ``handle``; return the module count.
+
+    Module data goes into a compact JSON blob, and the page's table draws
+    only the rows in view, so large repositories stay responsive. The page
+    is written chunk by chunk as the template generates it.
+    """
+    template = get_template("report.html")
+    stream = template.generate(
+        title=title,
+        module_count=len(imports),
+        import_count=sum(len(deps) for deps in imports.values()),
+        data=_report_data(imports),
+        script=inline_script("report.js"),
+    )
+    for chunk in stream:
+        handle.write(chunk)
+    return len(imports)
+
+
+def build_report(imports: Dict[Path, List[str]]) -> str:
+    """Return the HTML report of module dependencies as a string."""
+    buffer = StringIO()
+    write_report(buffer, imports)
+    return buffer.getvalue()
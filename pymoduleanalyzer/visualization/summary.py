@@ -0,0 +1,161 @@
+"""Summarize a dependency graph into a small package-level diagram."""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from typing import IO, Dict, List, Tuple
+
+from .graph_generator import dot_node, mermaid_node, node_ids
+
+
+@dataclass
+class GraphSummary:
+    """Package-level view of a dependency graph.
+
+    ``edges`` holds ``(source, target, weight)`` between entries of
+    ``names``, heaviest first; ``weight`` sums the import counts of the
+    module edges folded into it. ``omitted_edges`` counts package edges left
+    out by the top-K limit.
+    """
+
+    names: List[str]
+    sizes: List[int]
+    external: List[bool]
+    edges: List[Tuple[int, int, int]] = field(default_factory=list)
+    omitted_edges: int = 0
+
+    def label(self, group: int) -> str:
+        """Return the display label of ``group``, with its module count."""
+        if self.external[group]:
+            return self.names[group]
+        return f"{self.names[group]} ({self.sizes[group]})"
+
+
+def _group_name(name: str, depth: int, focus: str | None) -> Tuple[str, bool]:
+    """Return the group of a module name and whether it lies inside ``focus``."""
+    parts = name.split(".")
+    if focus is None:
+        return ".".join(parts[:depth]), True
+    focus_depth = focus.count(".") + 1
+    if name == focus or name.startswith(focus + "."):
+        return ".".join(parts[:focus_depth + depth]), True
+    return ".".join(parts[:focus_depth]), False
+
+
+def summarize(
+    graph,
+    depth: int = 2,
+    top: int | None = None,
+    focus: str | None = None,
+    include_external: bool = False,
+) -> GraphSummary:
+    """Collapse ``graph`` to packages ``depth`` levels deep.
+
+    Module edges are folded into weighted package edges in one pass over the
+    graph; edges inside a package are dropped. ``top`` keeps only the
+    heaviest package edges. ``focus`` drills into one package: its modules
+    are grouped ``depth`` levels below it, everything else at the level of
+    the focused package, and only edges touching the focus are kept.
+    """
+    if depth < 1:
+        raise ValueError("depth must be at least 1")
+    group_ids: Dict[str, int] = {}
+    names: List[str] = []
+    sizes: List[int] = []
+    external: List[bool] = []
+    inside: List[bool] = []
+    group_of: List[int] = []
+    for node, name in enumerate(graph.names):
+        is_external = graph.is_external(node)
+        if is_external:
+            if not include_external:
+                group_of.append(-1)
+                continue
+            key, focused = "\0" + name, False
+        else:
+            key, focused = _group_name(name, depth, focus)
+        group = group_ids.get(key)
+        if group is None:
+            group = group_ids[key] = len(names)
+            names.append(name if is_external else key)
+            sizes.append(0)
+            external.append(is_external)
+            inside.append(focused)
+        if not is_external:
+            sizes[group] += 1
+        group_of.append(group)
+
+    count = len(names)
+    weights: Dict[int, int] = {}
+    for source, target, weight in graph.edges():
+        source, target = group_of[source], group_of[target]
+        if source == target or source < 0 or target < 0:
+            continue
+        if focus is not None and not (inside[source] or inside[target]):
+            continue
+        key = source * count + target
+        weights[key] = weights.get(key, 0) + weight
+
+    def order(item: Tuple[int, int]) -> Tuple[int, str, str]:
+        key, weight = item
+        return -weight, names[key // count], names[key % count]
+
+    if top is not None and top < len(weights):
+        kept = heapq.nsmallest(top, weights.items(), key=order)
+    else:
+        kept = sorted(weights.items(), key=order)
+    edges = [(key // count, key % count, weight) for key, weight in kept]
+    summary = GraphSummary(names, sizes, external, edges, len(weights) - len(edges))
+    # Without a top-K limit every project group inside the view is shown.
+    keep = [top is None and focused and not ext for focused, ext in zip(inside, external)]
+    return _drop_unused(summary, keep)
+
+
+def _drop_unused(summary: GraphSummary, keep: List[bool]) -> GraphSummary:
+    """Keep groups flagged in ``keep`` or touched by an edge, sorted by name."""
+    used = list(keep)
+    for source, target, _ in summary.edges:
+        used[source] = used[target] = True
+    order = sorted(
+        (group for group in range(len(summary.names)) if used[group]),
+        key=lambda group: (summary.external[group], summary.names[group]),
+    )
+    position = {group: new for new, group in enumerate(order)}
+    return GraphSummary(
+        [summary.names[group] for group in order],
+        [summary.sizes[group] for group in order],
+        [summary.external[group] for group in order],
+        [(position[source], position[target], weight) for source, target, weight in summary.edges],
+        summary.omitted_edges,
+    )
+
+
+def _ids(summary: GraphSummary) -> List[str]:
+    # External packages are hashed apart from project groups of the same name.
+    return node_ids(
+        ["\0" + name if ext else name for name, ext in zip(summary.names, summary.external)]
+    )
+
+
+def write_summary_dot(handle: IO[str], summary: GraphSummary) -> int:
+    """Write ``summary`` in DOT format with weighted edges; return the number of edges."""
+    ids = _ids(summary)
+    handle.write("digraph dependencies {\n")
+    for group in range(len(summary.names)):
+        handle.write(dot_node(ids[group], summary.label(group)) + "\n")
+    for source, target, weight in summary.edges:
+        handle.write(f'    {ids[source]} -> {ids[target]} [label="{weight}"];\n')
+    handle.write("}\n")
+    return len(summary.edges)
+
+
+def write_summary_mermaid(handle: IO[str], summary: GraphSummary) -> int:
+    """Write ``summary`` as a Mermaid flowchart with weighted edges; return the number of edges."""
+    ids = _ids(summary)
+    handle.write("flowchart TD\n")
+    for group in range(len(summary.names)):
+        handle.write(mermaid_node(ids[group], summary.label(group)) + "\n")
+    for source, target, weight in summary.edges:
+        handle.write(f"    {ids[source]} -->|{weight}| {ids[target]}\n")
+    return len(summary.edges)
@@ -0,0 +1,133 @@
+// Virtualized dependency table: only the rows in view exist in the DOM, so
+// reports of tens of thousands of modules open and scroll without delay.
+(function () {
+  "use strict";
+
+  var ROW_HEIGHT = 24;
+  var OVERSCAN = 10;
+
+  var data = JSON.parse(document.getElementById("report-data").textContent);
+  var rows = data.rows;
+  var strings = data.strings;
+  var count = rows.length;
+  var viewport = document.getElementById("viewport");
+  var spacer = document.getElementById("spacer");
+  var container = document.getElementById("rows");
+  var search = document.getElementById("search");
+  var shown = document.getElementById("shown");
+  var headers = document.querySelectorAll("#header [data-sort]");
+
+  var order = [];
+  for (var i = 0; i < count; i++) order.push(i);
+  var visible = order;
+  var sortKey = null;
+  var descending = false;
+  var lowered = null;
+  var pool = [];
+  var frame = 0;
+
+  function name(row) {
+    return strings[rows[row][0]];
+  }
+
+  function dependencies(row) {
+    var indices = rows[row];
+    var names = [];
+    for (var j = 1; j < indices.length; j++) names.push(strings[indices[j]]);
+    return names.join(", ");
+  }
+
+  function compare(a, b) {
+    var result;
+    if (sortKey === "count") {
+      result = rows[a].length - rows[b].length;
+    } else {
+      var left = name(a), right = name(b);
+      result = left < right ? -1 : left > right ? 1 : 0;
+    }
+    return (descending ? -result : result) || a - b;
+  }
+
+  function matches(row, needle) {
+    var indices = rows[row];
+    for (var j = 0; j < indices.length; j++) {
+      if (lowered[indices[j]].indexOf(needle) !== -1) return true;
+    }
+    return false;
+  }
+
+  function update() {
+    var needle = search.value.trim().toLowerCase();
+    if (needle) {
+      if (!lowered) lowered = strings.map(function (text) { return text.toLowerCase(); });
+      visible = order.filter(function (row) { return matches(row, needle); });
+    } else {
+      visible = order;
+    }
+    shown.textContent = visible.length;
+    spacer.style.height = visible.length * ROW_HEIGHT + "px";
+    redraw();
+  }
+
+  function sortBy(key) {
+    descending = sortKey === key ? !descending : key === "count";
+    sortKey = key;
+    order.sort(compare);
+    headers.forEach(function (header) {
+      var label = header.textContent.replace(/ [▲▼]$/, "");
+      header.textContent = label + (header.dataset.sort === key ? (descending ? " ▼" : " ▲") : "");
+    });
+    update();
+  }
+
+  function rowElement(index) {
+    while (pool.length <= index) {
+      var element = document.createElement("div");
+      element.className = "row";
+      for (var cell = 0; cell < 3; cell++) element.appendChild(document.createElement("div"));
+      container.appendChild(element);
+      pool.push(element);
+    }
+    return pool[index];
+  }
+
+  function redraw() {
+    if (!frame) frame = requestAnimationFrame(draw);
+  }
+
+  function draw() {
+    frame = 0;
+    var first = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - OVERSCAN);
+    var last = Math.min(
+      visible.length,
+      Math.ceil((viewport.scrollTop + viewport.clientHeight) / ROW_HEIGHT) + OVERSCAN
+    );
+    container.style.transform = "translateY(" + first * ROW_HEIGHT + "px)";
+    for (var slot = 0; slot < last - first; slot++) {
+      var row = visible[first + slot];
+      var element = rowElement(slot);
+      var cells = element.childNodes;
+      var deps = dependencies(row);
+      element.style.display = "";
+      cells[0].textContent = cells[0].title = name(row);
+      cells[1].textContent = rows[row].length - 1;
+      cells[2].textContent = cells[2].title = deps;
+    }
+    for (; slot < pool.length; slot++) pool[slot].style.display = "none";
+  }
+
+  var pending = 0;
+  search.addEventListener("input", function () {
+    clearTimeout(pending);
+    pending = setTimeout(function () {
+      viewport.scrollTop = 0;
+      update();
+    }, 150);
+  });
+  headers.forEach(function (header) {
+    header.addEventListener("click", function () { sortBy(header.dataset.sort); });
+  });
+  viewport.addEventListener("scroll", redraw);
+  window.addEventListener("resize", redraw);
+  update();
+})();
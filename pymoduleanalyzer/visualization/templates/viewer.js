@@ -0,0 +1,246 @@
+// Self-contained dependency graph viewer: canvas rendering of precomputed
+// positions with pan, zoom, search, node dragging and optional physics.
+(function () {
+  "use strict";
+
+  var data = JSON.parse(document.getElementById("graph-data").textContent);
+  var canvas = document.getElementById("graph");
+  var context = canvas.getContext("2d");
+  var info = document.getElementById("info");
+  var search = document.getElementById("search");
+  var physicsBox = document.getElementById("physics");
+
+  var nodes = data.nodes;
+  var edges = data.edges;
+  var count = nodes.length;
+  var xs = new Float64Array(count);
+  var ys = new Float64Array(count);
+  var outgoing = [];
+  var incoming = [];
+  for (var i = 0; i < count; i++) {
+    xs[i] = nodes[i].x;
+    ys[i] = nodes[i].y;
+    outgoing.push([]);
+    incoming.push([]);
+  }
+  edges.forEach(function (edge) {
+    outgoing[edge[0]].push(edge[1]);
+    incoming[edge[1]].push(edge[0]);
+  });
+
+  var view = { x: 0, y: 0, scale: 1 };
+  var selected = -1;
+  var highlighted = null;
+  var dragging = null;
+  var frame = 0;
+
+  function resize() {
+    var ratio = window.devicePixelRatio || 1;
+    canvas.width = canvas.clientWidth * ratio;
+    canvas.height = canvas.clientHeight * ratio;
+    context.setTransform(ratio, 0, 0, ratio, 0, 0);
+    redraw();
+  }
+
+  function fit() {
+    if (!count) return;
+    var minX = Infinity, minY = Infinity, maxX = -Infinity, maxY = -Infinity;
+    for (var i = 0; i < count; i++) {
+      minX = Math.min(minX, xs[i]); maxX = Math.max(maxX, xs[i]);
+      minY = Math.min(minY, ys[i]); maxY = Math.max(maxY, ys[i]);
+    }
+    var width = canvas.clientWidth, height = canvas.clientHeight;
+    view.scale = Math.min(width / (maxX - minX + 200), height / (maxY - minY + 200), 2);
+    view.x = width / 2 - (minX + maxX) / 2 * view.scale;
+    view.y = height / 2 - (minY + maxY) / 2 * view.scale;
+    redraw();
+  }
+
+  function toScreen(i) {
+    return [xs[i] * view.scale + view.x, ys[i] * view.scale + view.y];
+  }
+
+  function nodeAt(px, py) {
+    var best = -1, bestDistance = Math.max(12, 40 * view.scale);
+    bestDistance *= bestDistance;
+    for (var i = 0; i < count; i++) {
+      var p = toScreen(i);
+      var distance = (p[0] - px) * (p[0] - px) + (p[1] - py) * (p[1] - py);
+      if (distance < bestDistance) {
+        best = i;
+        bestDistance = distance;
+      }
+    }
+    return best;
+  }
+
+  function redraw() {
+    if (!frame) frame = requestAnimationFrame(draw);
+  }
+
+  function draw() {
+    frame = 0;
+    var width = canvas.clientWidth, height = canvas.clientHeight;
+    context.clearRect(0, 0, width, height);
+    var radius = Math.max(2, 6 * Math.sqrt(view.scale));
+
+    context.lineWidth = 1;
+    context.strokeStyle = highlighted ? "rgba(132,132,132,0.15)" : "rgba(132,132,132,0.6)";
+    context.beginPath();
+    edges.forEach(function (edge) {
+      var a = toScreen(edge[0]), b = toScreen(edge[1]);
+      context.moveTo(a[0], a[1]);
+      context.lineTo(b[0], b[1]);
+    });
+    context.stroke();
+
+    if (highlighted) {
+      context.lineWidth = 2;
+      context.strokeStyle = "#2B7CE9";
+      context.beginPath();
+      outgoing[selected].forEach(function (target) { arrow(selected, target, radius); });
+      context.stroke();
+      context.strokeStyle = "#E9612B";
+      context.beginPath();
+      incoming[selected].forEach(function (source) { arrow(source, selected, radius); });
+      context.stroke();
+    }
+
+    var labels = view.scale > 0.45;
+    context.font = "12px Arial, sans-serif";
+    context.textAlign = "center";
+    for (var i = 0; i < count; i++) {
+      var p = toScreen(i);
+      if (p[0] < -50 || p[1] < -50 || p[0] > width + 50 || p[1] > height + 50) continue;
+      var dim = highlighted && !highlighted[i];
+      context.fillStyle = i === selected ? "#2B7CE9" : dim ? "#D5E4F8" : nodes[i].color || "#97C2FC";
+      context.beginPath();
+      context.arc(p[0], p[1], radius, 0, 2 * Math.PI);
+      context.fill();
+      if (labels && !dim) {
+        context.fillStyle = "#222";
+        context.fillText(nodes[i].label, p[0], p[1] - radius - 4);
+      }
+    }
+  }
+
+  function arrow(source, target, radius) {
+    var a = toScreen(source), b = toScreen(target);
+    var angle = Math.atan2(b[1] - a[1], b[0] - a[0]);
+    var tipX = b[0] - Math.cos(angle) * radius, tipY = b[1] - Math.sin(angle) * radius;
+    context.moveTo(a[0], a[1]);
+    context.lineTo(tipX, tipY);
+    context.lineTo(tipX - 8 * Math.cos(angle - 0.4), tipY - 8 * Math.sin(angle - 0.4));
+    context.moveTo(tipX, tipY);
+    context.lineTo(tipX - 8 * Math.cos(angle + 0.4), tipY - 8 * Math.sin(angle + 0.4));
+  }
+
+  function select(node) {
+    selected = node;
+    if (node < 0) {
+      highlighted = null;
+      info.textContent = "Click a module to see its dependencies.";
+    } else {
+      highlighted = new Uint8Array(count);
+      highlighted[node] = 1;
+      outgoing[node].forEach(function (other) { highlighted[other] = 1; });
+      incoming[node].forEach(function (other) { highlighted[other] = 1; });
+      info.textContent = nodes[node].title + ": imports " + outgoing[node].length +
+        ", imported by " + incoming[node].length;
+    }
+    redraw();
+  }
+
+  // Optional physics: springs along edges plus repulsion between nodes that
+  // share a grid cell, so each step stays linear in nodes and edges.
+  function physicsStep() {
+    if (!physicsBox.checked) return;
+    var cell = 160, grid = new Map(), dx = new Float64Array(count), dy = new Float64Array(count);
+    for (var i = 0; i < count; i++) {
+      var key = Math.floor(xs[i] / cell) + "," + Math.floor(ys[i] / cell);
+      var bucket = grid.get(key);
+      if (bucket) bucket.push(i); else grid.set(key, [i]);
+    }
+    grid.forEach(function (bucket) {
+      for (var a = 0; a < bucket.length; a++) {
+        for (var b = a + 1; b < bucket.length; b++) {
+          var i = bucket[a], j = bucket[b];
+          var ox = xs[i] - xs[j] || Math.random(), oy = ys[i] - ys[j] || Math.random();
+          var force = 2000 / (ox * ox + oy * oy);
+          dx[i] += ox * force; dy[i] += oy * force;
+          dx[j] -= ox * force; dy[j] -= oy * force;
+        }
+      }
+    });
+    edges.forEach(function (edge) {
+      var ox = xs[edge[0]] - xs[edge[1]], oy = ys[edge[0]] - ys[edge[1]];
+      var length = Math.sqrt(ox * ox + oy * oy) || 1, force = (length - 160) / length * 0.05;
+      dx[edge[0]] -= ox * force; dy[edge[0]] -= oy * force;
+      dx[edge[1]] += ox * force; dy[edge[1]] += oy * force;
+    });
+    for (var k = 0; k < count; k++) {
+      if (k === dragging) continue;
+      xs[k] += Math.max(-20, Math.min(20, dx[k]));
+      ys[k] += Math.max(-20, Math.min(20, dy[k]));
+    }
+    draw();
+    requestAnimationFrame(physicsStep);
+  }
+
+  var pointer = null;
+  canvas.addEventListener("mousedown", function (event) {
+    var node = nodeAt(event.offsetX, event.offsetY);
+    pointer = { x: event.offsetX, y: event.offsetY, moved: false };
+    dragging = node >= 0 ? node : null;
+  });
+  canvas.addEventListener("mousemove", function (event) {
+    if (!pointer) return;
+    var moveX = event.offsetX - pointer.x, moveY = event.offsetY - pointer.y;
+    if (Math.abs(moveX) + Math.abs(moveY) > 2) pointer.moved = true;
+    if (dragging !== null) {
+      xs[dragging] += moveX / view.scale;
+      ys[dragging] += moveY / view.scale;
+    } else {
+      view.x += moveX;
+      view.y += moveY;
+    }
+    pointer.x = event.offsetX;
+    pointer.y = event.offsetY;
+    redraw();
+  });
+  window.addEventListener("mouseup", function () {
+    if (pointer && !pointer.moved) select(dragging !== null ? dragging : -1);
+    pointer = null;
+    dragging = null;
+  });
+  canvas.addEventListener("wheel", function (event) {
+    event.preventDefault();
+    var factor = Math.exp(-event.deltaY * 0.001);
+    view.x = event.offsetX - (event.offsetX - view.x) * factor;
+    view.y = event.offsetY - (event.offsetY - view.y) * factor;
+    view.scale *= factor;
+    redraw();
+  }, { passive: false });
+  search.addEventListener("change", function () {
+    var query = search.value.toLowerCase();
+    for (var i = 0; i < count; i++) {
+      if (nodes[i].title.toLowerCase().indexOf(query) !== -1) {
+        select(i);
+        view.scale = Math.max(view.scale, 1);
+        view.x = canvas.clientWidth / 2 - xs[i] * view.scale;
+        view.y = canvas.clientHeight / 2 - ys[i] * view.scale;
+        redraw();
+        return;
+      }
+    }
+  });
+  document.getElementById("fit").addEventListener("click", fit);
+  physicsBox.checked = data.physics;
+  physicsBox.addEventListener("change", physicsStep);
+  window.addEventListener("resize", resize);
+
+  resize();
+  fit();
+  select(-1);
+  physicsStep();
+})();
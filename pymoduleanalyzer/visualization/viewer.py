@@ -0,0 +1,71 @@
+"""Offline interactive HTML viewer with a layout computed in Python."""
+
+from __future__ import annotations
+
+import json
+from typing import IO, List, Sequence
+
+from .layout import compute_layout
+from .report_builder import get_template, inline_script, script_text
+from .summary import GraphSummary
+
+
+def render_viewer(
+    names: Sequence[str],
+    adjacency: Sequence[Sequence[int]],
+    titles: Sequence[str] | None = None,
+    layout: str = "layered",
+    physics: bool = False,
+    title: str = "Dependency Graph",
+) -> str:
+    """Return a self-contained HTML page drawing the graph.
+
+    Node positions come from :func:`compute_layout`, and the viewer script is
+    inlined, so the page needs no network access and shows the final layout
+    at once. ``physics`` turns on the viewer's spring simulation at load;
+    it can always be toggled in the page.
+    """
+    titles = titles or names
+    positions = compute_layout(adjacency, layout)
+    nodes = [
+        {"label": name, "title": titles[node], "x": round(x, 1), "y": round(y, 1)}
+        for node, (name, (x, y)) in enumerate(zip(names, positions))
+    ]
+    edges = [[source, target] for source, targets in enumerate(adjacency) for target in targets]
+    data = json.dumps({"nodes": nodes, "edges": edges, "physics": physics}, separators=(",", ":"))
+    return get_template("viewer.html").render(
+        title=title,
+        node_count=len(nodes),
+        edge_count=len(edges),
+        layout=layout,
+        data=script_text(data),
+        script=inline_script("viewer.js"),
+    )
+
+
+def write_viewer(handle: IO[str], graph, layout: str = "layered", physics: bool = False) -> int:
+    """Write the viewer for the analyzed modules of ``graph``; return the number of edges.
+
+    External packages are left out: they are imported from everywhere and
+    would pull every module towards a few hubs.
+    """
+    count = graph.module_count
+    adjacency: List[List[int]] = [
+        [target for target in graph[node] if target < count] for node in range(count)
+    ]
+    names = graph.names[:count]
+    titles = [str(path) for path in graph.paths[:count]]
+    handle.write(render_viewer(names, adjacency, titles, layout, physics))
+    return sum(len(targets) for targets in adjacency)
+
+
+def write_summary_viewer(
+    handle: IO[str], summary: GraphSummary, layout: str = "layered", physics: bool = False
+) -> int:
+    """Write the viewer for a package summary; return the number of edges."""
+    adjacency: List[List[int]] = [[] for _ in summary.names]
+    for source, target, _ in summary.edges:
+        adjacency[source].append(target)
+    labels = [summary.label(group) for group in range(len(summary.names))]
+    handle.write(render_viewer(labels, adjacency, summary.names, layout, physics))
+    return len(summary.edges)
@@ -0,0 +1,102 @@
+"""Shared fixtures: a small git repository whose module set changes between commits."""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from pymoduleanalyzer.analyzer.cycles import find_cycles
+from pymoduleanalyzer.analyzer.dependency_graph import DependencyGraph
+from pymoduleanalyzer.analyzer.import_analyzer import analyze_imports
+from pymoduleanalyzer.analyzer.module_discovery import discover_modules
+
+# Files written (text) or deleted (None) by each commit, oldest first.
+COMMITS = [
+    {
+        "pkg/__init__.py": "",
+        "pkg/a.py": "import os\nfrom . import b\n",
+        "pkg/b.py": "import json\n",
+        "pkg/c.py": "from . import a\n",
+        "x.py": "import y\n",
+        "y.py": "import x\n",
+    },
+    {
+        "pkg/c.py": None,
+        "pkg/b.py": "import json\nfrom . import c\n",
+        "y.py": None,
+        "z.py": "import x\nfrom pkg import a\n",
+        "pkg/d.py": "from .a import thing\n",
+        "pkg/a.py": "import os\nfrom . import b, d\n",
+    },
+    {
+        "pkg/__init__.py": None,
+        "scripts/one/util.py": "import z\n",
+        "scripts/two/util.py": "import util\n",
+        "y.py": "import x\nimport pkg.a\n",
+        "pkg/b.py": "from pkg import a\n",
+    },
+    {
+        "pkg/__init__.py": "from .a import thing\n",
+        "scripts/one/util.py": None,
+        "pkg/c.py": "from . import b\n",
+    },
+]
+
+
+def git(root, *args):
+    return subprocess.run(
+        ["git", *args], cwd=root, check=True, capture_output=True, text=True
+    ).stdout
+
+
+def apply(root, changes):
+    for rel_path, text in changes.items():
+        path = root / rel_path
+        if text is None:
+            path.unlink()
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text)
+
+
+@pytest.fixture
+def history_repo(tmp_path):
+    """Return ``(root, shas)`` of a repository with one commit per entry of ``COMMITS``."""
+    root = tmp_path / "repo"
+    root.mkdir()
+    git(root, "init", "-q")
+    git(root, "config", "user.email", "dev@example.com")
+    git(root, "config", "user.name", "dev")
+    shas = []
+    for number, changes in enumerate(COMMITS):
+        apply(root, changes)
+        git(root, "add", "-A")
+        git(root, "commit", "-q", "-m", f"commit {number}")
+        shas.append(git(root, "rev-parse", "HEAD").strip())
+    return root, shas
+
+
+def analysis_of(directory):
+    """Return ``(edges, {relative path: module name}, cycles)`` of a fresh analysis."""
+    modules = discover_modules(str(directory))
+    graph = DependencyGraph.from_imports(analyze_imports(modules))
+    edges = {(graph.names[source], graph.names[target]) for source, target, _ in graph.edges()}
+    names = {
+        module.relative_to(directory).as_posix(): graph.names[graph.path_id(module)]
+        for module in modules
+    }
+    return edges, names, find_cycles(graph)
+
+
+def full_analysis(root, rev, scratch: Path):
+    """Return :func:`analysis_of` a checkout of ``rev`` (the work tree for None) in ``scratch``."""
+    if scratch.exists():
+        shutil.rmtree(scratch)
+    if rev is None:
+        shutil.copytree(root, scratch, ignore=shutil.ignore_patterns(".*"))
+    else:
+        scratch.mkdir(parents=True)
+        git(root, f"--work-tree={scratch}", "checkout", rev, "--", ".")
+        git(root, "reset", "-q")
+    return analysis_of(scratch)
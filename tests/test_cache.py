@@ -0,0 +1,63 @@
+"""Tests for the persistent analysis cache."""
+
+import os
+
+from pymoduleanalyzer.analyzer.import_analyzer import analyze_imports
+from pymoduleanalyzer.utils.cache import AnalysisCache
+
+
+def test_scan_entries_do_not_serve_full_runs(tmp_path):
+    module = tmp_path / "mod.py"
+    module.write_text("import os\n\n\ndef run(x):\n    return x if x else os.sep\n")
+
+    with AnalysisCache(tmp_path / "cache") as cache:
+        metrics = {}
+        analyze_imports([module], cache=cache, extractor="scan", file_metrics=metrics)
+        assert "complexity" not in metrics[module]
+
+    with AnalysisCache(tmp_path / "cache") as cache:
+        metrics = {}
+        imports = analyze_imports([module], cache=cache, file_metrics=metrics)
+        assert (cache.hits, cache.misses) == (0, 1)
+        assert list(imports[module]) == ["os"]
+        assert metrics[module]["function_count"] == 1
+        assert metrics[module]["complexity"]["functions"][0]["cyclomatic"] == 2
+
+    with AnalysisCache(tmp_path / "cache") as cache:
+        for extractor in ("ast", "scan"):
+            analyze_imports([module], cache=cache, extractor=extractor)
+        assert (cache.hits, cache.misses) == (2, 0)
+
+
+def test_edit_after_parse_is_not_served(tmp_path, monkeypatch):
+    module = tmp_path / "mod.py"
+    module.write_text("import os\n")
+    store = AnalysisCache.store
+
+    def edit_then_store(self, path, *args, **kwargs):
+        # Same size, later mtime: only the digest tells the versions apart.
+        module.write_text("import re\n")
+        stat = os.stat(module)
+        os.utime(module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        store(self, path, *args, **kwargs)
+
+    for extractor in ("ast", "scan"):
+        module.write_text("import os\n")
+        with AnalysisCache(tmp_path / extractor) as cache:
+            monkeypatch.setattr(AnalysisCache, "store", edit_then_store)
+            imports = analyze_imports([module], cache=cache, extractor=extractor)
+            assert list(imports[module]) == ["os"]
+            monkeypatch.setattr(AnalysisCache, "store", store)
+            imports = analyze_imports([module], cache=cache, extractor=extractor)
+            assert list(imports[module]) == ["re"]
+            assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_deleted_file_is_a_miss(tmp_path):
+    module = tmp_path / "mod.py"
+    module.write_text("import os\n")
+    with AnalysisCache(tmp_path / "cache") as cache:
+        analyze_imports([module], cache=cache)
+        module.unlink()
+        assert cache.lookup(module) is None
+        assert (cache.hits, cache.misses) == (0, 2)
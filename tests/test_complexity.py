@@ -0,0 +1,130 @@
+"""Tests for the cyclomatic, nesting, Halstead and line metrics."""
+
+import ast
+import sys
+
+import pytest
+
+from pymoduleanalyzer.metrics.complexity import file_complexity, line_count, module_complexity
+
+SOURCE = """\
+import os
+
+# A comment line.
+def outer(a, b):
+    if a and b:
+        for item in a:
+            while item:
+                item -= 1
+
+    def inner(x):
+        return x if x else 0
+    return inner
+
+
+class Thing:
+    def method(self, value):
+        try:
+            with open(value) as handle:
+                assert handle
+        except OSError:
+            pass
+        elif_ = 1
+        return elif_
+
+if os:
+    pass
+"""
+
+
+def measure(source):
+    return module_complexity(ast.parse(source), source)
+
+
+def test_functions_are_measured_separately():
+    module = measure(SOURCE)
+    functions = {function.name: function for function in module.functions}
+    assert list(functions) == ["outer", "outer.<locals>.inner", "Thing.method"]
+    # if, and, for, while; the nested function's ``if`` is its own.
+    assert functions["outer"].cyclomatic == 5
+    assert functions["outer"].max_nesting == 3
+    assert functions["outer.<locals>.inner"].cyclomatic == 2
+    # with, assert, except; ``elif_`` is a name, not a keyword.
+    assert functions["Thing.method"].cyclomatic == 4
+    assert functions["Thing.method"].max_nesting == 2
+    # Module-level ``if`` plus every function.
+    assert module.cyclomatic == 2 + 5 + 2 + 4
+
+
+def test_line_kinds():
+    module = measure(SOURCE)
+    assert module.lines == 26
+    assert module.comment_lines == 1
+    assert module.blank_lines == 5
+    assert module.sloc == 20
+    assert sum(function.lines for function in module.functions) == 7 + 2 + 8
+
+
+@pytest.mark.parametrize(
+    "source, max_nesting",
+    [
+        ("if a:\n    x\nelif b:\n    x\nelif c:\n    x\nelif d:\n    x\nelif e:\n    x\n", 1),
+        ("if a:\n    x\nelif b:\n    x\nelse:\n    for i in x:\n        while i:\n"
+         "            pass\n", 3),
+        ("if a:\n    x\nelif b:\n    if c:\n        x\n    elif d:\n        x\n", 2),
+        ("if a:\n    x\nelse:\n    x\n    if b:\n        x\n", 2),
+    ],
+)
+def test_elif_chains_stay_on_one_level(source, max_nesting):
+    module = measure(source)
+    assert module.max_nesting == max_nesting
+    # ``elif`` still opens a path of its own.
+    assert module.cyclomatic == 1 + sum(map(source.count, ("if ", "for ", "while ")))
+
+
+def test_match_cases_are_decisions():
+    source = "match x:\n    case 1:\n        pass\n    case _:\n        pass\n"
+    assert measure(source).cyclomatic == 3
+
+
+def test_halstead_counts():
+    halstead = measure("x = a + a\n").halstead
+    assert (halstead.distinct_operators, halstead.operators) == (2, 2)
+    assert (halstead.distinct_operands, halstead.operands) == (2, 3)
+
+
+@pytest.mark.parametrize(
+    "source, cyclomatic",
+    [
+        ('x = f"{y if z else w}"\n', 2),
+        ("x = f'{a or b!r:>{w if k else 3}}'\n", 3),
+        ('x = rf"\\{{ {a and b} }}"\n', 2),
+        ('x = f"\\N{EM DASH} {[i for i in y if i]}"\n', 3),
+        ('x = f"""\n{a and b}\n"""\n', 2),
+        ("x = f\"{{if}} {f'{a if b else c}'}\"\n", 2),
+        ('x = "{a if b else c}"\n', 1),
+    ],
+)
+def test_decisions_inside_fstring_fields(source, cyclomatic):
+    assert measure(source).cyclomatic == cyclomatic
+
+
+def test_fstring_fields_keep_line_counts():
+    module = measure('x = f"""\n{a\n and b}\n\n"""\n')
+    assert (module.lines, module.sloc, module.comment_lines, module.blank_lines) == (5, 5, 0, 0)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="PEP 701 f-string syntax")
+def test_fstring_fields_nest_same_quotes():
+    module = measure('x = f"{d["if"]}" if a else f"{f"{d["k"] or e}"}"\n')
+    assert module.cyclomatic == 3
+    same = measure("x = f\"{d['if']}\" if a else f\"{f'{d[\"k\"] or e}'}\"\n")
+    assert module.halstead.to_dict() == same.halstead.to_dict()
+
+
+def test_line_count_falls_back_for_unparsable_files(tmp_path):
+    path = tmp_path / "broken.py"
+    path.write_text("def broken(:\n    pass\n")
+    assert line_count(path) == 2
+    with pytest.raises(SyntaxError):
+        file_complexity(path)
@@ -0,0 +1,99 @@
+"""Tests for strongly connected components and cycle reporting."""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from pymoduleanalyzer.analyzer.cycles import (
+    find_cycles,
+    shortest_cycle,
+    strongly_connected_components,
+)
+from pymoduleanalyzer.analyzer.dependency_graph import DependencyGraph
+
+
+def random_graph(seed, size=40, edges=70):
+    rng = random.Random(seed)
+    adjacency = [set() for _ in range(size)]
+    for _ in range(edges):
+        adjacency[rng.randrange(size)].add(rng.randrange(size))
+    return [sorted(children) for children in adjacency]
+
+
+def reachable(adjacency, start):
+    seen = {start}
+    stack = [start]
+    while stack:
+        for child in adjacency[stack.pop()]:
+            if child not in seen:
+                seen.add(child)
+                stack.append(child)
+    return seen
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_components_match_mutual_reachability(seed):
+    adjacency = random_graph(seed)
+    reach = [reachable(adjacency, node) for node in range(len(adjacency))]
+    expected = {
+        frozenset(other for other in reach[node] if node in reach[other])
+        for node in range(len(adjacency))
+    }
+    components = strongly_connected_components(adjacency)
+    assert {frozenset(component) for component in components} == expected
+    assert sorted(node for component in components for node in component) == list(
+        range(len(adjacency))
+    )
+    # Reverse topological order: no component reaches a later one.
+    position = {node: index for index, component in enumerate(components) for node in component}
+    for node, children in enumerate(adjacency):
+        assert all(position[child] <= position[node] for child in children)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_shortest_cycle_is_a_shortest_cycle(seed):
+    adjacency = random_graph(seed)
+    for component in strongly_connected_components(adjacency):
+        if len(component) < 2:
+            continue
+        start = min(component)
+        cycle = shortest_cycle(adjacency, component, start)
+        assert cycle[0] == start
+        assert len(set(cycle)) == len(cycle)
+        for source, target in zip(cycle, cycle[1:] + cycle[:1]):
+            assert target in adjacency[source]
+        # Breadth-first distance back to start inside the component.
+        members = set(component)
+        frontier, distance, seen = {start}, 0, {start}
+        while start not in {child for node in frontier for child in adjacency[node]}:
+            frontier = {
+                child for node in frontier for child in adjacency[node]
+                if child in members and child not in seen
+            }
+            seen |= frontier
+            distance += 1
+        assert len(cycle) == distance + 1
+
+
+def test_deep_chains_do_not_recurse():
+    size = 50_000
+    adjacency = [[node + 1] for node in range(size - 1)] + [[0]]
+    components = strongly_connected_components(adjacency)
+    assert len(components) == 1 and len(components[0]) == size
+
+
+def test_find_cycles_reports_every_group():
+    root = Path("/repo")
+    imports = {
+        root / "a.py": ["b"],
+        root / "b.py": ["c"],
+        root / "c.py": ["a", "os"],
+        root / "d.py": ["e"],
+        root / "e.py": ["d"],
+        root / "f.py": ["a"],
+    }
+    cycles = find_cycles(DependencyGraph.from_imports(imports))
+    assert [cycle.modules for cycle in cycles] == [["a", "b", "c"], ["d", "e"]]
+    assert cycles[0].cycle == ["a", "b", "c"]
+    assert cycles[1].to_dict() == {"size": 2, "modules": ["d", "e"], "cycle": ["d", "e"]}
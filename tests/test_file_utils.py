@@ -0,0 +1,101 @@
+"""Tests for module discovery and ``.gitignore`` handling."""
+
+import subprocess
+
+import pytest
+from typer.testing import CliRunner
+
+from pymoduleanalyzer.cli.main import app
+from pymoduleanalyzer.utils.file_utils import (
+    GitIgnore,
+    git_python_files,
+    is_excluded,
+    walk_python_files,
+)
+
+
+def make_tree(root, files):
+    for rel_path, text in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+
+@pytest.mark.parametrize(
+    "pattern, path, is_dir, ignored",
+    [
+        ("*.py", "a.py", False, True),
+        ("*.py", "pkg/deep/a.py", False, True),
+        ("/top.py", "top.py", False, True),
+        ("/top.py", "pkg/top.py", False, False),
+        ("pkg/gen", "pkg/gen", True, True),
+        ("pkg/gen", "other/pkg/gen", True, False),
+        ("**/fixtures", "a/b/fixtures", True, True),
+        ("docs/**", "docs/a/b.py", False, True),
+        ("build/", "build", True, True),
+        ("build/", "build", False, False),
+        ("gen_?.py", "gen_1.py", False, True),
+        ("gen_[0-9].py", "gen_x.py", False, False),
+        ("gen_[!0-9].py", "gen_x.py", False, True),
+    ],
+)
+def test_gitignore_patterns(tmp_path, pattern, path, is_dir, ignored):
+    (tmp_path / ".gitignore").write_text(f"{pattern}\n")
+    rules = GitIgnore().extended("", tmp_path / ".gitignore")
+    assert rules.ignored(path, is_dir) is ignored
+
+
+def test_gitignore_negation_and_nested_files(tmp_path):
+    (tmp_path / ".gitignore").write_text("# comment\n*.py\n!keep.py\n")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / ".gitignore").write_text("keep.py\n")
+    rules = GitIgnore().extended("", tmp_path / ".gitignore")
+    assert not rules.ignored("keep.py", False)
+    nested = rules.extended("sub", tmp_path / "sub" / ".gitignore")
+    assert nested.ignored("sub/keep.py", False)
+    assert not nested.ignored("keep.py", False)
+
+
+def test_walk_prunes_excluded_and_ignored_directories(tmp_path):
+    make_tree(tmp_path, {
+        ".gitignore": "generated/\n",
+        "a.py": "",
+        "pkg/__init__.py": "",
+        "pkg/b.py": "",
+        "generated/c.py": "",
+        ".venv/lib/d.py": "",
+        "vendor/e.py": "",
+        ".hidden.py": "",
+        "notes.txt": "",
+    })
+    found = walk_python_files(tmp_path, exclude_patterns=["vendor"])
+    assert [path.relative_to(tmp_path).as_posix() for path in found] == [
+        "a.py", "pkg/__init__.py", "pkg/b.py",
+    ]
+    assert is_excluded(".venv/lib/d.py")
+    assert is_excluded("vendor/e.py", exclude_patterns=["vendor"])
+    assert not is_excluded("pkg/b.py")
+
+
+def test_git_listing_matches_walk(tmp_path):
+    make_tree(tmp_path, {
+        ".gitignore": "ignored.py\n",
+        "a.py": "",
+        "ignored.py": "",
+        "pkg/__init__.py": "",
+        "pkg/b.py": "",
+        "z.py": "",
+    })
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    subprocess.run(["git", "add", "a.py", "pkg"], cwd=tmp_path, check=True)
+    assert list(git_python_files(tmp_path)) == list(walk_python_files(tmp_path))
+
+
+def test_use_git_outside_a_repository_is_a_usage_error(tmp_path):
+    (tmp_path / "a.py").write_text("import os\n")
+    result = CliRunner().invoke(
+        app, ["analyze", "repository", "--path", str(tmp_path), "--use-git", "--no-cache"]
+    )
+    assert result.exit_code == 2
+    assert "--use-git" in result.output
+    assert not isinstance(result.exception, RuntimeError)
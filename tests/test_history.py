@@ -0,0 +1,66 @@
+"""Tests for ``analyze history``: every point must match a full analysis of its commit."""
+
+import pytest
+
+from conftest import git
+
+from pymoduleanalyzer.analyzer.cycles import find_cycles
+from pymoduleanalyzer.analyzer.dependency_graph import DependencyGraph
+from pymoduleanalyzer.analyzer.history import iter_history
+from pymoduleanalyzer.analyzer.import_analyzer import analyze_imports
+from pymoduleanalyzer.analyzer.module_discovery import discover_modules
+
+
+def point_of(directory):
+    """Return the history figures of a fresh analysis of ``directory``."""
+    modules = discover_modules(str(directory))
+    graph = DependencyGraph.from_imports(analyze_imports(modules))
+    ca, ce = graph.in_degrees(), graph.out_degrees()
+    instability = [
+        ce[node] / (ca[node] + ce[node]) if ca[node] + ce[node] else 0.0
+        for node in range(graph.module_count)
+    ]
+    cycles = find_cycles(graph)
+    return {
+        "modules": graph.module_count,
+        "dependencies": graph.edge_count,
+        "internal_dependencies": sum(
+            1 for _, target, _ in graph.edges() if not graph.is_external(target)
+        ),
+        "cycles": len(cycles),
+        "modules_in_cycles": sum(cycle.size for cycle in cycles),
+        "average_instability": round(sum(instability) / len(instability), 4),
+    }
+
+
+@pytest.mark.parametrize("step", [1, 2])
+def test_every_point_matches_a_full_analysis(history_repo, tmp_path, step):
+    root, shas = history_repo
+    points = list(iter_history(str(root), "HEAD", step=step))
+    assert [point.commit for point in points] == shas[::-1][::step][::-1]
+    for point in points:
+        scratch = tmp_path / point.commit
+        scratch.mkdir()
+        git(root, f"--work-tree={scratch}", "checkout", point.commit, "--", ".")
+        git(root, "reset", "-q")
+        record = point.to_dict()
+        expected = point_of(scratch)
+        assert {key: record[key] for key in expected} == expected, point.commit
+
+
+def test_imports_of_a_deleted_module_become_external(tmp_path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    git(root, "init", "-q")
+    git(root, "config", "user.email", "dev@example.com")
+    git(root, "config", "user.name", "dev")
+    (root / "x.py").write_text("import y\n")
+    (root / "y.py").write_text("")
+    git(root, "add", "-A")
+    git(root, "commit", "-q", "-m", "add")
+    (root / "y.py").unlink()
+    git(root, "commit", "-q", "-am", "delete")
+    first, second = iter_history(str(root))
+    assert (first.internal_dependencies, second.internal_dependencies) == (1, 0)
+    assert second.dependencies == 1
+
@@ -0,0 +1,33 @@
+"""Tests for ``analyze impact``."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_impact(*args):
+    return subprocess.run(
+        [sys.executable, "-m", "pymoduleanalyzer.cli.main", "analyze", "impact", *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_tests_only_prints_nothing_but_test_paths(tmp_path):
+    (tmp_path / "core.py").write_text("")
+    (tmp_path / "test_core.py").write_text("import core\n")
+    (tmp_path / "test_other.py").write_text("import os\n")
+    (tmp_path / "broken.py").write_text("def f(:\n")
+
+    for _ in range(2):  # cold index, then the saved one
+        result = run_impact("core", "--path", str(tmp_path), "--tests-only")
+        assert result.stdout.splitlines() == [str(tmp_path / "test_core.py")]
+
+    result = run_impact("core", "--path", str(tmp_path), "--tests-only", "--rebuild")
+    assert result.stdout.splitlines() == [str(tmp_path / "test_core.py")]
+    assert "Built impact index" in result.stderr
+    assert "broken.py" in result.stderr
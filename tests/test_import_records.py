@@ -0,0 +1,96 @@
+"""Tests for import records and the packed per-file import table."""
+
+import ast
+import pickle
+
+import pytest
+
+from pymoduleanalyzer.analyzer.import_analyzer import format_imports, import_table
+from pymoduleanalyzer.analyzer.import_records import (
+    MAX_LINENO,
+    SCOPE_FUNCTION,
+    SCOPE_MODULE,
+    SCOPE_NESTED,
+    SCOPE_TYPE_CHECKING,
+    ImportRecord,
+    ImportTable,
+    relative_count,
+)
+from pymoduleanalyzer.analyzer.parsed_module import ParsedModule
+
+SOURCE = """\
+import os
+import os.path as osp, sys
+from . import sibling
+from .. import parent
+from .mod import name
+from ...deep.er import *
+from pkg import (a, b)
+
+def f():
+    import json
+
+if TYPE_CHECKING:
+    import yaml
+"""
+
+
+def parse(source):
+    parsed = ParsedModule.from_source("mod.py", source)
+    return parsed, import_table(parsed.imports, parsed.import_scopes)
+
+
+def test_table_yields_the_formatted_import_strings():
+    parsed, table = parse(SOURCE)
+    assert list(table) == format_imports(parsed.imports)
+    assert table == format_imports(parsed.imports)
+    assert table[0] == "os" and table[-1] == "yaml"
+    assert table[3:5] == ["..sibling", "...parent"]
+    with pytest.raises(IndexError):
+        table.record(len(table))
+    assert table.relative_count() == relative_count(list(table)) == 4
+
+
+def test_records_keep_level_line_and_scope():
+    _, table = parse(SOURCE)
+    records = list(table.records())
+    assert records[4] == ImportRecord("", "parent", 2, 4, SCOPE_MODULE)
+    assert records[5] == ImportRecord("mod", "name", 1, 5, SCOPE_MODULE)
+    assert records[6] == ImportRecord("deep.er", "*", 3, 6, SCOPE_MODULE)
+    assert records[-2] == ImportRecord("json", None, 0, 10, SCOPE_FUNCTION)
+    assert records[-1] == ImportRecord("yaml", None, 0, 13, SCOPE_TYPE_CHECKING)
+    assert table.record(-1) == records[-1]
+
+
+def test_text_round_trip():
+    _, table = parse(SOURCE)
+    rebuilt = ImportTable.from_texts(table)
+    assert list(rebuilt) == list(table)
+    # Strings keep the dotted name and the relative level, not line and scope.
+    assert [record.level for record in rebuilt.records()] == [
+        record.level for record in table.records()
+    ]
+
+
+def test_rows_and_pickle_round_trip():
+    _, table = parse(SOURCE)
+    assert ImportTable.from_rows(table.to_rows()) == table
+    assert pickle.loads(pickle.dumps(table)) == table
+    assert len(ImportTable()) == 0 and list(ImportTable()) == []
+
+
+def test_packing_limits():
+    table = ImportTable([ImportRecord("m", "n", 63, MAX_LINENO + 10, SCOPE_NESTED)])
+    (record,) = table.records()
+    assert (record.level, record.lineno, record.scope) == (63, MAX_LINENO, SCOPE_NESTED)
+
+
+def test_tables_match_ast_imports_of_every_statement_kind():
+    tree = ast.parse(SOURCE)
+    nodes = [node for node in ast.walk(tree) if isinstance(node, (ast.Import, ast.ImportFrom))]
+    table = import_table(nodes)
+    assert len(table) == sum(len(node.names) for node in nodes)
+    # Without the scopes found by the parse, indented imports count as nested.
+    assert {record.scope for record in table.records() if record.text in ("json", "yaml")} == {
+        SCOPE_NESTED
+    }
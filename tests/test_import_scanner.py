@@ -0,0 +1,84 @@
+"""Differential tests of the import scanner against a full parse."""
+
+import ast
+from pathlib import Path
+
+import pytest
+
+from pymoduleanalyzer.analyzer.import_scanner import scan_imports
+from pymoduleanalyzer.analyzer.module_discovery import discover_modules
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def describe(nodes):
+    """Return the comparable facts of import nodes."""
+    facts = []
+    for node in nodes:
+        names = tuple((alias.name, alias.asname) for alias in node.names)
+        module = node.module if isinstance(node, ast.ImportFrom) else None
+        level = node.level if isinstance(node, ast.ImportFrom) else 0
+        facts.append((type(node).__name__, module, level, names, node.lineno, node.col_offset))
+    return facts
+
+
+def full_parse(source):
+    """Return import nodes of a full parse, in source order."""
+    nodes = [
+        node for node in ast.walk(ast.parse(source))
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    ]
+    return sorted(nodes, key=lambda node: (node.lineno, node.col_offset))
+
+
+CASES = {
+    "plain": "import os\nimport os.path as osp, sys\nfrom . import a\nfrom ..p.m import b as c\n",
+    "nested": "def f():\n    import json\n    if x:\n        from typing import (\n  List,\n)\n",
+    "strings": 'x = "import fake"\ny = """\nfrom nowhere import thing\n"""\nimport real\n',
+    "comments": "# import hidden\nimport shown  # from x import y\n",
+    "semicolons": "import a; import b\nx = 1; from c import d\n",
+    "continuation": "from pkg \\\n    import name\nimport one, \\\n    two\n",
+    "unicode": 'label = "é"; import after\n',
+    "keyword-names": "important = 1\nfrom_ = 2\nimport_x = 3\nimport y\n",
+    "wildcard": "from pkg.sub import *\n",
+    "escaped-quotes": "s = 'it\\'s import'\nt = \"\\\"import\\\"\"\nimport z\n",
+    "no-imports": "x = 1\n",
+}
+
+
+@pytest.mark.parametrize("source", CASES.values(), ids=CASES.keys())
+def test_scanner_matches_full_parse(source):
+    scanned = scan_imports(source)
+    assert scanned is not None
+    assert describe(scanned) == describe(full_parse(source))
+
+
+# The scanner may give up on these, but must never return different imports.
+UNCLEAR = {
+    "comment-in-parens": "from x import (a,\n  # )\n  b)\n",
+    "fstring": "x = f'{import_}'\nimport y\n",
+    "syntax-error-elsewhere": "import a\nimport\n",
+}
+
+
+@pytest.mark.parametrize("source", UNCLEAR.values(), ids=UNCLEAR.keys())
+def test_scanner_is_never_wrong(source):
+    scanned = scan_imports(source)
+    try:
+        expected = describe(full_parse(source))
+    except SyntaxError:
+        assert scanned is None
+        return
+    assert scanned is None or describe(scanned) == expected
+
+
+def test_scanner_agrees_on_this_repository():
+    checked = 0
+    for module in discover_modules(str(ROOT)):
+        source = Path(module).read_text()
+        scanned = scan_imports(source)
+        if scanned is None:
+            continue
+        assert describe(scanned) == describe(full_parse(source)), module
+        checked += 1
+    assert checked
@@ -0,0 +1,69 @@
+"""Tests comparing :class:`IncrementalGraph` with graphs built from scratch."""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from pymoduleanalyzer.analyzer.cycles import find_cycles
+from pymoduleanalyzer.analyzer.dependency_graph import DependencyGraph
+from pymoduleanalyzer.analyzer.incremental import IncrementalGraph
+from pymoduleanalyzer.analyzer.module_index import ModuleIndex
+
+ROOT = Path("/repo")
+MODULES = [ROOT / "pkg/__init__.py"] + [ROOT / f"pkg/m{number}.py" for number in range(12)]
+TARGETS = ["pkg", "os", "json", "..missing"] + [f"pkg.m{number}" for number in range(12)]
+
+
+def named_edges(graph, edges):
+    return {(graph.names[source], graph.names[target], weight) for source, target, weight in edges}
+
+
+def assert_same_graph(incremental, imports):
+    fresh = DependencyGraph.from_imports(imports, ModuleIndex(imports))
+    assert named_edges(incremental, incremental.edges()) == named_edges(fresh, fresh.edges())
+    assert [cycle.to_dict() for cycle in incremental.cycles()] == [
+        cycle.to_dict() for cycle in find_cycles(fresh)
+    ]
+    in_degrees = fresh.in_degrees()
+    for module in imports:
+        node, fresh_node = incremental.node_id(module), fresh.path_id(module)
+        assert incremental.afferent(node) == in_degrees[fresh_node]
+        assert incremental.efferent(node) == len(fresh.successors(fresh_node))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_updates_match_a_fresh_build(seed):
+    rng = random.Random(seed)
+    imports = {module: rng.sample(TARGETS, 3) for module in MODULES}
+    graph = IncrementalGraph(dict(imports), ModuleIndex(MODULES))
+    assert_same_graph(graph, imports)
+    for _ in range(40):
+        module = rng.choice(MODULES)
+        imports[module] = rng.sample(TARGETS, rng.randrange(5))
+        touched = graph.update(module, imports[module])
+        assert graph.update(module, imports[module]) == set()
+        assert graph.node_id(module) in touched or not touched
+        assert_same_graph(graph, imports)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_reindex_matches_a_fresh_build_of_the_present_modules(seed):
+    rng = random.Random(seed)
+    every = MODULES + [ROOT / "a/pkg/m1.py", ROOT / "b/pkg/m1.py", ROOT / "m1.py"]
+    targets = TARGETS + ["m1", "pkg.m1.x", ".m1", "..m2"]
+    imports = {module: rng.sample(targets, 3) for module in every}
+    graph = IncrementalGraph(dict(imports), ModuleIndex(every))
+    present = set(every)
+    for _ in range(30):
+        module = rng.choice(every)
+        present ^= {module}
+        current = [module for module in every if module in present]
+        graph.reindex(ModuleIndex(current))
+        if module not in present:
+            imports[module] = []  # Absent modules have no imports.
+            graph.update(module, [])
+        for changed in rng.sample(current, min(2, len(current))):
+            imports[changed] = rng.sample(targets, rng.randrange(4))
+            graph.update(changed, imports[changed])
+        assert_same_graph(graph, {module: imports[module] for module in current})
@@ -0,0 +1,85 @@
+"""Tests for the lint engine and the pre-commit hook."""
+
+import pytest
+
+from pymoduleanalyzer.linter import precommit
+from pymoduleanalyzer.linter.engine import lint_paths, lint_settings, lint_source
+from pymoduleanalyzer.utils.cache import LintCache
+
+SOURCE = "from os import *\nimport sys\n\n\ndef public():\n    pass\n\n\ndef other():\n    pass\n"
+
+
+def settings_for(rules):
+    return lint_settings({"linting": {"rules": rules}})
+
+
+def test_enabled_rules_share_one_walk():
+    specs = settings_for({"wildcard-import": True, "too-many-imports": {"max": 1}}).rules
+    findings = lint_source(SOURCE, specs)
+    assert sorted((finding.rule, finding.line) for finding in findings) == [
+        ("private-methods", None),
+        ("too-many-imports", None),
+        ("wildcard-import", 1),
+    ]
+    assert lint_source("def f(:\n", specs)[0].rule == "syntax-error"
+
+
+def test_disabled_and_default_rules():
+    assert [name for name, _ in settings_for({}).rules] == ["private-methods"]
+    assert settings_for({"private-methods": False}).rules == []
+    assert settings_for({"private-methods": {"enabled": False}}).rules == []
+    assert settings_for({"private-methods": {"threshold": 0}}).rules == [
+        ("private-methods", {"threshold": 0})
+    ]
+
+
+@pytest.mark.parametrize(
+    "linting",
+    [
+        {"rules": {"unknown-rule": True}},
+        {"rules": {"private-methods": [1]}},
+        {"rules": {"private-methods": "yes"}},
+        {"rules": {"private-methods": {"enabled": "no"}}},
+        {"rules": {"private-methods": {"threshold": "x"}}},
+        {"rules": {"private-methods": {"min_functions": 1.5}}},
+        {"rules": {"private-methods": {"colour": "red"}}},
+        {"rules": {"too-many-imports": {"max": True}}},
+        {"rules": ["private-methods"]},
+        {"jobs": "many"},
+        {"cache": "no"},
+        ["private-methods"],
+    ],
+)
+def test_invalid_settings_are_rejected(linting):
+    with pytest.raises(ValueError):
+        lint_settings({"linting": linting})
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        "linting:\n  rules:\n    private-methods: [1]\n",
+        "linting:\n  cache: no-thanks\n",
+        "linting: [unclosed\n",
+        "- linting\n",
+        "just text\n",
+    ],
+)
+def test_hook_exits_with_status_2_for_invalid_settings(tmp_path, capsys, config):
+    (tmp_path / ".pymoduleanalyzer.yml").write_text(config)
+    (tmp_path / "mod.py").write_text(SOURCE)
+    assert precommit.run([str(tmp_path / "mod.py")], tmp_path) == 2
+    assert "Invalid lint configuration" in capsys.readouterr().err
+
+
+def test_findings_are_cached_by_content(tmp_path):
+    first, second = tmp_path / "a.py", tmp_path / "b.py"
+    first.write_text(SOURCE)
+    second.write_text(SOURCE)
+    specs = settings_for({}).rules
+    for expected in ((0, 2), (2, 0)):
+        with LintCache(tmp_path / "cache") as cache:
+            results = lint_paths([str(first), str(second)], specs, executor="serial", cache=cache)
+            assert (cache.hits, cache.misses) == expected
+    assert results[str(first)] == results[str(second)]
+    assert [finding.rule for finding in results[str(first)]] == ["private-methods"]
@@ -0,0 +1,55 @@
+"""Tests for dotted module names and import resolution."""
+
+from pathlib import Path
+
+from pymoduleanalyzer.analyzer.module_index import ModuleIndex
+
+ROOT = Path("/repo")
+
+
+def index_of(*rel_paths):
+    return ModuleIndex([ROOT / rel_path for rel_path in rel_paths])
+
+
+def test_names_follow_package_markers():
+    index = index_of(
+        "src/pkg/__init__.py", "src/pkg/sub/__init__.py", "src/pkg/sub/mod.py", "run.py"
+    )
+    assert index.name(ROOT / "src/pkg/sub/mod.py") == "pkg.sub.mod"
+    assert index.name(ROOT / "src/pkg/__init__.py") == "pkg"
+    assert index.name(ROOT / "run.py") == "run"
+    assert index.package(ROOT / "src/pkg/sub/mod.py") == "pkg.sub"
+    assert index.package(ROOT / "src/pkg/sub/__init__.py") == "pkg.sub"
+
+
+def test_resolution_prefers_the_longest_module():
+    index = index_of("pkg/__init__.py", "pkg/a.py", "pkg/b.py")
+    importer = ROOT / "pkg/b.py"
+    assert index.resolve(importer, "pkg.a.thing") == ROOT / "pkg/a.py"
+    assert index.resolve(importer, "pkg.missing") == ROOT / "pkg/__init__.py"
+    assert index.resolve(importer, "..a") == ROOT / "pkg/a.py"  # from . import a
+    assert index.resolve(importer, ".a.thing") == ROOT / "pkg/a.py"
+    assert index.resolve(importer, "...outside") is None
+    assert index.resolve(importer, "os.path") is None
+
+
+def test_colliding_script_folders_get_distinct_names():
+    index = index_of(
+        "tests/unit/test_core.py", "tests/integration/test_core.py", "tests/unit/helpers.py"
+    )
+    unit, integration = ROOT / "tests/unit/test_core.py", ROOT / "tests/integration/test_core.py"
+    assert index.name(unit) == "unit.test_core"
+    assert index.name(integration) == "integration.test_core"
+    assert index.path("unit.test_core") == unit
+    assert index.path("integration.test_core") == integration
+    assert index.name(ROOT / "tests/unit/helpers.py") == "helpers"
+    assert index.package(unit) == ""
+    assert len({index.name(module) for module in index}) == len(index) == 3
+
+
+def test_prefixed_names_never_displace_package_modules():
+    index = index_of("a/__init__.py", "a/util.py", "x/a/util.py", "y/util.py")
+    assert index.name(ROOT / "a/util.py") == "a.util"
+    assert index.name(ROOT / "x/a/util.py") == "x.a.util"
+    assert index.name(ROOT / "y/util.py") == "y.util"
+    assert index.path("a.util") == ROOT / "a/util.py"
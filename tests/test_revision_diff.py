@@ -0,0 +1,61 @@
+"""Tests for ``analyze diff``: the structural delta between two revisions."""
+
+import itertools
+
+import pytest
+
+from conftest import apply, full_analysis
+
+from pymoduleanalyzer.analyzer.import_analyzer import analyze_imports
+from pymoduleanalyzer.analyzer.module_discovery import discover_modules
+from pymoduleanalyzer.analyzer.revision_diff import diff_revisions
+
+
+def diff(root, base, head=None):
+    modules = discover_modules(str(root))
+    return diff_revisions(str(root), modules, analyze_imports(modules), base, head)
+
+
+def assert_matches_full_analyses(result, before, after):
+    (base_edges, base_names, base_cycles), (head_edges, head_names, head_cycles) = before, after
+    assert sorted(result.added_edges) == sorted(head_edges - base_edges)
+    assert sorted(result.removed_edges) == sorted(base_edges - head_edges)
+    assert sorted(result.added_modules) == sorted(
+        head_names[path] for path in head_names.keys() - base_names.keys()
+    )
+    assert sorted(result.removed_modules) == sorted(
+        base_names[path] for path in base_names.keys() - head_names.keys()
+    )
+    base_groups = {tuple(cycle.modules) for cycle in base_cycles}
+    head_groups = {tuple(cycle.modules) for cycle in head_cycles}
+    assert {tuple(cycle.modules) for cycle in result.new_cycles} == head_groups - base_groups
+    assert {tuple(cycle.modules) for cycle in result.resolved_cycles} == base_groups - head_groups
+
+
+@pytest.mark.parametrize("base, head", list(itertools.permutations(range(4), 2)))
+def test_diff_matches_two_full_analyses(history_repo, tmp_path, base, head):
+    root, shas = history_repo
+    assert_matches_full_analyses(
+        diff(root, shas[base], shas[head]),
+        full_analysis(root, shas[base], tmp_path / "base"),
+        full_analysis(root, shas[head], tmp_path / "head"),
+    )
+
+
+@pytest.mark.parametrize("base", range(4))
+def test_diff_against_the_work_tree_matches_full_analyses(history_repo, tmp_path, base):
+    root, shas = history_repo
+    apply(root, {"w.py": "import pkg.c\n", "x.py": "import w\n", "pkg/d.py": None})
+    assert_matches_full_analyses(
+        diff(root, shas[base]),
+        full_analysis(root, shas[base], tmp_path / "base"),
+        full_analysis(root, None, tmp_path / "work"),
+    )
+
+
+def test_imports_of_deleted_modules_do_not_resolve_to_them(history_repo):
+    root, shas = history_repo
+    result = diff(root, shas[0], shas[1])
+    assert ("pkg.b", "pkg.c") not in result.added_edges
+    assert ("pkg.b", "pkg") in result.added_edges
+    assert sorted(result.removed_modules) == ["pkg.c", "y"]